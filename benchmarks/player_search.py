@@ -0,0 +1,67 @@
+"""
+Measures the time needed to search the players of the registry (see PlayerRegistry.search),
+compared to a scan of every player, and to re-index a changed player and a changed club.
+Run it from the project folder: python -m benchmarks.player_search [--count N]
+"""
+import argparse
+import random
+import time
+
+from benchmarks.player_memory import make_records
+from data.manage_tournament import SEARCH_LIMIT
+from models import Player, PlayerRegistry
+
+# Number of clubs the players are registered in
+CLUBS = 4
+# Search terms: short prefixes, name prefixes and substrings, chess ID prefixes and exact chess IDs
+TERMS = ["k", "jo", "ann", "smith", "kevin hall", "ivanova", "mit", "vano", "ab0", "xq123", "zz99999"]
+
+
+def legacy_search(players, term, limit):
+    """The previous search implementation: every name and chess ID lowercased at each query"""
+    term = term.lower()
+    return [p for p in players if term in p.name.lower() or term in p.chess_id.lower()][:limit]
+
+
+def timing(function, repeat):
+    """Returns the seconds per call of function"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the player searches.")
+    parser.add_argument("--count", type=int, default=500000, help="number of players")
+    parser.add_argument("--repeat", type=int, default=20, help="number of searches per term")
+    args = parser.parse_args()
+
+    random.seed(0)
+    players = [Player(**record) for record in make_records(args.count)]
+    start = time.perf_counter()
+    registry = PlayerRegistry()
+    size = -(-args.count // CLUBS)
+    for number in range(CLUBS):
+        registry.add_club(f"Club {number}", players[number * size:(number + 1) * size])
+    print(f"index built in {time.perf_counter() - start:.1f} s ({args.count} players)")
+
+    TERMS.append(players[args.count // 2].chess_id)
+    for term in TERMS:
+        indexed = timing(lambda: registry.search(term, limit=SEARCH_LIMIT), args.repeat)
+        scan = timing(lambda: legacy_search(players, term, SEARCH_LIMIT), 1)
+        print(f"{term!r:>14}: index {indexed * 1000:8.3f} ms, scan {scan * 1000:8.1f} ms")
+
+    player = players[0]
+    start = time.perf_counter()
+    for idx in range(args.repeat):
+        player.name = f"Renamed Player {idx}"
+        registry.update(player)
+    print(f"re-indexing a changed player: {(time.perf_counter() - start) / args.repeat * 1000:.3f} ms")
+
+    # A club file changed: all its players are registered again
+    club = f"Club {CLUBS - 1}"
+    new_players = [Player(**record) for record in make_records(len(registry.get_club_players(club)))]
+    start = time.perf_counter()
+    registry.replace_club(club, new_players)
+    print(f"replacing a club of {len(new_players)} players: {time.perf_counter() - start:.2f} s")
@@ -0,0 +1,105 @@
+"""
+Measures the time and peak memory needed to write the HTML report of a large tournament,
+compared to the previous implementation (string concatenation, then a single write).
+Run it from the project folder: python -m benchmarks.report_writer [--players N] [--rounds N]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.player_memory import make_records
+from models import Player
+from models.report import write_report
+from models.tournament import Tournament
+
+
+def legacy_report(tournament):
+    """The previous report implementation (kept for comparison)"""
+    report_content = f"<html>\n<head>\n<title>Tournament Report - {
+        tournament.name}</title>\n</head>\n<body>\n"
+    report_content += f"<h1>Tournament Report: {tournament.name}</h1>\n"
+    report_content += f"<p>Dates: {
+        tournament.start_date} to {tournament.end_date}</p>\n"
+    report_content += f"<p>Venue: {tournament.venue}</p>\n"
+    report_content += f"<p>Current Round: {
+        tournament.current_round}/{tournament.max_round}</p>\n"
+
+    report_content += "<h2>Players (sorted by points)</h2>\n"
+    report_content += "<ul>\n"
+    tiebreaks = tournament.standings.tiebreaks
+    for player, points in tournament.standings.top():
+        buchholz, sonneborn_berger, progressive = tiebreaks.values(player)
+        report_content += f"<li>{player.name} (Points: {points}, Buchholz: {buchholz}, "
+        report_content += f"Sonneborn-Berger: {sonneborn_berger}, Progressive: {progressive})</li>\n"
+    report_content += "</ul>\n"
+
+    report_content += "<h2>Rounds and Matches</h2>\n"
+    for round_num, round_matches in enumerate(tournament.rounds, start=1):
+        report_content += f"<h3>Round {round_num}</h3>\n<ul>\n"
+        for match in round_matches:
+            if match.player2 is None:
+                report_content += f"<li>Match: {match.player1.name} has a bye</li>\n"
+                continue
+            match_info = f"{match.player1.name} vs {match.player2.name}"
+            if match.played:
+                result = f"Result: {match.result}"
+            else:
+                result = "Not played yet"
+            report_content += f"<li>Match: {match_info}, {result}</li>\n"
+        report_content += "</ul>\n"
+
+    report_content += "</body>\n</html>"
+    return report_content
+
+
+def legacy_write(tournament, filepath):
+    content = legacy_report(tournament)
+    with open(filepath, "w", encoding="utf-8") as fp:
+        fp.write(content)
+
+
+def make_tournament(players, rounds):
+    tournament = Tournament("Benchmark Open", "Town Hall", "2024-01-01", "2024-01-11",
+                            [Player(**record) for record in make_records(players)], rounds)
+    for _ in range(rounds):
+        tournament.play_round()
+        for match in tournament.rounds[-1]:
+            if not match.played:
+                match.play_match(random.choice(["player1", "player2", "draw"]))
+    return tournament
+
+
+def measure(writer, tournament, filepath, repeat):
+    """Returns the (seconds per report, peak bytes) needed to write the report"""
+    # Timing first: tracing memory allocations slows everything down
+    start = time.perf_counter()
+    for _ in range(repeat):
+        writer(tournament, filepath)
+    elapsed = (time.perf_counter() - start) / repeat
+
+    tracemalloc.start()
+    writer(tournament, filepath)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the HTML report writers.")
+    parser.add_argument("--players", type=int, default=1000, help="number of players")
+    parser.add_argument("--rounds", type=int, default=11, help="number of rounds")
+    parser.add_argument("--repeat", type=int, default=5, help="number of reports written for the timing")
+    args = parser.parse_args()
+
+    random.seed(0)
+    tournament = make_tournament(args.players, args.rounds)
+    with tempfile.TemporaryDirectory() as folder:
+        filepath = os.path.join(folder, "report.html")
+        for name, writer in (("concatenation", legacy_write), ("streaming", write_report)):
+            elapsed, peak = measure(writer, tournament, filepath, args.repeat)
+            print(f"{name:>13}: {elapsed * 1000:8.1f} ms/report, peak {peak / 1024:8.1f} KiB, "
+                  f"{os.path.getsize(filepath) / 1024:.0f} KiB written "
+                  f"({args.players} players, {args.rounds} rounds)")
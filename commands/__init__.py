@@ -1,6 +1,7 @@
 from .club_list import ClubListCmd
 from .create_club import ClubCreateCmd
 from .exit import ExitCmd
+from .import_players import PlayerImportCmd
 from .noop import NoopCmd
 from .update_player import PlayerUpdateCmd
 
@@ -10,4 +11,5 @@ __all__ = [
     "ClubListCmd",
     "NoopCmd",
     "PlayerUpdateCmd",
+    "PlayerImportCmd",
 ]
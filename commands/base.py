@@ -1,5 +1,7 @@
 from abc import ABCMeta, abstractmethod
 
+from models.metrics import timed
+
 
 class BaseCommand(metaclass=ABCMeta):
     """This is the base class for a command"""
@@ -9,6 +11,7 @@ class BaseCommand(metaclass=ABCMeta):
         """Abstract method: child classes must implement it!"""
         pass
 
+    @timed("command")
     def __call__(self):
         """Syntactic sugar: calling the instance calls its execute() method"""
         return self.execute()
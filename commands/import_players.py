@@ -0,0 +1,36 @@
+import csv
+import json
+from pathlib import Path
+
+from commands.context import Context
+
+from .base import BaseCommand
+
+
+def read_player_records(filepath):
+    """Reads player records from a CSV, JSON (list or club file) or JSON lines file"""
+    filepath = Path(filepath)
+    with open(filepath, newline="") as fp:
+        if filepath.suffix == ".csv":
+            return list(csv.DictReader(fp))
+        if filepath.suffix == ".jsonl":
+            return [json.loads(line) for line in fp if line.strip()]
+
+        data = json.load(fp)
+        # A club file can be used as a roster
+        return data["players"] if isinstance(data, dict) else data
+
+
+class PlayerImportCmd(BaseCommand):
+    """Command to import players in bulk into a club"""
+
+    def __init__(self, club, records):
+        self.club = club
+        self.records = records
+        self.created = []
+        self.errors = []
+
+    def execute(self):
+        """Uses the create_players method from the Club model: the club is saved once"""
+        self.created, self.errors = self.club.create_players(self.records)
+        return Context("club-view", club=self.club)
@@ -0,0 +1,184 @@
+import json
+import sys
+from contextlib import ExitStack
+
+from models import get_club_manager
+from models.validation import validate_player_data
+
+from .club_list import ClubListCmd
+from .create_club import ClubCreateCmd
+from .import_players import PlayerImportCmd
+from .update_player import PlayerUpdateCmd
+
+# Fields of a player, as given by the screens
+PLAYER_FIELDS = ("name", "email", "chess_id", "birthday")
+# Operations of the scripts, and whether they need a club
+COMMANDS = {
+    "club-list": False,
+    "club-create": False,
+    "club-view": True,
+    "player-create": True,
+    "player-update": True,
+    "player-import": True,
+}
+
+
+def read_script(source):
+    """Yields the (line number, line) of a JSON lines script file ('-' reads from stdin), blank lines skipped
+
+    The file is read as it is executed, so that large scripts are not loaded in memory.
+    Lines are decoded by ScriptRunner.run, so that an invalid line only fails its own operation.
+    """
+    fp = sys.stdin if source == "-" else open(source)
+    try:
+        for number, line in enumerate(fp, 1):
+            if line.strip():
+                yield number, line
+    finally:
+        if fp is not sys.stdin:
+            fp.close()
+
+
+class ScriptRunner:
+    """
+    Headless driver of the club management program: runs scripted operations without the screens.
+
+    Each operation is a dictionary with a "command" key; the commands the screens
+    would return are built from it and executed against the shared club manager
+    (see get_club_manager):
+    - {"command": "club-list"}
+    - {"command": "club-create", "name": ...}
+    - {"command": "club-view", "club": ...}: the players of a club
+    - {"command": "player-create", "club": ..., "name": ..., "email": ..., "chess_id": ..., "birthday": ...}
+    - {"command": "player-update", "club": ..., "player": chess ID, and the fields to change}
+    - {"command": "player-import", "club": ..., "players": [player records]}
+    Clubs are designated by name, players by chess ID. Player data is validated like the screens do.
+
+    With batch=True, the changes of each club are written once, when the script ends
+    (nothing is written if it is interrupted); otherwise each change is written as
+    in the interactive program, or appended to the club journals with journal=True
+    (if the shared club manager is created by the runner, see ChessClub).
+    """
+
+    def __init__(self, batch=False, journal=False):
+        self.batch = batch
+        self.manager = get_club_manager(journal=journal)
+        # Clubs by name and players of each club by chess ID, rebuilt when the club list changes
+        self._clubs = {}
+        self._players = {}
+        self._club_list = None
+        self._club_count = 0
+        # (line number, operation, message) of the operations which failed
+        self.errors = []
+        self.count = 0
+
+    def run(self, operations, output=None):
+        """Executes (line number, operation) tuples, writing their results to output if given
+
+        Operations are dictionaries, or JSON strings (see read_script).
+
+        Failed operations are recorded in errors and do not stop the script. Returns the number of operations run.
+        """
+        with ExitStack() as stack:
+            batched = set()
+            for number, operation in operations:
+                self.count += 1
+                try:
+                    if isinstance(operation, str):
+                        operation = json.loads(operation)
+                    club = self.club(operation["club"]) if "club" in operation else None
+                    if self.batch and club is not None and club.name not in batched:
+                        stack.enter_context(club.batch())
+                        batched.add(club.name)
+                    result = self.execute(operation, club)
+                except KeyError as e:
+                    self.errors.append((number, operation, f"missing field {e}"))
+                    continue
+                except (ValueError, TypeError, RuntimeError) as e:
+                    self.errors.append((number, operation, str(e)))
+                    continue
+                if output is not None:
+                    output.write(json.dumps(result) + "\n")
+        return self.count
+
+    def execute(self, operation, club=None):
+        """Executes one operation and returns its (JSON-serializable) result"""
+        command = operation["command"]
+        if command not in COMMANDS:
+            raise ValueError(f"Unknown command {command!r}")
+        if COMMANDS[command] and club is None:
+            raise ValueError(f"{command} needs a club")
+
+        if command == "club-list":
+            context = ClubListCmd()()
+            return [{"name": c.name, "player_count": c.player_count} for c in context.kwargs["clubs"]]
+
+        if command == "club-create":
+            if not operation.get("name"):
+                raise ValueError("club name is required")
+            if operation["name"] in self.clubs():
+                raise ValueError(f"Club {operation['name']} already exists")
+            context = ClubCreateCmd(operation["name"])()
+            return {"name": context.kwargs["club"].name}
+
+        if command == "club-view":
+            return [player.serialize() for player in club.players]
+
+        if command == "player-create":
+            data = {key: operation.get(key) for key in PLAYER_FIELDS}
+            validate_player_data(data)
+            players = self.players(club)
+            if data["chess_id"] in players:
+                raise ValueError(f"Chess ID {data['chess_id']} already in club {club.name}")
+            player = PlayerUpdateCmd(club, None, **data)().kwargs["player"]
+            players[player.chess_id] = player
+            return player.serialize()
+
+        if command == "player-update":
+            players = self.players(club)
+            player = players.get(operation["player"])
+            if player is None:
+                raise ValueError(f"No player {operation['player']} in club {club.name}")
+            changes = {key: operation[key] for key in PLAYER_FIELDS if key in operation}
+            data = {key: changes.get(key, getattr(player, key)) for key in PLAYER_FIELDS}
+            validate_player_data(data)
+            if data["chess_id"] != player.chess_id and data["chess_id"] in players:
+                raise ValueError(f"Chess ID {data['chess_id']} already in club {club.name}")
+            old_chess_id = player.chess_id
+            player = PlayerUpdateCmd(club, player, **changes)().kwargs["player"]
+            # The index is only changed once the update succeeded
+            del players[old_chess_id]
+            players[player.chess_id] = player
+            return player.serialize()
+
+        # player-import
+        import_command = PlayerImportCmd(club, operation["players"])
+        import_command()
+        self.players(club).update((player.chess_id, player) for player in import_command.created)
+        return {
+            "created": len(import_command.created),
+            "errors": [[number, message] for number, _, message in import_command.errors],
+        }
+
+    def clubs(self):
+        """Returns the clubs of the manager by name"""
+        if self.manager.clubs is not self._club_list or len(self._club_list) != self._club_count:
+            self._club_list = self.manager.clubs
+            self._club_count = len(self._club_list)
+            self._clubs = {club.name: club for club in self._club_list}
+            self._players = {name: entry for name, entry in self._players.items()
+                             if entry[0] is self._clubs.get(name)}
+        return self._clubs
+
+    def club(self, name):
+        club = self.clubs().get(name)
+        if club is None:
+            raise ValueError(f"No club named {name}")
+        return club
+
+    def players(self, club):
+        """Returns the players of a club by chess ID (the index is kept up to date by the operations)"""
+        entry = self._players.get(club.name)
+        if entry is None or entry[0] is not club:
+            entry = self._players[club.name] = (club, {player.chess_id: player for player in club.players})
+        return entry[1]
@@ -0,0 +1,34 @@
+"""
+This script manages the archive of completed and removed tournaments (data/tournaments/archive).
+Run it from the project folder:
+    python -m data.archive_tournaments archive          (archive the completed and removed tournaments)
+    python -m data.archive_tournaments list [--player CHESS_ID] [--status completed|removed] [--name TERM]
+    python -m data.archive_tournaments restore NAME
+"""
+import argparse
+
+from data.manage_tournament import ManageTournament
+from models.sqlite_store import SQLiteStore
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the archive of completed and removed tournaments.")
+    parser.add_argument("--db", type=str, help="SQLite database to use instead of the JSON files")
+    subparsers = parser.add_subparsers(dest="action", required=True)
+    subparsers.add_parser("archive", help="archive the completed and removed tournaments")
+    list_parser = subparsers.add_parser("list", help="list the archived tournaments")
+    list_parser.add_argument("--name", type=str, help="part of the tournament name")
+    list_parser.add_argument("--player", type=str, help="chess ID of a player of the tournament")
+    list_parser.add_argument("--status", type=str, choices=["completed", "removed"])
+    restore_parser = subparsers.add_parser("restore", help="restore an archived tournament")
+    restore_parser.add_argument("name", type=str, help="name of the tournament")
+
+    args = parser.parse_args()
+    manager = ManageTournament(store=SQLiteStore(args.db) if args.db else None)
+    if args.action == "archive":
+        print(f"{manager.archive_completed_tournaments()} tournament(s) archived.")
+    elif args.action == "list":
+        for name, entry in manager.archive.query(term=args.name, status=args.status, player=args.player):
+            print(f"{name}: {entry['dates']['from']} to {entry['dates']['to']}, {entry['venue']}, "
+                  f"{entry['status']}, {len(entry['players'])} players, archived on {entry['archived']}")
+    elif args.action == "restore":
+        raise SystemExit(0 if manager.restore_tournament(args.name) else 1)
@@ -0,0 +1,20 @@
+"""
+This script writes the HTML reports of all the tournaments into data/tournaments/tournament_reports,
+with a pool of processes. Tournaments which did not change since the last run are skipped.
+Run it from the project folder: python -m data.generate_reports [--workers N] [--force]
+"""
+import argparse
+
+from data.manage_tournament import ManageTournament
+from models.sqlite_store import SQLiteStore
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write the reports of all the tournaments.")
+    parser.add_argument("--db", type=str, help="SQLite database to use instead of the JSON files")
+    parser.add_argument("--workers", type=int, help="number of processes (default: number of CPUs)")
+    parser.add_argument("--force", action="store_true", help="render every report, even the unchanged ones")
+
+    args = parser.parse_args()
+    manager = ManageTournament(store=SQLiteStore(args.db) if args.db else None)
+    results = manager.generate_all_reports(workers=args.workers, force=args.force)
+    raise SystemExit(1 if any(status == "failed" for _, status, _ in results) else 0)
@@ -1,32 +1,247 @@
 import os
+import csv
 import json
+import sys
+from functools import partial
 from models.tournament import Tournament
-from models.player import Player
+from models.club import ChessClub
+from models.club_manager import get_club_manager
 from models.match import Match
+from models.metrics import timed
+from models.pairing import OpponentMatrix
+from models.player import Player
+from models.parallel import load_parallel, read_json
+from models.player_history import PlayerHistory
+from models.player_registry import PlayerRegistry
+from models.rating import RatingBook, match_points
+from models.report import render_report, write_report
+from models.report_batch import generate_reports
+from models.tournament_archive import TournamentArchive
+from models.tournament_log import TournamentLog, is_completed, read_tournament
+
+# Maximum number of players listed when searching
+SEARCH_LIMIT = 50
+# Snapshot of the Elo ratings computed from the tournaments
+RATINGS_PATH = "data/ratings.json"
+# Snapshot of the games of every player across the tournaments
+HISTORY_PATH = "data/history.json"
+# Summary of every tournament file (see ManageTournament.load_all_tournaments)
+MANIFEST_PATH = "data/tournaments/.manifest"
+# Accepted values for the result of a match in a results file (result of player1)
+RESULT_CODES = {
+    "1": "player1", "1-0": "player1", "player1": "player1",
+    "2": "player2", "0-1": "player2", "player2": "player2",
+    "0": "draw", "1/2-1/2": "draw", "½-½": "draw", "draw": "draw",
+}
+# Same result, seen from player2
+FLIPPED_RESULTS = {"player1": "player2", "player2": "player1", "draw": "draw"}
 
 
 class ManageTournament:
-    def __init__(self):
+    def __init__(self, workers=None, processes=False, store=None):
+        # Tournaments loaded so far, by name (see get_tournament)
         self.tournaments = {}
-        self.all_players = []
-        self.load_all_clubs()
+        # Summary of all the tournaments, by name: dates, venue, status, rounds and file fingerprint
+        self.manifest = {}
+        self._registry = None
+        # Clubs registered in the registry, by name (see load_all_clubs)
+        self._clubs = {}
+        self._ratings = None
+        self._history = None
+        self._archive = None
+        # Optional SQLite storage (models.sqlite_store.SQLiteStore) used instead of the JSON files
+        self.store = store
+        # Event logs of the tournament files, by tournament name (see models.tournament_log.TournamentLog)
+        self.logs = {}
+        # Club and tournament files are loaded by a pool of workers (see models.parallel.load_parallel)
+        self.workers = workers
+        self.processes = processes
         self.load_all_tournaments()
 
+    @property
+    def registry(self):
+        # The players of all the clubs, loaded when first needed (to load a tournament or select players).
+        # With a database, players are only registered as they are looked up (see find_players).
+        if self._registry is None:
+            self._registry = PlayerRegistry()
+            if self.store is None:
+                self.load_all_clubs()
+        return self._registry
+
+    @property
+    def ratings(self):
+        if self._ratings is None:
+            self._ratings = self.load_ratings()
+        return self._ratings
+
+    @property
+    def history(self):
+        # Games of every player across all the tournaments (see models.player_history.PlayerHistory)
+        if self._history is None:
+            self._history = self.load_history()
+        return self._history
+
+    @property
+    def archive(self):
+        # Completed and removed tournaments (see models.tournament_archive.TournamentArchive), opened when first needed
+        if self._archive is None:
+            self._archive = TournamentArchive()
+        return self._archive
+
+    @property
+    def all_players(self):
+        # All the players of the clubs (read from the database, if any, when they are listed)
+        if self.store is not None:
+            return self.register_rows(self.store.search_players(""))
+        self.refresh_clubs()
+        return self.registry.players
+
+    def find_players(self, chess_ids):
+        # Returns the players with the given chess IDs, by chess ID (unknown ones are left out).
+        # With a database, the players which are not registered yet are read from it (and registered).
+        registry = self.registry
+        if self.store is not None:
+            missing = [chess_id for chess_id in chess_ids if chess_id not in registry]
+            if missing:
+                self.register_rows(self.store.find_players(missing).values())
+        players = {}
+        for chess_id in chess_ids:
+            player = registry.get(chess_id)
+            if player is not None:
+                players[chess_id] = player
+        return players
+
+    def register_rows(self, rows):
+        # Registers the players of database rows (see SQLiteStore.find_players) and returns them,
+        # reusing the players already registered so that a player is the same instance everywhere.
+        players = []
+        for row in rows:
+            player = self.registry.get(row["chess_id"])
+            if player is None:
+                player = self.registry.add(Player(row["name"], row["email"], row["chess_id"], row["birthday"]),
+                                           club=row["club"])
+            players.append(player)
+        return players
+
     def load_all_clubs(self):
-        base_path = r"data/clubs"
-        club_files = ["cornville.json", "springfield.json", "SKC.json"]
-        for club_file in club_files:
-            club_name, club_players = self.load_club(
-                os.path.join(base_path, club_file))
-            self.all_players.extend(club_players)
+        if self.store is not None:
+            for club_name, _ in self.store.clubs():
+                self.registry.add_club(club_name, self.store.load_players(club_name))
+            return
+
+        # The clubs of data/clubs, shared with the club commands of the process (see models.club_manager):
+        # the registry listens to their changes, and is updated with the clubs whose files changed since
+        clubs = {club.name: club for club in get_club_manager(workers=self.workers, processes=self.processes).clubs}
+        for club_name in set(self._clubs) - set(clubs):
+            self.registry.replace_club(club_name, [])
+        for club_name, club in clubs.items():
+            if self._clubs.get(club_name) is not club:
+                self.registry.replace_club(club_name, club.players)
+                club.listeners.append(self.registry.club_changed)
+        self._clubs = clubs
+
+    def refresh_clubs(self):
+        # Updates the registry from the club files which changed since they were registered
+        # (e.g. by the club management program). With a database, players are read as they are looked up.
+        if self.store is None and self._registry is not None:
+            self.load_all_clubs()
 
     def load_club(self, file_path):
-        # Reads player data from a club file and returns the club's name and its players.
-        with open(file_path, 'r') as file:
-            data = json.load(file)
-            players = [Player(player['name'], player['email'], player['chess_id'], player['birthday'])
-                       for player in data['players']]
-            return data["name"], players
+        # Reads player data from a club file (and its journal) and returns the club's name and its players.
+        club = ChessClub(file_path)
+        return club.name, club.players
+
+    def load_ratings(self):
+        # Loads the ratings snapshot, or computes the ratings from all the tournaments if there is none:
+        # the current ones and the completed ones of the archive, like RatingBook.from_archive.
+        ratings = RatingBook.load(RATINGS_PATH)
+        if ratings is None:
+            ratings = RatingBook()
+            ratings.apply_tournaments(self.tournament_infos() + self.archived_infos(status="completed"))
+            self.save_ratings(ratings)
+        return ratings
+
+    def save_ratings(self, ratings):
+        try:
+            ratings.save(RATINGS_PATH)
+        except Exception as e:
+            print(f"Failed to save ratings: {e}")
+
+    def update_ratings(self, tournament):
+        # Applies the rounds of the tournament which were not rated yet (only these rounds are replayed),
+        # and appends their rating changes to the snapshot's log.
+        if self.ratings.apply_tournament(self.tournament_to_dict(tournament)):
+            try:
+                self.ratings.save_changes(RATINGS_PATH)
+            except Exception as e:
+                print(f"Failed to save ratings: {e}")
+
+    def load_history(self):
+        # Loads the player history snapshot, or builds it from all the tournaments (and the archive) if there is none.
+        history = PlayerHistory.load(HISTORY_PATH)
+        if history is None:
+            history = PlayerHistory()
+            history.apply_tournaments(self.tournament_infos() + self.archived_infos())
+            self.save_history(history)
+        return history
+
+    def archived_infos(self, status=None):
+        # Returns the information of the archived tournaments (only the ones with the given status, if any).
+        return [self.archive.get(name) for name, _ in self.archive.query(status=status)]
+
+    def save_history(self, history):
+        try:
+            history.save(HISTORY_PATH)
+        except Exception as e:
+            print(f"Failed to save player history: {e}")
+
+    def update_history(self, tournament):
+        # Records the new results of the tournament in the player history, and appends them to the snapshot's log.
+        if self.history.apply_tournament(self.tournament_to_dict(tournament)):
+            try:
+                self.history.save_changes(HISTORY_PATH)
+            except Exception as e:
+                print(f"Failed to save player history: {e}")
+
+    def player_games(self, chess_id):
+        # Returns the (tournament name, round, opponent chess ID, points) records of a player's games.
+        # With a database, the games of its tournaments are queried from it (the history is only used for
+        # the archived tournaments, which are no longer in the database).
+        if self.store is None:
+            return self.history.player_games(chess_id)
+        games = [game for game in self.history.player_games(chess_id) if game[0] not in self.manifest]
+        for row in self.store.match_history(chess_id):
+            points = match_points({"players": [row["player1"], row["player2"]], "completed": row["completed"],
+                                   "winner": row["winner"]})
+            if points is None:
+                # Bye, or no result yet
+                continue
+            if row["player1"] == chess_id:
+                games.append((row["tournament"], row["round"], row["player2"], points))
+            else:
+                games.append((row["tournament"], row["round"], row["player1"], 1 - points))
+        return games
+
+    def head_to_head(self, id1, id2):
+        # Returns the (wins of id1, draws, wins of id2) counts of the games between two players.
+        if self.store is None:
+            return self.history.head_to_head(id1, id2)
+        counts = [0, 0, 0]
+        for _, _, opponent_id, points in self.player_games(id1):
+            if opponent_id == id2:
+                counts[0 if points == 1 else 1 if points == 0.5 else 2] += 1
+        return tuple(counts)
+
+    def tournament_standings(self, tournament_name, limit=None):
+        # Returns the (chess ID, name, points) tuples of the best players of a tournament, best first.
+        # With a database, they are computed by a query, without loading the tournament
+        # (same points, but players with the same points are not ordered by tie-break scores).
+        if self.store is not None:
+            return [tuple(row) for row in self.store.standings(tournament_name, limit=limit)]
+        tournament = self.get_tournament(tournament_name)
+        if tournament is None:
+            return []
+        return [(player.chess_id, player.name, points) for player, points in tournament.standings.top(limit)]
 
     def create_tournament(self):
         # Creates a new tournament based on user input.
@@ -37,14 +252,15 @@ class ManageTournament:
         start_date = input("Enter the start date (YYYY-MM-DD): ").strip()
         end_date = input("Enter the end date (YYYY-MM-DD): ").strip()
 
-        if tournament_name in self.tournaments:
+        if tournament_name in self.manifest:
             print(f"Tournament '{tournament_name}' already exists.")
             return
 
         num_players = 0
-        while num_players % 2 != 0 or num_players <= 0:
+        while num_players < 2:
+            # With an odd number of players, one of them gets a bye each round
             num_players = int(
-                input("Enter the number of players to select (must be an even number): "))
+                input("Enter the number of players to select (at least 2): "))
         selected_players = self.select_players(num_players)
 
         max_rounds = int(input("Enter the maximum number of rounds: "))
@@ -57,12 +273,9 @@ class ManageTournament:
 
         print(f"Tournament '{tournament_name}' has been created at {venue} from {start_date} to {end_date}.")
 
-    def save_tournament_to_json(self, tournament):
-        # Save tournament information to a JSON file using its name
-        file_name = f"{tournament.name}_info.json"
-        file_path = os.path.join("data/tournaments/", file_name)
-
-        tournament_info = {
+    def tournament_summary(self, tournament):
+        # Returns the tournament information without the players and rounds.
+        return {
             "name": tournament.name,
             "dates": {
                 "from": tournament.start_date,
@@ -72,24 +285,49 @@ class ManageTournament:
             "number_of_rounds": tournament.max_round,
             "current_round": tournament.current_round,
             "completed": tournament.is_completed(),
-            "players": [player.chess_id for player in tournament.players],
-            "rounds": []
         }
 
+    def tournament_to_dict(self, tournament):
+        # Returns the tournament information, as saved in its JSON file.
+        tournament_info = self.tournament_summary(tournament)
+        tournament_info["players"] = [player.chess_id for player in tournament.players]
+        tournament_info["rounds"] = []
+
         for round_matches in tournament.rounds:
             round_info = []
             for match in round_matches:
                 match_info = {
-                    "players": [match.player1.chess_id, match.player2.chess_id],
+                    "players": [match.player1.chess_id, match.player2.chess_id if match.player2 else None],
                     "completed": match.played,
                     "winner": match.result
                 }
                 round_info.append(match_info)
             tournament_info["rounds"].append(round_info)
+        return tournament_info
 
+    @timed("storage", "save_tournament_to_json")
+    def save_tournament_to_json(self, tournament):
+        # Save tournament information to a JSON file using its name (or to the database, if any)
+        if self.store is not None:
+            tournament_info = self.tournament_to_dict(tournament)
+            self.store.save_tournament(tournament_info)
+            self.update_manifest(tournament.name, tournament_info)
+            print(f"Tournament information saved in {os.path.abspath(self.store.filepath)}")
+            return
+
+        # Only the rounds and results since the last save are appended to the event log of the tournament
+        file_name = f"{tournament.name}_info.json"
+        file_path = os.path.join("data/tournaments/", file_name)
         try:
-            with open(file_path, 'w') as file:
-                json.dump(tournament_info, file, indent=4)
+            log = self.logs.get(tournament.name)
+            if log is None:
+                log = self.logs[tournament.name] = TournamentLog(file_path)
+                log.snapshot(tournament, self.tournament_to_dict)
+            else:
+                log.save(tournament, self.tournament_to_dict)
+            self.update_manifest(tournament.name, self.tournament_summary(tournament),
+                                 TournamentLog.files_fingerprint(file_path))
+            self.write_manifest()
             print(f"Tournament information saved in {os.path.abspath(file_path)}")
         except Exception as e:
             print(f"Failed to save tournament information: {e}")
@@ -97,16 +335,18 @@ class ManageTournament:
     def play_next_round(self, tournament):
         # Handles the gameplay for the next round in the given tournament.
         # Processes match results based on user input.
-        print(f"Attempting to play round {tournament.current_round + 1}.\n"
-              f"Current round: {tournament.current_round}\n"
-              f"Max rounds: {tournament.max_round}")
+        # A round which was paired but not fully played yet is resumed instead.
+        if not self.current_round_pending(tournament):
+            print(f"Attempting to play round {tournament.current_round + 1}.\n"
+                  f"Current round: {tournament.current_round}\n"
+                  f"Max rounds: {tournament.max_round}")
 
-        if tournament.current_round >= tournament.max_round:
-            print("Maximum number of rounds reached. The tournament has concluded.")
-            tournament.declare_winner()
-            return
+            if tournament.current_round >= tournament.max_round:
+                print("Maximum number of rounds reached. The tournament has concluded.")
+                tournament.declare_winner()
+                return
 
-        tournament.play_round()
+            tournament.play_round()
 
         # Adjusted the index to access the correct round
         current_round_index = tournament.current_round - 1
@@ -129,18 +369,122 @@ class ManageTournament:
                         else:
                             print("Invalid input. Please enter 1, 2, or 0.")
 
+        self.finish_round(tournament)
+
+    def finish_round(self, tournament):
+        # Saves the tournament once the results of a round are recorded and shows the rankings.
         print(f"After Round {tournament.current_round}:")
 
         self.save_tournament_to_json(tournament)
+        self.update_ratings(tournament)
+        self.update_history(tournament)
         tournament.display_rankings()
 
-        if tournament.current_round == tournament.max_round:
+        if tournament.current_round == tournament.max_round and not self.current_round_pending(tournament):
             print("Maximum number of rounds reached. The tournament has concluded.")
             tournament.declare_winner()
 
+    def current_round_pending(self, tournament):
+        # Whether the current round has matches without a result.
+        if not 0 < tournament.current_round <= len(tournament.rounds):
+            return False
+        return any(not match.played for match in tournament.rounds[tournament.current_round - 1])
+
+    def pair_next_round(self, tournament):
+        # Pairs the next round and saves it, so that its results can be entered later (see enter_round_results).
+        if self.current_round_pending(tournament):
+            print(f"Round {tournament.current_round} still has matches without a result.")
+            return False
+        if not tournament.play_round():
+            return False
+
+        print(f"Round {tournament.current_round} pairings:")
+        for board, match in enumerate(tournament.rounds[tournament.current_round - 1], start=1):
+            if match.player2 is None:
+                print(f"Board {board}: {match.player1.name} ({match.player1.chess_id}) has a bye")
+            else:
+                print(f"Board {board}: {match.player1.name} ({match.player1.chess_id}) vs "
+                      f"{match.player2.name} ({match.player2.chess_id})")
+        self.save_tournament_to_json(tournament)
+        return True
+
+    def read_round_results(self, source):
+        # Reads the results of a round from a CSV file (with a header) or a JSON lines file, "-" for stdin.
+        # Each result has the chess IDs of both players ("player1", "player2") and a "result" (see RESULT_CODES).
+        if source == "-":
+            lines = sys.stdin.read().splitlines()
+        else:
+            with open(source, newline="", encoding="utf-8") as fp:
+                lines = fp.read().splitlines()
+
+        lines = [line for line in lines if line.strip()]
+        if lines and lines[0].lstrip().startswith("{"):
+            return [json.loads(line) for line in lines]
+        return list(csv.DictReader(lines))
+
+    def enter_round_results(self, tournament, results):
+        # Records the results (see read_round_results) of the current round in one pass.
+        # Every result is checked against the matches of the round first: if any of them is invalid,
+        # none is recorded. The tournament is saved once, after all the results are recorded.
+        if not self.current_round_pending(tournament):
+            print(f"Round {tournament.current_round} has no match waiting for a result.")
+            return False
+
+        current_round = tournament.rounds[tournament.current_round - 1]
+        matches = {
+            frozenset((match.player1.chess_id, match.player2.chess_id)): match
+            for match in current_round if match.player2 is not None
+        }
+
+        errors = []
+        accepted = {}
+        for number, record in enumerate(results, start=1):
+            player1 = str(record.get("player1") or "").strip()
+            player2 = str(record.get("player2") or "").strip()
+            result = RESULT_CODES.get(str(record.get("result") or "").strip().lower())
+            match = matches.get(frozenset((player1, player2)))
+            if match is None:
+                errors.append(f"Result {number}: no match between '{player1}' and '{player2}' "
+                              f"in round {tournament.current_round}.")
+            elif match.played:
+                errors.append(f"Result {number}: the match {player1} - {player2} already has a result.")
+            elif id(match) in accepted:
+                errors.append(f"Result {number}: duplicate result for the match {player1} - {player2}.")
+            elif result is None:
+                errors.append(f"Result {number}: invalid result '{record.get('result')}'.")
+            else:
+                if player1 != match.player1.chess_id:
+                    result = FLIPPED_RESULTS[result]
+                accepted[id(match)] = (match, result)
+
+        if errors:
+            for error in errors:
+                print(error)
+            print("No result was recorded.")
+            return False
+
+        for match, result in accepted.values():
+            match.play_match(result)
+
+        missing = sum(not match.played for match in current_round)
+        print(f"{len(accepted)} results recorded for round {tournament.current_round}.")
+        if missing:
+            print(f"{missing} matches still without a result.")
+        self.finish_round(tournament)
+        return True
+
+    def import_round_results(self, tournament, source):
+        # Reads a results file (or stdin) and records its results in the current round of the tournament.
+        try:
+            results = self.read_round_results(source)
+        except Exception as e:
+            print(f"Failed to read the results: {e}")
+            return False
+        return self.enter_round_results(tournament, results)
+
     def view_player_details(self, tournament_name):
         # Displays details of all players participating in a specific tournament.
-        tournament = self.tournaments.get(tournament_name)
+        tournament = self.get_tournament(tournament_name)
         if not tournament:
             print(f"No tournament found with the name '{tournament_name}'.")
             return
@@ -152,6 +496,7 @@ class ManageTournament:
     def select_players(self, num_players):
         # Selects players for a tournament based on user input.
         selected_players = []
+        selected_ids = set()
         while len(selected_players) < num_players:
             search_term = input(
                 "Enter a name or chess ID to search, or just press enter to list all players: ")
@@ -165,8 +510,9 @@ class ManageTournament:
                 input(f"Select player {len(selected_players) + 1} (enter number): ")) - 1
             if 0 <= player_index < len(display_list):
                 selected_player = display_list[player_index]
-                if selected_player not in selected_players:
+                if selected_player.chess_id not in selected_ids:
                     selected_players.append(selected_player)
+                    selected_ids.add(selected_player.chess_id)
                     self.display_selected_players(selected_players)
                 else:
                     print("Player already selected. Please choose a different player.")
@@ -183,7 +529,7 @@ class ManageTournament:
 
     def view_tournament_report(self, tournament_name):
         # Displays a detailed report of a specific tournament.
-        tournament = self.tournaments.get(tournament_name)
+        tournament = self.get_tournament(tournament_name)
         if not tournament:
             print(f"No tournament found with the name '{tournament_name}'.")
             return
@@ -191,78 +537,150 @@ class ManageTournament:
         self.create_tournament_report_html(tournament)
 
     def create_tournament_report_html(self, tournament):
-        # Creates an HTML template for the tournament report.
-        report_content = self.generate_tournament_report(tournament)
-
+        # Writes the HTML report of the tournament, section by section (see models.report).
         file_name = f"{tournament.name}_report.html"
         file_path = os.path.join(
             "data/tournaments/tournament_reports", file_name)
 
         try:
-            with open(file_path, 'w') as file:
-                file.write(report_content)
+            write_report(tournament, file_path)
             print(f"Tournament report saved in {os.path.abspath(file_path)}")
             print("The Tournament Report has been generated successfully")
             print("Check your tournament reports folder")
         except Exception as e:
             print(f"Failed to save tournament report: {e}")
 
+    def generate_all_reports(self, workers=None, force=False):
+        # Writes the reports of all the tournaments with a pool of processes (see models.report_batch).
+        # Unchanged tournaments are skipped, and only the changed rounds of the others are rendered again.
+        infos = self.tournament_infos(keep_snapshot=True)
+        # Registers the players of the tournaments (read from the database, if any)
+        self.find_players({chess_id for info in infos for chess_id in info["players"]})
+        results = generate_reports(infos, self.registry, workers=workers, force=force)
+        for tournament_name, status, details in results:
+            if status == "rendered":
+                print(f"{tournament_name}: report written ({details} round section(s) rendered)")
+            elif status == "skipped":
+                print(f"{tournament_name}: unchanged")
+            else:
+                print(f"{tournament_name}: failed to write the report: {details}")
+        return results
+
     def generate_tournament_report(self, tournament):
         # Generates the content for the HTML tournament report.
-        report_content = f"<html>\n<head>\n<title>Tournament Report - {
-            tournament.name}</title>\n</head>\n<body>\n"
-        report_content += f"<h1>Tournament Report: {tournament.name}</h1>\n"
-        report_content += f"<p>Dates: {
-            tournament.start_date} to {tournament.end_date}</p>\n"
-        report_content += f"<p>Venue: {tournament.venue}</p>\n"
-        report_content += f"<p>Current Round: {
-            tournament.current_round}/{tournament.max_round}</p>\n"
-
-        report_content += "<h2>Players (sorted by points)</h2>\n"
-        sorted_players = sorted(
-            tournament.players, key=lambda x: x.points, reverse=True)
-        report_content += "<ul>\n"
-        for player in sorted_players:
-            report_content += f"<li>{
-                player.name} (Points: {player.points})</li>\n"
-        report_content += "</ul>\n"
-
-        report_content += "<h2>Rounds and Matches</h2>\n"
-        for round_num, round_matches in enumerate(tournament.rounds, start=1):
-            report_content += f"<h3>Round {round_num}</h3>\n<ul>\n"
-            for match in round_matches:
-                match_info = f"{match.player1.name} vs {match.player2.name}"
-                if match.played:
-                    result = f"Result: {match.result}"
-                else:
-                    result = "Not played yet"
-                report_content += f"<li>Match: {match_info}, {result}</li>\n"
-            report_content += "</ul>\n"
-
-        report_content += "</body>\n</html>"
-        return report_content
+        return "".join(render_report(tournament))
 
     def load_all_tournaments(self):
-        tournament_files = [file for file in os.listdir(
-            "data/tournaments") if file.endswith("_info.json")]
+        # Lists the tournaments without loading them (see get_tournament).
+        # Summaries come from the manifest: only the files which changed since it was written are read
+        # (in parallel), and the manifest is updated with them.
+        if self.store is not None:
+            for info in self.store.tournament_summaries():
+                self.update_manifest(info["name"], info)
+            return
+
+        manifest = self.read_manifest()
+        tournament_files = sorted(file for file in os.listdir(
+            "data/tournaments") if file.endswith("_info.json"))
+        to_read = []
         for file_name in tournament_files:
             tournament_name = file_name.replace("_info.json", "")
-            self.load_tournaments(os.path.join(
-                "data/tournaments", file_name), tournament_name)
+            file_path = os.path.join("data/tournaments", file_name)
+            entry = manifest.get(tournament_name)
+            if entry and entry["fingerprint"] == TournamentLog.files_fingerprint(file_path):
+                self.manifest[tournament_name] = entry
+            else:
+                # Keep the position of the tournament in the (sorted) manifest
+                self.manifest[tournament_name] = None
+                to_read.append(file_path)
+
+        for file_path, data, error in load_parallel(to_read, read_tournament, self.workers, self.processes):
+            tournament_name = os.path.basename(file_path).replace("_info.json", "")
+            if error:
+                self.report_load_error(tournament_name, error)
+                del self.manifest[tournament_name]
+            else:
+                self.update_manifest(tournament_name, data, TournamentLog.files_fingerprint(file_path))
+
+        if to_read or len(manifest) != len(self.manifest):
+            self.write_manifest()
+
+    def read_manifest(self):
+        # Reads the manifest file: the summaries of the tournament files by tournament name.
+        try:
+            manifest = read_json(MANIFEST_PATH)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+        for entry in manifest.values():
+            # JSON has no tuples: restore the fingerprint as returned by TournamentLog.files_fingerprint
+            entry["fingerprint"] = tuple(tuple(fp) if fp else None for fp in entry["fingerprint"])
+        return manifest
 
-    def load_tournaments(self, file_path, tournament_name):
-        """Loads a tournament from a JSON file."""
+    def write_manifest(self):
         try:
-            with open(file_path, 'r') as file:
-                data = json.load(file)
+            with open(MANIFEST_PATH, "w") as file:
+                json.dump(self.manifest, file)
+        except Exception as e:
+            print(f"Failed to save the tournament manifest: {e}")
+
+    def update_manifest(self, tournament_name, info, fingerprint=None):
+        # Updates the summary of a tournament from its information (as saved in its file).
+        self.manifest[tournament_name] = {
+            "dates": info["dates"],
+            "venue": info["venue"],
+            "status": "completed" if info.get("completed") else "in progress",
+            "current_round": info.get("current_round", 0),
+            "number_of_rounds": info["number_of_rounds"],
+            "fingerprint": fingerprint,
+        }
 
-            players = []
-            for player_id in data['players']:
-                # Assuming 'players' in the JSON file contains a list of player IDs
-                player = next(
-                    (p for p in self.all_players if p.chess_id == player_id), None)
-                if player:
-                    players.append(player)
+    def get_tournament(self, tournament_name):
+        # Returns a tournament, loaded from its file (or the database) on first access.
+        # Returns None if there is no tournament with this name.
+        tournament = self.tournaments.get(tournament_name)
+        if tournament is None and tournament_name in self.manifest:
+            if self.store is not None:
+                self.load_tournaments(self.store.filepath, tournament_name,
+                                      data=self.store.load_tournament(tournament_name))
+            else:
+                self.load_tournaments(os.path.join("data/tournaments", f"{tournament_name}_info.json"),
+                                      tournament_name)
+            tournament = self.tournaments.get(tournament_name)
+        return tournament
+
+    def tournament_infos(self, keep_snapshot=False):
+        # Returns the information of every tournament (as saved in their files), without loading them.
+        # With keep_snapshot, the up-to-date snapshots of the standings and opponents are kept (see read_tournament).
+        if self.store is not None:
+            return [self.store.load_tournament(name) for name in self.manifest]
+        file_paths = [os.path.join("data/tournaments", f"{name}_info.json") for name in self.manifest]
+        infos = []
+        reader = partial(read_tournament, keep_snapshot=keep_snapshot)
+        for file_path, info, error in load_parallel(file_paths, reader, self.workers, self.processes):
+            if error:
+                self.report_load_error(os.path.basename(file_path).replace("_info.json", ""), error)
+            else:
+                infos.append(info)
+        return infos
+
+    def report_load_error(self, tournament_name, error):
+        # Reports a tournament which could not be loaded.
+        if isinstance(error, FileNotFoundError):
+            print(f"No tournament file found for '{tournament_name}'.")
+        else:
+            print(f"Error loading tournament '{tournament_name}': {error}")
+
+    @timed("storage", "load_tournaments")
+    def load_tournaments(self, file_path, tournament_name, data=None):
+        """Loads a tournament from a JSON file (or from the data already decoded from it)."""
+        try:
+            if data is None:
+                data = read_json(file_path)
+
+            # 'players' in the JSON file contains a list of player IDs
+            players_by_id = self.find_players(data['players'])
+            players = [players_by_id[player_id] for player_id in data['players'] if player_id in players_by_id]
 
             new_tournament = Tournament(
                 data['name'],
@@ -277,59 +695,175 @@ class ManageTournament:
             new_tournament.current_round = data.get('current_round', 0)
 
             # Update rounds based on the loaded data
+            # With a snapshot of the standings, matches are not replayed: the standings are restored from it
+            snapshot = data.get("standings")
+            opponents = data.get("opponents")
             for round_matches in data.get('rounds', []):
                 round_info = []
                 for match_info in round_matches:
                     player1_id, player2_id = match_info["players"]
-                    player1 = next(
-                        (p for p in new_tournament.players if p.chess_id == player1_id), None)
-                    player2 = next(
-                        (p for p in new_tournament.players if p.chess_id == player2_id), None)
+                    player1 = players_by_id.get(player1_id)
+                    player2 = players_by_id.get(player2_id)
 
                     winner = match_info.get("winner")
 
-                    # Create a match object and update its state
-                    match = Match(player1, player2)
-                    match.play_match(winner)
+                    # Create a match object and update its state (matches of a paired round may have no result yet)
+                    match = Match(player1, player2, standings=new_tournament.standings)
+                    if not match_info.get("completed", True):
+                        pass
+                    elif snapshot is not None:
+                        match.played = True
+                        match.result = winner
+                    else:
+                        match.play_match(winner)
 
                     round_info.append(match)
 
-                new_tournament.rounds.append(round_info)
+                if opponents is None:
+                    new_tournament.add_round(round_info)
+                else:
+                    new_tournament.rounds.append(round_info)
+
+            if opponents is not None:
+                # Opponent matrix of the snapshot (the rounds above are already in it)
+                new_tournament.opponents = OpponentMatrix.deserialize(opponents)
+
+            if snapshot is not None:
+                new_tournament.standings.restore(snapshot)
+                for player in players:
+                    player.points += new_tournament.standings.points(player)
+
+            # Then the events logged since the snapshot are applied
+            if self.store is None:
+                sequence = data.get("sequence", 0)
+                log = TournamentLog(file_path)
+                for event in log.read_events(sequence):
+                    self.replay_event(new_tournament, event, players_by_id)
+                    sequence = event["sequence"]
+                log.track(new_tournament, sequence)
+                self.logs[tournament_name] = log
 
             self.tournaments[tournament_name] = new_tournament
             print(f"Tournament '{tournament_name}' loaded from {file_path}.")
-        except FileNotFoundError:
-            print(f"No tournament file found for '{tournament_name}'.")
         except Exception as e:
-            print(f"Error loading tournament '{tournament_name}': {e}")
+            self.report_load_error(tournament_name, e)
+
+    def replay_event(self, tournament, event, players_by_id):
+        # Applies an event of the log of a tournament (new round or result) while loading it.
+        if event["event"] == "round":
+            matches = [Match(players_by_id.get(player1_id), players_by_id.get(player2_id),
+                             standings=tournament.standings)
+                       for player1_id, player2_id in event["matches"]]
+            for match in matches:
+                if match.is_bye():
+                    match.play_match("bye")
+            tournament.add_round(matches)
+            tournament.current_round = event["round"]
+        elif event["event"] == "result":
+            tournament.rounds[event["round"] - 1][event["board"]].play_match(event["winner"])
 
     def remove_tournament(self):
         # Removes a tournament from the tournaments list based on user input.
-        if not self.tournaments:
+        # The tournament is moved to the archive, from which it can be restored.
+        if not self.manifest:
             print("There are no ongoing tournaments to remove.")
             return
 
         tournament_name = input(
             "Enter the name of the tournament to remove: ").strip()
-        if tournament_name in self.tournaments:
-            # removed_tournament = self.tournaments.pop(tournament_name)
-            print(f"Tournament '{tournament_name}' has been removed.")
+        if tournament_name in self.manifest:
+            if self.archive_tournament(tournament_name, "removed"):
+                print(f"Tournament '{tournament_name}' has been removed.")
+        else:
+            print(f"No tournament found with the name '{tournament_name}'.")
 
-            # Rename the JSON file
-            old_file_path = os.path.join(
-                "data/tournaments", f"{tournament_name}_info.json")
-            new_file_path = os.path.join(
-                "data/tournaments", f"{tournament_name}_info_removed.json")
+    def archive_tournament(self, tournament_name, status):
+        # Moves a tournament to the archive with a status ("completed" or "removed").
+        # Its files (or database rows) are deleted and it is no longer listed.
+        file_path = os.path.join("data/tournaments", f"{tournament_name}_info.json")
+        try:
+            if self.store is not None:
+                info = self.store.load_tournament(tournament_name)
+            else:
+                info = read_tournament(file_path)
+            if status == "completed" and not is_completed(info):
+                # Saved before its last results were entered: they could not be entered once archived
+                print(f"Tournament '{tournament_name}' still has matches without a result: not archived.")
+                return False
+            self.archive.add(info, status)
+        except Exception as e:
+            print(f"Failed to archive tournament '{tournament_name}': {e}")
+            return False
 
-            try:
-                os.rename(old_file_path, new_file_path)
-                print(f"File '{tournament_name}_info.json' renamed to '{tournament_name}_info_removed.json'")
-            except Exception as e:
-                print(f"Failed to rename tournament file: {e}")
+        if self.store is not None:
+            self.store.remove_tournament(tournament_name)
         else:
-            print(f"No tournament found with the name '{tournament_name}'.")
+            (self.logs.pop(tournament_name, None) or TournamentLog(file_path)).delete()
+        self.tournaments.pop(tournament_name, None)
+        del self.manifest[tournament_name]
+        if self.store is None:
+            self.write_manifest()
+        print(f"Tournament '{tournament_name}' moved to the archive ({status}).")
+        return True
+
+    def archive_completed_tournaments(self):
+        # Moves the completed tournaments to the archive, as well as the files of the tournaments
+        # removed before the archive existed (*_info_removed.json). Returns the number of tournaments archived.
+        count = 0
+        for tournament_name, entry in list(self.manifest.items()):
+            if entry["status"] == "completed" and self.archive_tournament(tournament_name, "completed"):
+                count += 1
+
+        if self.store is None:
+            for file_name in sorted(os.listdir("data/tournaments")):
+                if not file_name.endswith("_info_removed.json"):
+                    continue
+                log = TournamentLog(os.path.join("data/tournaments", file_name))
+                try:
+                    self.archive.add(read_tournament(log.filepath), "removed")
+                except Exception as e:
+                    print(f"Failed to archive '{file_name}': {e}")
+                    continue
+                log.delete()
+                count += 1
+        return count
+
+    def restore_tournament(self, tournament_name):
+        # Moves a tournament back from the archive to the tournaments list.
+        if tournament_name not in self.archive:
+            print(f"No archived tournament found with the name '{tournament_name}'.")
+            return False
+        if tournament_name in self.manifest:
+            print(f"Tournament '{tournament_name}' already exists.")
+            return False
 
-    def search_players(self, search_term):
-        # Searches and returns players matching the given search term (name or chess ID).
-        return [player for player in self.all_players
-                if search_term.lower() in player.name.lower() or search_term.lower() in player.chess_id.lower()]
+        info = self.archive.get(tournament_name)
+        file_path = os.path.join("data/tournaments", f"{tournament_name}_info.json")
+        try:
+            if self.store is not None:
+                self.store.save_tournament(info)
+                self.update_manifest(tournament_name, info)
+            else:
+                with open(file_path, 'w') as file:
+                    json.dump(info, file)
+                self.update_manifest(tournament_name, info, TournamentLog.files_fingerprint(file_path))
+                self.write_manifest()
+        except Exception as e:
+            print(f"Failed to restore tournament '{tournament_name}': {e}")
+            return False
+
+        self.archive.remove(tournament_name)
+        print(f"Tournament '{tournament_name}' has been restored.")
+        return True
+
+    def search_players(self, search_term, limit=SEARCH_LIMIT):
+        # Searches and returns players matching the given search term (name, chess ID or email).
+        # Exact emails are answered directly from the registry, the rest goes through the search index.
+        # With a database, the search is a query (only the matching players are read).
+        if self.store is not None:
+            return self.register_rows(self.store.search_players(search_term, limit=limit))
+        self.refresh_clubs()
+        exact = self.registry.get_by_email(search_term)
+        if exact:
+            return [exact]
+        return self.registry.search(search_term, limit=limit)
@@ -0,0 +1,20 @@
+"""
+This script imports the JSON club and tournament files into a SQLite database.
+Run it from the project folder: python -m data.migrate_to_sqlite [database]
+The database can then be used with the --db option of main.py and manage_clubs.py.
+"""
+import argparse
+
+from models.sqlite_store import SQLiteStore
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import the JSON files into a SQLite database.")
+    parser.add_argument("database", type=str, nargs="?", default="data/chess.sqlite3", help="database file")
+    parser.add_argument("--clubs", type=str, default="data/clubs", help="folder of the club files")
+    parser.add_argument("--tournaments", type=str, default="data/tournaments", help="folder of the tournament files")
+
+    args = parser.parse_args()
+    store = SQLiteStore(args.database)
+    clubs, tournaments = store.migrate_from_json(args.clubs, args.tournaments)
+    store.close()
+    print(f"{clubs} club(s) and {tournaments} tournament(s) imported into {args.database}")
@@ -0,0 +1,21 @@
+"""
+This script computes the Elo ratings by replaying every tournament file, and saves the snapshot
+used by the tournament program (which then only applies new rounds).
+Run it from the project folder: python -m data.rebuild_ratings
+"""
+import argparse
+
+from data.manage_tournament import RATINGS_PATH
+from models.rating import RatingBook
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the rating snapshot from the tournament files.")
+    parser.add_argument("--tournaments", type=str, default="data/tournaments", help="folder of the tournament files")
+    parser.add_argument("--output", type=str, default=RATINGS_PATH, help="rating snapshot file")
+    parser.add_argument("--top", type=int, default=10, help="number of players to display")
+
+    args = parser.parse_args()
+    ratings = RatingBook.from_archive(args.tournaments)
+    ratings.save(args.output)
+    for chess_id, rating in ratings.ranking()[:args.top]:
+        print(f"{chess_id}: {rating:.0f}")
@@ -1,9 +1,37 @@
+import argparse
+
 from data.manage_tournament import ManageTournament
+from models.metrics import METRICS_ENV, enable, timer
+from models.sqlite_store import SQLiteStore
 from screens.tournaments.view import TournamentView
 
+# Names of the main menu options (operation names of the latency instrumentation, see models.metrics)
+MENU_ACTIONS = {
+    '1': "create-tournament",
+    '2': "manage-tournament",
+    '3': "list-tournaments",
+    '4': "remove-tournament",
+    '6': "archive-completed",
+    '7': "browse-archive",
+    '8': "player-history",
+}
+
+
+def enter_results(manager, tournament_name, pair=False, results=None):
+    # Non-interactive round handling: pairs the next round and/or records its results from a file.
+    tournament = manager.get_tournament(tournament_name)
+    if tournament is None:
+        print(f"No tournament found with the name '{tournament_name}'.")
+        return False
+    if pair and not manager.pair_next_round(tournament):
+        return False
+    if results:
+        return manager.import_round_results(tournament, results)
+    return True
 
-def main():
-    manager = ManageTournament()
+
+def main(db=None, workers=None, processes=False):
+    manager = ManageTournament(workers=workers, processes=processes, store=SQLiteStore(db) if db else None)
     tview = TournamentView(manager)
 
     while True:
@@ -13,22 +41,60 @@ def main():
         print("3. List all Ongoing Tournaments")
         print("4. Remove a Tournament")
         print("5. Exit")
+        print("6. Archive Completed Tournaments")
+        print("7. Browse the Archive")
+        print("8. Player History")
         choice = input("Choose an option: ")
 
-        if choice == '1':
-            manager.create_tournament()
-        elif choice == '2':
-            tview.manage_tournament()
-        elif choice == '3':
-            tview.get_tournament()
-        elif choice == '4':
-            manager.remove_tournament()
-        elif choice == '5':
+        if choice == '5':
             print("Exiting program.")
             break
-        else:
+        if choice not in MENU_ACTIONS:
             print("Invalid option, please try again.")
+            continue
+
+        # Each option is timed as a whole (prompts included) when the instrumentation is enabled
+        with timer(f"menu.{MENU_ACTIONS[choice]}"):
+            if choice == '1':
+                manager.create_tournament()
+            elif choice == '2':
+                tview.manage_tournament()
+            elif choice == '3':
+                tview.get_tournament()
+            elif choice == '4':
+                manager.remove_tournament()
+            elif choice == '6':
+                # The tournament files are moved: ask first
+                confirm = input("Move the completed tournaments to the archive? (y/n): ").strip().lower()
+                if confirm == 'y':
+                    count = manager.archive_completed_tournaments()
+                    print(f"{count} tournament(s) archived.")
+            elif choice == '7':
+                tview.browse_archive()
+            elif choice == '8':
+                tview.view_player_history()
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Manage the chess tournaments.")
+    parser.add_argument("--db", type=str, help="SQLite database to use instead of the JSON files")
+    parser.add_argument("--tournament", type=str, help="Tournament to pair or to enter results for")
+    parser.add_argument("--pair", action="store_true", help="Pair the next round of the tournament")
+    parser.add_argument("--results", type=str, metavar="FILE",
+                        help="Record the results of the current round from a CSV or JSON lines file ('-' for stdin)")
+    parser.add_argument("--metrics", type=str, metavar="FILE",
+                        help=f"Record the latency of the menu options and saves to a JSON file (or set {METRICS_ENV})")
+    parser.add_argument("--workers", type=int, help="number of workers loading the club and tournament files")
+    parser.add_argument("--processes", action="store_true",
+                        help="load the club and tournament files with a pool of processes instead of threads")
+    args = parser.parse_args()
+    if args.metrics:
+        enable(args.metrics)
+    if args.pair or args.results:
+        if not args.tournament:
+            parser.error("--pair and --results need --tournament")
+        store = SQLiteStore(args.db) if args.db else None
+        manager = ManageTournament(workers=args.workers, processes=args.processes, store=store)
+        ok = enter_results(manager, args.tournament, pair=args.pair, results=args.results)
+        raise SystemExit(0 if ok else 1)
+    main(db=args.db, workers=args.workers, processes=args.processes)
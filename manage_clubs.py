@@ -1,4 +1,12 @@
-from commands import ClubListCmd
+import argparse
+import time
+
+from commands import ClubListCmd, PlayerImportCmd
+from commands.import_players import read_player_records
+from commands.script import ScriptRunner, read_script
+from models import get_club_manager
+from models.metrics import METRICS_ENV, enable
+from models.sqlite_store import SQLiteStore
 from screens import ClubCreate, ClubView, MainMenu, PlayerEdit, PlayerView
 
 
@@ -35,6 +43,74 @@ class App:
                 self.context.run = False
 
 
+def import_players(filepath, club_name):
+    """Non-interactive import of a roster file into a club (created if needed)"""
+    cm = get_club_manager()
+    club = next((c for c in cm.clubs if c.name == club_name), None) or cm.create(club_name)
+
+    command = PlayerImportCmd(club, read_player_records(filepath))
+    command()
+
+    for number, record, message in command.errors:
+        print(f"Record {number} skipped: {message}")
+    print(f"{len(command.created)} player(s) imported into {club.name}, {len(command.errors)} error(s).")
+    return not command.errors
+
+
+def run_script(source, batch=False, output=None):
+    """Headless mode: runs the operations of a JSON lines script against the clubs (see ScriptRunner)"""
+    runner = ScriptRunner(batch=batch)
+    start = time.perf_counter()
+    if output:
+        with open(output, "w") as fp:
+            runner.run(read_script(source), fp)
+    else:
+        runner.run(read_script(source))
+    elapsed = time.perf_counter() - start
+
+    for number, operation, message in runner.errors:
+        print(f"Line {number} failed: {message}")
+    rate = runner.count / elapsed if elapsed else 0
+    print(f"{runner.count} operation(s) in {elapsed:.2f}s ({rate:.0f}/s), {len(runner.errors)} error(s).")
+    return not runner.errors
+
+
 if __name__ == "__main__":
-    app = App()
-    app.run()
+    parser = argparse.ArgumentParser(description="Manage the chess clubs.")
+    parser.add_argument("--db", type=str, help="SQLite database to use instead of the JSON files")
+    parser.add_argument("--journal", action="store_true",
+                        help="append player changes to the club journals instead of rewriting the club files")
+    parser.add_argument("--workers", type=int, help="number of workers loading the club files")
+    parser.add_argument("--processes", action="store_true",
+                        help="load the club files with a pool of processes instead of threads")
+    parser.add_argument("--metrics", type=str, metavar="FILE",
+                        help=f"Record the latency of commands, screens and saves in a JSON file (see {METRICS_ENV})")
+    subparsers = parser.add_subparsers(dest="action")
+    # Non-interactive import (without action, the interactive application is run)
+    import_parser = subparsers.add_parser("import", help="import players into a club")
+    import_parser.add_argument("filename", type=str, help="CSV, JSON or JSON lines file with the players")
+    import_parser.add_argument("--club", type=str, required=True, help="club name")
+    # Headless mode: scripted operations instead of the screens
+    run_parser = subparsers.add_parser("run", help="run the operations of a JSON lines script")
+    run_parser.add_argument("script", type=str, help="JSON lines file, one operation per line ('-' for stdin)")
+    run_parser.add_argument("--batch", action="store_true", help="write each club once, at the end of the script")
+    run_parser.add_argument("--output", type=str, metavar="FILE", help="JSON lines file receiving the results")
+
+    args = parser.parse_args()
+    if args.metrics:
+        enable(args.metrics)
+    if args.db or args.journal or args.workers or args.processes:
+        # Creates the shared club manager (on the database, in journaled mode or with these pool settings):
+        # commands will then use it
+        get_club_manager(store=SQLiteStore(args.db) if args.db else None, journal=args.journal,
+                         workers=args.workers, processes=args.processes)
+
+    if args.action == "import":
+        if not import_players(args.filename, args.club):
+            raise SystemExit(1)
+    elif args.action == "run":
+        if not run_script(args.script, batch=args.batch, output=args.output):
+            raise SystemExit(1)
+    else:
+        app = App()
+        app.run()
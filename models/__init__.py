@@ -1,5 +1,6 @@
 from .club import ChessClub
-from .club_manager import ClubManager
+from .club_manager import ClubManager, get_club_manager
 from .player import Player
+from .player_registry import PlayerRegistry
 
-__all__ = ["Player", "ChessClub", "ClubManager"]
+__all__ = ["Player", "ChessClub", "ClubManager", "PlayerRegistry", "get_club_manager"]
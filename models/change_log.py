@@ -0,0 +1,83 @@
+import json
+import os
+from pathlib import Path
+
+# Number of changes in the log triggering a new snapshot
+COMPACT_INTERVAL = 100
+
+
+class ChangeLog:
+    """
+    JSON snapshot file with an append-only log of the changes made since it (e.g. the
+    rating changes of a round), in a file with the same path and a .changes extension.
+
+    Changes are JSON objects, written one per line with a sequence number. The snapshot
+    keeps the sequence number of the last change it includes: a snapshot written without
+    clearing the log (interrupted save) does not get its changes applied twice. A new
+    snapshot is written, and the log cleared, once the log holds COMPACT_INTERVAL changes.
+    """
+
+    def __init__(self, filepath):
+        self.filepath = Path(filepath)
+        # Sequence number of the last change written or read
+        self.sequence = 0
+        # Number of changes in the log file
+        self.size = 0
+
+    @property
+    def changes_path(self):
+        return self.filepath.with_suffix(".changes")
+
+    def read(self):
+        """Returns the snapshot data (None if there is no snapshot) and the changes logged after it"""
+        try:
+            with open(self.filepath) as fp:
+                data = json.load(fp)
+        except FileNotFoundError:
+            return None, []
+        self.sequence = data.pop("sequence", 0)
+
+        try:
+            with open(self.changes_path) as fp:
+                lines = fp.readlines()
+        except FileNotFoundError:
+            lines = []
+
+        changes = []
+        for line in lines:
+            try:
+                change = json.loads(line)
+            except json.JSONDecodeError:
+                # Partially written change (interrupted write): it was never acknowledged,
+                # and the next save writes a snapshot rather than appending after it
+                self.size = COMPACT_INTERVAL
+                return data, changes
+            if change["sequence"] > self.sequence:
+                self.sequence = change["sequence"]
+                changes.append(change)
+        self.size = len(lines)
+        return data, changes
+
+    def append(self, changes):
+        """Appends changes to the log. Returns False if a snapshot must be written instead
+        (there is none yet, or the log is full): nothing is written then"""
+        if not self.filepath.exists() or self.size + len(changes) >= COMPACT_INTERVAL:
+            return False
+
+        lines = []
+        for change in changes:
+            self.sequence += 1
+            lines.append(json.dumps(dict(change, sequence=self.sequence)) + "\n")
+        with open(self.changes_path, "a") as fp:
+            fp.write("".join(lines))
+        self.size += len(changes)
+        return True
+
+    def write_snapshot(self, data):
+        """Writes the snapshot file (replaced atomically), then clears the log"""
+        temporary = self.filepath.with_suffix(".tmp")
+        with open(temporary, "w") as fp:
+            json.dump(dict(data, sequence=self.sequence), fp)
+        os.replace(temporary, self.filepath)
+        self.changes_path.unlink(missing_ok=True)
+        self.size = 0
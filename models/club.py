@@ -1,6 +1,20 @@
 import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
 
+from .metrics import timed
 from .player import Player
+from .validation import validate_player_data
+
+
+def file_fingerprint(filepath):
+    """Returns the (mtime, size) of a file, or None if it does not exist"""
+    try:
+        stat = Path(filepath).stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
 
 
 class ChessClub:
@@ -9,55 +23,294 @@ class ChessClub:
 
     Data is loaded from a JSON file (provided as argument).
     The class creates Player instances based on JSON data.
+
+    In journaled mode, player changes are appended to a journal file next to the
+    JSON file instead of rewriting the whole club. The JSON file is rebuilt from
+    the club data (compaction) once the journal holds COMPACT_THRESHOLD records.
+    Journal records are numbered, and the JSON file keeps the number of the last
+    record it includes: if the journal could not be cleared after a save, its
+    records are not applied twice.
+
+    A club can also be created from a manifest entry (see from_manifest): only
+    its name and player count are known, players are loaded on first access.
+
+    With a store (see SQLiteStore), the club is kept in the database instead of
+    a JSON file and each player change is a single row write.
+
+    Listeners (e.g. PlayerRegistry.club_changed) are called as listener(club, player)
+    once a player change is written, with player None for the changes written
+    together (batch).
     """
 
-    def __init__(self, filepath=None, name=None):
+    # Number of journal records triggering the compaction of the journal into the JSON file
+    COMPACT_THRESHOLD = 100
+
+    def __init__(self, filepath=None, name=None, journal=False, store=None):
         """The constructor works in two ways:
-        - if the filepath is provided, it loads data from JSON
+        - if the filepath is provided, it loads data from JSON (and replays the journal, if any)
         - if it is not but a name is provided, it creates a new club (and a new JSON file)
+        With a store, the club is identified by its name: it is created if it does not exist yet,
+        otherwise its players are loaded on first access.
         """
 
         self.name = name
         self.filepath = filepath
         self.players = []
+        # Number of players given by the manifest, for clubs which are not loaded yet
+        self._player_count = 0
+        self.journal = journal
+        # Number of records currently in the journal file
+        self.journal_size = 0
+        # Sequence number of the last journal record written or applied
+        self.journal_sequence = 0
+        # On-disk state of the club files when they were last read or written
+        self.fingerprint = None
+        # Depth of nested batch() blocks: changes are only written when leaving the outermost one
+        self._batch_depth = 0
+        self.store = store
+        # Callables notified of the player changes (see log and batch)
+        self.listeners = []
 
-        if filepath and not name:
-            # Load data from the JSON file
-            with open(filepath) as fp:
-                data = json.load(fp)
-                self.name = data["name"]
-                self.players = [
-                    Player(**player_dict) for player_dict in data["players"]
-                ]
+        if store is not None:
+            if store.club_id(name) is None:
+                self.save()
+            else:
+                self._players = None
+        elif filepath and not name:
+            self.load()
         elif not filepath:
             # We did not have a file, so we are going to create it by running the save method
             self.save()
 
+    @classmethod
+    def from_manifest(cls, filepath, name, player_count, fingerprint, journal=False):
+        """Creates a club which is not loaded yet: players are read from the file when first accessed"""
+        club = cls(filepath=filepath, name=name, journal=journal)
+        club._players = None
+        club._player_count = player_count
+        club.fingerprint = fingerprint
+        return club
+
+    @classmethod
+    def from_store(cls, store, name, player_count):
+        """Creates a club stored in the database, given its player count: players are read when first accessed"""
+        club = cls(name=name, store=store)
+        club._player_count = player_count
+        return club
+
+    @property
+    def players(self):
+        """The players of the club (loaded from the file if needed)"""
+        if self._players is None:
+            self.load()
+        return self._players
+
+    @players.setter
+    def players(self, value):
+        self._players = value
+
+    @property
+    def is_loaded(self):
+        return self._players is not None
+
+    @property
+    def player_count(self):
+        """Number of players, without loading them if the club is not loaded yet"""
+        return len(self._players) if self.is_loaded else self._player_count
+
+    def load(self):
+        """Loads data from the JSON file, then replays the journal (if any)"""
+        if self.store is not None:
+            self.players = self.store.load_players(self.name)
+            return
+
+        with open(self.filepath) as fp:
+            data = json.load(fp)
+            self.name = data["name"]
+            self.players = [
+                Player(**player_dict) for player_dict in data["players"]
+            ]
+        self.journal_size = 0
+        self.journal_sequence = data.get("journal_sequence", 0)
+        self.replay_journal()
+        self.fingerprint = self.disk_fingerprint()
+
+    @staticmethod
+    def files_fingerprint(filepath):
+        """Fingerprint of the files of a club (JSON file and journal) as they currently are on disk"""
+        return file_fingerprint(filepath), file_fingerprint(Path(filepath).with_suffix(".journal"))
+
+    @property
+    def journal_path(self):
+        """Path of the journal file: the JSON file path with a .journal extension"""
+        return Path(self.filepath).with_suffix(".journal")
+
+    def disk_fingerprint(self):
+        """Fingerprint of the club files as they currently are on disk"""
+        return self.files_fingerprint(self.filepath)
+
+    @timed("storage", "save")
     def save(self):
-        """Serializes the players and saves the club info to the JSON file"""
+        """Serializes the players and saves the club info to the JSON file (replaced atomically)
+
+        The JSON file then holds every change, so the journal (if any) is cleared.
+        """
 
-        with open(self.filepath, "w") as fp:
-            json.dump(
-                {"name": self.name, "players": [p.serialize() for p in self.players]},
-                fp,
-            )
+        if self.store is not None:
+            self.store.save_club(self.name, self.players)
+            return
+
+        data = {"name": self.name, "players": [p.serialize() for p in self.players]}
+        if self.journal_sequence:
+            # The journal records up to this one are included (see replay_journal)
+            data["journal_sequence"] = self.journal_sequence
+        temporary = Path(self.filepath).with_suffix(".tmp")
+        with open(temporary, "w") as fp:
+            json.dump(data, fp)
+        os.replace(temporary, self.filepath)
+
+        self.journal_path.unlink(missing_ok=True)
+        self.journal_size = 0
+        self.fingerprint = self.disk_fingerprint()
+
+    def compact(self):
+        """Rebuilds the JSON file from the club data and clears the journal"""
+        self.save()
+
+    def replay_journal(self):
+        """Applies the records of the journal file (if any) to the loaded players
+
+        Records already included in the JSON file (sequence number not higher than its
+        journal_sequence) are skipped. Records without a sequence number are always applied.
+        """
+
+        try:
+            with open(self.journal_path) as fp:
+                lines = fp.readlines()
+        except FileNotFoundError:
+            return
+
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # Partially written record (interrupted write): it was never acknowledged
+                break
+
+            self.journal_size += 1
+            sequence = record.get("sequence")
+            if sequence is not None:
+                if sequence <= self.journal_sequence:
+                    continue
+                self.journal_sequence = sequence
+
+            player = Player(**record["player"])
+            if record["op"] == "create":
+                self.players.append(player)
+            elif record["op"] == "update":
+                self.players[record["index"]] = player
+
+    def log(self, op, player, index=None):
+        """Records a player change: row write with a store, appended to the journal in journaled mode,
+        full save otherwise"""
+
+        if self._batch_depth:
+            # Written once, when the batch is committed
+            return
+
+        if self.store is not None:
+            position = index if index is not None else len(self.players) - 1
+            self.store.save_player(self.name, position, player)
+        elif not self.journal:
+            self.save()
+        else:
+            self.journal_sequence += 1
+            record = {"op": op, "player": player.serialize(), "sequence": self.journal_sequence}
+            if index is not None:
+                record["index"] = index
+            with open(self.journal_path, "a") as fp:
+                fp.write(json.dumps(record) + "\n")
+            self.journal_size += 1
+            self.fingerprint = self.disk_fingerprint()
+
+            if self.journal_size >= self.COMPACT_THRESHOLD:
+                self.compact()
+        self.notify(player)
+
+    @contextmanager
+    def batch(self):
+        """Context manager grouping player changes into a single write
+
+        The club file is saved once when the (outermost) block exits normally.
+        If an exception is raised, the players added during the block are dropped
+        and nothing is written.
+        """
+
+        players = list(self.players)
+        self._batch_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self.players = players
+            raise
+
+        self._batch_depth -= 1
+        if not self._batch_depth:
+            self.save()
+            self.notify()
+
+    def notify(self, player=None):
+        """Calls the listeners with a changed player (None: any player may have changed)"""
+        for listener in self.listeners:
+            listener(self, player)
+
+    def create_players(self, records):
+        """Creates players in bulk from an iterable of dictionaries
+
+        Every record is validated, invalid ones (or ones reusing a Chess ID of the club)
+        are skipped and reported. The club is written once for the whole batch.
+        Returns a tuple (created players, errors), where errors is a list of
+        (record number, record, message) tuples (record numbers start at 1).
+        """
+
+        created = []
+        errors = []
+        chess_ids = {p.chess_id for p in self.players}
+
+        with self.batch():
+            for number, record in enumerate(records, 1):
+                data = {key: record.get(key) for key in ("name", "email", "chess_id", "birthday")}
+                try:
+                    validate_player_data(data)
+                    if data["chess_id"] in chess_ids:
+                        raise ValueError(f"Chess ID {data['chess_id']} already in club {self.name}")
+                    created.append(self.create_player(**data))
+                    chess_ids.add(data["chess_id"])
+                except (ValueError, TypeError) as e:
+                    errors.append((number, record, str(e)))
+
+        return created, errors
 
     def create_player(self, **kwargs):
         """Utility method to create a new player instance and add it to the club"""
 
         player = Player(**kwargs)
         self.players.append(player)
-        self.save()
+        self.log("create", player)
         return player
 
     def update_player(self, player, **kwargs):
         """Utility method to update a player instance based on arguments provided"""
 
-        if player not in self.players:
+        # Looked up by identity: comparing players would parse the birthday of every player of the club
+        index = next((idx for idx, p in enumerate(self.players) if p is player), None)
+        if index is None:
             raise RuntimeError(f"Player {player} not in club {self.name}!")
 
         for key, value in kwargs.items():
             setattr(player, key, value)
 
-        self.save()
+        self.log("update", player, index=index)
         return player
@@ -1,25 +1,160 @@
 import json
+from functools import partial
 from pathlib import Path
 
 from .club import ChessClub
+from .parallel import load_parallel
+
+# Long-lived managers shared by the whole process, by data folder
+_managers = {}
 
 
 class ClubManager:
-    def __init__(self, data_folder="data/clubs"):
+    """
+    Manages all the clubs of a data folder.
+
+    Clubs are loaded from the JSON files of the folder. refresh() reloads only
+    the files which changed on disk (modification time or size) since they were
+    loaded or saved; hits and misses count the clubs reused and (re)loaded.
+
+    A manifest file (MANIFEST_NAME) keeps the name, player count and fingerprint
+    of each club file: clubs whose file did not change are created from it
+    without reading their players, which are only loaded when needed.
+
+    The other files are loaded by a pool of workers (see load_parallel):
+    workers sets its size and processes selects a process pool instead of threads.
+
+    With a store (see SQLiteStore), clubs are listed from the database instead.
+    """
+
+    MANIFEST_NAME = ".manifest"
+
+    def __init__(self, data_folder="data/clubs", journal=False, workers=None, processes=False, store=None):
         datadir = Path(data_folder)
         self.data_folder = datadir
+        # Whether the clubs use the journaled storage mode (see ChessClub)
+        self.journal = journal
+        self.workers = workers
+        self.processes = processes
+        self.store = store
         self.clubs = []
-        for filepath in datadir.iterdir():
+        self.hits = 0
+        self.misses = 0
+        self.manifest = self.read_manifest()
+        self.refresh()
+
+    @property
+    def manifest_path(self):
+        return self.data_folder / self.MANIFEST_NAME
+
+    def read_manifest(self):
+        """Reads the manifest: a dictionary of entries by club file name"""
+        try:
+            with open(self.manifest_path) as fp:
+                manifest = json.load(fp)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+        for entry in manifest.values():
+            # JSON has no tuples: restore the fingerprint as returned by ChessClub.disk_fingerprint
+            entry["fingerprint"] = tuple(tuple(fp) if fp else None for fp in entry["fingerprint"])
+        return manifest
+
+    def write_manifest(self):
+        """Updates the manifest from the clubs (only written if an entry changed)"""
+        manifest = {
+            Path(club.filepath).name: {
+                "name": club.name,
+                "player_count": club.player_count,
+                "fingerprint": club.fingerprint,
+            }
+            for club in self.clubs
+        }
+        if manifest != self.manifest:
+            with open(self.manifest_path, "w") as fp:
+                json.dump(manifest, fp)
+            self.manifest = manifest
+
+    def refresh(self):
+        """Reloads the club files which changed since they were loaded, and picks up new or deleted files"""
+        if self.store is not None:
+            return self.refresh_from_store()
+
+        loaded = {Path(club.filepath): club for club in self.clubs}
+        clubs = {}
+        to_load = []
+        for filepath in sorted(self.data_folder.iterdir()):
             if filepath.is_file() and filepath.suffix == ".json":
-                try:
-                    self.clubs.append(ChessClub(filepath))
-                except json.JSONDecodeError:
-                    print(filepath, "is invalid JSON file.")
+                club = loaded.get(filepath)
+                if club is not None and club.fingerprint == club.disk_fingerprint():
+                    self.hits += 1
+                    clubs[filepath] = club
+                    continue
+
+                entry = self.manifest.get(filepath.name)
+                if club is None and entry and entry["fingerprint"] == ChessClub.files_fingerprint(filepath):
+                    self.hits += 1
+                    clubs[filepath] = ChessClub.from_manifest(filepath, journal=self.journal, **entry)
+                    continue
+
+                self.misses += 1
+                # Keep the position of the club in the (sorted) list
+                clubs[filepath] = None
+                to_load.append(filepath)
+
+        loader = partial(ChessClub, journal=self.journal)
+        for filepath, club, error in load_parallel(to_load, loader, self.workers, self.processes):
+            if isinstance(error, json.JSONDecodeError):
+                print(filepath, "is invalid JSON file.")
+            elif error:
+                print(f"Error loading {filepath}: {error}")
+            clubs[filepath] = club
+
+        self.clubs = [club for club in clubs.values() if club is not None]
+        self.write_manifest()
+        return self.clubs
+
+    def refresh_from_store(self):
+        """Lists the clubs of the database, reusing the clubs already created"""
+        loaded = {club.name: club for club in self.clubs}
+        clubs = []
+        for name, player_count in self.store.clubs():
+            club = loaded.get(name)
+            if club is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+                club = ChessClub.from_store(self.store, name, player_count)
+            clubs.append(club)
+
+        self.clubs = clubs
+        return clubs
 
     def create(self, name):
+        if self.store is not None:
+            club = ChessClub(name=name, store=self.store)
+            self.clubs.append(club)
+            return club
+
         filepath = self.data_folder / (name.replace(" ", "") + ".json")
-        club = ChessClub(name=name, filepath=filepath)
+        club = ChessClub(name=name, filepath=filepath, journal=self.journal)
         club.save()
 
         self.clubs.append(club)
+        self.write_manifest()
         return club
+
+
+def get_club_manager(data_folder="data/clubs", store=None, journal=False, workers=None, processes=False):
+    """Returns the process-wide manager of the data folder, refreshed from the files which changed
+
+    The store (if any), the journaled storage mode and the pool settings (see ClubManager) are only
+    used by the first call, which creates the manager.
+    """
+    manager = _managers.get(data_folder)
+    if manager is None:
+        manager = _managers[data_folder] = ClubManager(data_folder, journal=journal, workers=workers,
+                                                       processes=processes, store=store)
+    else:
+        manager.refresh()
+    return manager
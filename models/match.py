@@ -1,25 +1,41 @@
 # models/match.py
 
 class Match:
-    def __init__(self, player1, player2):
+    def __init__(self, player1, player2, standings=None):
+        # player2 is None when player1 has a bye (no opponent for this round)
         self.player1 = player1
         self.player2 = player2
         self.played = False
         self.result = None
+        # Standings of the tournament, updated when the result is recorded
+        self.standings = standings
 
     def is_played(self):
         return self.played
 
+    def was_played(self):
+        # Same as is_played, like Round.was_played
+        return self.played
+
+    def is_bye(self):
+        return self.player2 is None
+
     def play_match(self, winner):
         if not self.played:
             self.played = True
             self.result = winner
-            if winner == "player1":
-                self.player1.points += 1.0
-                self.player2.points += 0.0
-            elif winner == "player2":
-                self.player1.points += 0.0
-                self.player2.points += 1.0
+            if self.is_bye():
+                points1, points2 = 1.0, 0.0
+            # Older files store the chess ID of the winner (see rating.match_points)
+            elif winner in ("player1", self.player1.chess_id):
+                points1, points2 = 1.0, 0.0
+            elif winner in ("player2", self.player2.chess_id):
+                points1, points2 = 0.0, 1.0
             else:
-                self.player1.points += 0.5
-                self.player2.points += 0.5
+                points1, points2 = 0.5, 0.5
+
+            self.player1.points += points1
+            if self.player2 is not None:
+                self.player2.points += points2
+            if self.standings is not None:
+                self.standings.record_match(self, points1, points2)
@@ -0,0 +1,152 @@
+import atexit
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+
+# Environment variable enabling the instrumentation: path of the JSON file written on exit
+METRICS_ENV = "CHESS_METRICS"
+# Upper bounds of the latency histogram buckets, in milliseconds (the last bucket holds the slower calls)
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Recorder of the process, None while the instrumentation is disabled
+_recorder = None
+
+
+class LatencyRecorder:
+    """
+    Call counts and latency histograms by operation name.
+
+    Operations are named after what was timed, e.g. "command.ClubCreateCmd",
+    "screen.ClubView" or "storage.ChessClub.save". Each one keeps its count,
+    total, minimum and maximum latency and a histogram (see BUCKETS_MS), so
+    recording a call does not grow memory. Calls can be recorded from several threads.
+    """
+
+    def __init__(self, filepath=None):
+        # JSON file written by dump() when no path is given
+        self.filepath = filepath
+        self.stats = {}
+        self.lock = threading.Lock()
+
+    def record(self, name, seconds):
+        """Records a call of an operation which took seconds"""
+        milliseconds = seconds * 1000
+        with self.lock:
+            stats = self.stats.get(name)
+            if stats is None:
+                stats = self.stats[name] = {
+                    "count": 0,
+                    "total": 0.0,
+                    "min": milliseconds,
+                    "max": milliseconds,
+                    "buckets": [0] * (len(BUCKETS_MS) + 1),
+                }
+            stats["count"] += 1
+            stats["total"] += milliseconds
+            stats["min"] = min(stats["min"], milliseconds)
+            stats["max"] = max(stats["max"], milliseconds)
+            stats["buckets"][bisect_left(BUCKETS_MS, milliseconds)] += 1
+
+    @staticmethod
+    def percentile(stats, fraction):
+        """Upper bound of the histogram bucket holding the given fraction of the calls (at most the maximum)"""
+        rank = fraction * stats["count"]
+        seen = 0
+        for bound, count in zip(BUCKETS_MS, stats["buckets"]):
+            seen += count
+            if seen >= rank:
+                return min(bound, stats["max"])
+        return stats["max"]
+
+    def to_dict(self):
+        """Returns the statistics of every operation (latencies in milliseconds), sorted by name"""
+        labels = [f"<={bound}" for bound in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}"]
+        with self.lock:
+            return {
+                name: {
+                    "count": stats["count"],
+                    "total_ms": round(stats["total"], 3),
+                    "mean_ms": round(stats["total"] / stats["count"], 3),
+                    "min_ms": round(stats["min"], 3),
+                    "max_ms": round(stats["max"], 3),
+                    "p50_ms": round(self.percentile(stats, 0.5), 3),
+                    "p95_ms": round(self.percentile(stats, 0.95), 3),
+                    "histogram": {label: count for label, count in zip(labels, stats["buckets"]) if count},
+                }
+                for name, stats in sorted(self.stats.items())
+            }
+
+    def dump(self, filepath=None):
+        """Writes the statistics to a JSON file (replaced atomically)"""
+        filepath = filepath or self.filepath
+        temporary = f"{filepath}.tmp"
+        with open(temporary, "w") as fp:
+            json.dump(self.to_dict(), fp, indent=2)
+        os.replace(temporary, filepath)
+
+
+def enable(filepath):
+    """Enables the instrumentation: the statistics are written to filepath when the program exits"""
+    global _recorder
+    if _recorder is None:
+        _recorder = LatencyRecorder(filepath)
+        atexit.register(_dump)
+    else:
+        _recorder.filepath = filepath
+    return _recorder
+
+
+def get_recorder():
+    """Returns the recorder of the process, or None if the instrumentation is disabled"""
+    return _recorder
+
+
+def _dump():
+    if _recorder is not None and _recorder.stats:
+        _recorder.dump()
+
+
+def timed(category, operation=None):
+    """
+    Method decorator recording the latency of each call under "category.ClassName[.operation]",
+    where ClassName is the class of the instance (e.g. the command class for BaseCommand.__call__).
+
+    While the instrumentation is disabled, the method is called directly.
+    """
+    def decorator(method):
+        suffix = f".{operation}" if operation else ""
+
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if _recorder is None:
+                return method(self, *args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                _recorder.record(f"{category}.{type(self).__name__}{suffix}", time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def timer(name):
+    """Records the latency of the with block under name (nothing is recorded while the instrumentation is disabled)"""
+    if _recorder is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _recorder.record(name, time.perf_counter() - start)
+
+
+if os.environ.get(METRICS_ENV):
+    enable(os.environ[METRICS_ENV])
@@ -1,12 +1,161 @@
+import base64
 import random
+import re
+import zlib
+
 from .round import Round
 
+# Number of backtracking steps allowed to avoid rematches before giving up on it
+MAX_BACKTRACK = 10_000
+
 
-def generate_pairings(players):
+class OpponentMatrix:
     """
-    Generate pairings for a round based on the current order of players.
+    Who played whom in a tournament, as a bit matrix indexed by player slot.
+
+    Each player of the tournament gets a slot (in the order they were added).
+    Bit (i, j) of the matrix is set once the players of slots i and j were paired
+    together. Byes, and the number of games played with the white pieces (player1
+    of a match) and with the black pieces (player2) are kept per slot in byte
+    arrays. All the lookups are O(1), and the matrix of a 5,000 players
+    tournament takes about 3 MB (much less once compressed for saving, see serialize()).
+
+    It is the history of the tournament given to generate_pairings (see Tournament.play_round).
     """
-    matches = [Round(players[i], players[i + 1]) for i in range(0, len(players), 2)]
+
+    def __init__(self, players=()):
+        self.slots = {}
+        self.size = 0
+        self.bits = bytearray()
+        self.byes = bytearray()
+        self.whites = bytearray()
+        self.blacks = bytearray()
+        players = list(players)
+        self._grow(len(players))
+        for player in players:
+            self.add_player(player.chess_id)
+
+    def add_player(self, chess_id):
+        """Gives a slot to a player (the matrix grows if needed), returns the slot"""
+        slot = self.slots.get(chess_id)
+        if slot is not None:
+            return slot
+        slot = self.slots[chess_id] = len(self.slots)
+        if slot >= self.size:
+            self._grow(max(slot + 1, self.size * 2))
+        return slot
+
+    def add_round(self, matches):
+        for match in matches:
+            self.add_match(match)
+
+    def add_match(self, match):
+        slot1 = self.add_player(match.player1.chess_id)
+        if match.player2 is None:
+            self.byes[slot1] = 1
+            return
+
+        slot2 = self.add_player(match.player2.chess_id)
+        self._set(slot1, slot2)
+        self._set(slot2, slot1)
+        self.whites[slot1] = min(self.whites[slot1] + 1, 255)
+        self.blacks[slot2] = min(self.blacks[slot2] + 1, 255)
+
+    def have_played(self, player1, player2):
+        return self.have_met(player1.chess_id, player2.chess_id)
+
+    def have_met(self, id1, id2):
+        slot1, slot2 = self.slots.get(id1), self.slots.get(id2)
+        if slot1 is None or slot2 is None:
+            return False
+        index = slot1 * self.size + slot2
+        return bool(self.bits[index >> 3] & (1 << (index & 7)))
+
+    def had_bye(self, player):
+        slot = self.slots.get(player.chess_id)
+        return slot is not None and bool(self.byes[slot])
+
+    def colour_balance(self, player):
+        """Games played with white minus games played with black"""
+        slot = self.slots.get(player.chess_id)
+        return 0 if slot is None else self.whites[slot] - self.blacks[slot]
+
+    def serialize(self):
+        """Returns the matrix in a format compatible with JSON (compressed byte arrays, see deserialize())"""
+        return {
+            "players": list(self.slots),
+            "size": self.size,
+            **{name: _encode(getattr(self, name)) for name in ("bits", "byes", "whites", "blacks")},
+        }
+
+    @classmethod
+    def deserialize(cls, data):
+        matrix = cls()
+        matrix.slots = {chess_id: slot for slot, chess_id in enumerate(data["players"])}
+        matrix.size = data["size"]
+        for name in ("bits", "byes", "whites", "blacks"):
+            setattr(matrix, name, _decode(data[name]))
+        return matrix
+
+    def _set(self, slot1, slot2):
+        index = slot1 * self.size + slot2
+        self.bits[index >> 3] |= 1 << (index & 7)
+
+    def _grow(self, size):
+        """Copies the matrix into a larger one (slots are unchanged)"""
+        bits = bytearray((size * size + 7) // 8)
+        # The matrix is sparse: only the non-zero bytes are looked at
+        for found in re.finditer(b"[^\x00]", self.bits):
+            byte = found.start()
+            for bit in range(8):
+                if self.bits[byte] & (1 << bit):
+                    slot1, slot2 = divmod(byte * 8 + bit, self.size)
+                    index = slot1 * size + slot2
+                    bits[index >> 3] |= 1 << (index & 7)
+        self.bits = bits
+        for name in ("byes", "whites", "blacks"):
+            getattr(self, name).extend(bytes(size - self.size))
+        self.size = size
+
+
+def _encode(data):
+    return base64.b64encode(zlib.compress(bytes(data))).decode("ascii")
+
+
+def _decode(text):
+    return bytearray(zlib.decompress(base64.b64decode(text)))
+
+
+def generate_pairings(players, history=None, max_backtrack=MAX_BACKTRACK):
+    """
+    Generate pairings for a round based on the current order of players (best first).
+
+    Players are paired in order (#1 with #2, #3 with #4...), skipping opponents they
+    already played: a player floats down to the next player (or score group) they did
+    not meet yet. When a player cannot be paired, previous pairings are undone
+    (at most max_backtrack times); if that is not enough, each player is paired with
+    the next player they did not meet, or with the next player if they met everyone
+    left, and the number of rematches is reported.
+    With an odd number of players, the lowest ranked player who did not have a bye
+    yet gets one (a match against nobody).
+    """
+    history = history or OpponentMatrix()
+    players = list(players)
+
+    bye = None
+    if len(players) % 2:
+        bye = next((p for p in reversed(players) if not history.had_bye(p)), players[-1])
+        players.remove(bye)
+
+    pairs = _pair_in_order(players, history, max_backtrack)
+    if pairs is None:
+        pairs = _pair_allowing_rematches(players, history)
+        rematches = sum(history.have_played(player1, player2) for player1, player2 in pairs)
+        print(f"Warning: no pairing without rematches was found, {rematches} rematch(es) in this round.")
+
+    matches = [Round(player1, player2) for player1, player2 in pairs]
+    if bye is not None:
+        matches.append(Round(bye, None))
     return matches
 
 
@@ -16,3 +165,53 @@ def random_pairings(players):
     """
     random.shuffle(players)
     return generate_pairings(players)
+
+
+def _pair_allowing_rematches(players, history):
+    """Pairs the players in order without backtracking: each one plays the next unpaired player they did not meet,
+    or the next unpaired player if they met all of them"""
+    ids = [player.chess_id for player in players]
+    unpaired = list(range(len(players)))
+    pairs = []
+    while unpaired:
+        first = unpaired.pop(0)
+        position = next((position for position, candidate in enumerate(unpaired)
+                         if not history.have_met(ids[first], ids[candidate])), 0)
+        pairs.append((players[first], players[unpaired.pop(position)]))
+    return pairs
+
+
+def _pair_in_order(players, history, max_backtrack):
+    """Pairs the players in order without rematches: returns a list of pairs, or None if it failed"""
+    count = len(players)
+    ids = [player.chess_id for player in players]
+    paired = [False] * count
+    # Pairs made so far, as (index, opponent index) tuples
+    stack = []
+    steps = 0
+    first, start = 0, None
+
+    while True:
+        # The first player still unpaired is the next one to pair
+        while first < count and paired[first]:
+            first += 1
+        if first == count:
+            return [(players[i], players[j]) for i, j in stack]
+
+        candidate = first + 1 if start is None else start
+        while candidate < count and (paired[candidate] or history.have_met(ids[first], ids[candidate])):
+            candidate += 1
+
+        if candidate < count:
+            paired[first] = paired[candidate] = True
+            stack.append((first, candidate))
+            first, start = first + 1, None
+            continue
+
+        # Dead end: undo the last pairing and try the next opponent for that player
+        if not stack or steps >= max_backtrack:
+            return None
+        steps += 1
+        first, previous = stack.pop()
+        paired[first] = paired[previous] = False
+        start = previous + 1
@@ -0,0 +1,42 @@
+import json
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+
+def read_json(filepath):
+    """Reads and decodes a JSON file"""
+    with open(filepath) as fp:
+        return json.load(fp)
+
+
+def load_parallel(filepaths, loader, workers=None, processes=False):
+    """
+    Calls loader(filepath) for each file using a pool of workers.
+
+    Threads are used by default (file reads release the GIL). With processes=True,
+    a process pool is used instead, so that CPU-bound work (JSON decoding, object
+    construction) runs in parallel too: the loader and its result must be picklable.
+    workers is the size of the pool (None = the executor's default).
+
+    Returns a list of (filepath, result, error) tuples in the order of filepaths,
+    where error is the exception raised by the loader (result is then None).
+    """
+    filepaths = list(filepaths)
+    if len(filepaths) <= 1 or workers == 1:
+        return [_call(loader, filepath) for filepath in filepaths]
+
+    executor_class = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    with executor_class(max_workers=workers) as executor:
+        futures = [executor.submit(loader, filepath) for filepath in filepaths]
+
+    results = []
+    for filepath, future in zip(filepaths, futures):
+        error = future.exception()
+        results.append((filepath, None if error else future.result(), error))
+    return results
+
+
+def _call(loader, filepath):
+    try:
+        return filepath, loader(filepath), None
+    except Exception as e:
+        return filepath, None, e
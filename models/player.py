@@ -1,11 +1,26 @@
+import re
+import sys
+from calendar import monthrange
 from datetime import datetime
 
+# Birthdays already in the DD-MM-YYYY format, checked without parsing them (see Player.birthday)
+BIRTHDAY_PATTERN = re.compile(r"(\d\d)-(\d\d)-(\d{4})", re.ASCII)
+
 
 class Player:
-    """The player class holds all information related to a player"""
+    """The player class holds all information related to a player
+
+    Instances are kept compact, as hundreds of thousands of them can be loaded:
+    no __dict__ (slots), interned chess IDs (they are shared with the tournaments
+    and used as dictionary keys), birthdate parsed from the birthday string on
+    first access, and a hash computed once from the chess ID. Birthdays are still
+    checked (and normalized) when they are set.
+    """
 
     DATE_FORMAT = "%d-%m-%Y"
 
+    __slots__ = ("name", "email", "_chess_id", "points", "_birthday", "_birthdate", "_hash")
+
     def __init__(self, name, email, chess_id, birthday):
         if not name:
             raise ValueError("Player name is required!")
@@ -15,9 +30,7 @@ class Player:
         self.chess_id = chess_id
         self.points = 0
 
-        # The class uses a private attribute for the birthdate (datetime format)
-        self._birthdate = None
-        # And a public one with a getter/setter for the birthday (str)
+        # The birthday (str) is checked, the birthdate (datetime) is only parsed when needed
         self.birthday = birthday
 
     def __str__(self):
@@ -28,8 +41,13 @@ class Player:
                 f"Points: {self.points}\n")
 
     def __hash__(self):
-        """Returns the hash of the object - useful to use the instance as a key in a dictionary or in a set"""
-        return hash((self.name, self.email, self.chess_id, self.birthdate))
+        """Returns the hash of the object - useful to use the instance as a key in a dictionary or in a set
+
+        Equal players have the same chess ID, so the hash only depends on it (and is cached).
+        """
+        if self._hash is None:
+            self._hash = hash(self._chess_id)
+        return self._hash
 
     def __eq__(self, other):
         """Required when __hash__ is defined"""
@@ -46,14 +64,46 @@ class Player:
     def add_points(self, points):
         self.points += points
 
+    @property
+    def chess_id(self):
+        return self._chess_id
+
+    @chess_id.setter
+    def chess_id(self, value):
+        self._chess_id = sys.intern(value) if value else value
+        self._hash = None
+
+    @property
+    def birthdate(self):
+        """Property to get the birthdate (datetime), parsed from the birthday (string) on first access"""
+        if self._birthdate is None:
+            self._birthdate = datetime.strptime(self._birthday, self.DATE_FORMAT)
+        return self._birthdate
+
+    @birthdate.setter
+    def birthdate(self, value):
+        self._birthdate = value
+        self._birthday = value.strftime(self.DATE_FORMAT)
+
     @property
     def birthday(self):
-        """Property to get the birthday (string) from the birthdate (datetime)"""
-        return self.birthdate.strftime(self.DATE_FORMAT)
+        """Property to get the birthday (string)"""
+        return self._birthday
 
     @birthday.setter
     def birthday(self, value):
-        """Sets the birthdate (datetime) from a string"""
+        """Sets the birthday (string): the birthdate (datetime) will be parsed from it when needed
+
+        A valid DD-MM-YYYY date is only checked; anything else is parsed straight away, so that
+        invalid dates raise ValueError and other accepted forms (e.g. 1-2-1990) are normalized.
+        """
+        match = BIRTHDAY_PATTERN.fullmatch(value) if isinstance(value, str) else None
+        if match:
+            day, month, year = map(int, match.groups())
+            if year >= 1000 and 1 <= month <= 12 and 1 <= day and (day <= 28 or day <= monthrange(year, month)[1]):
+                self._birthday = value
+                self._birthdate = None
+                return
         self.birthdate = datetime.strptime(value, self.DATE_FORMAT)
 
     def serialize(self):
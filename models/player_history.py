@@ -0,0 +1,153 @@
+from pathlib import Path
+
+from .change_log import ChangeLog
+from .rating import match_points, tournament_date
+from .tournament_archive import TournamentArchive
+from .tournament_log import read_tournament
+
+
+class PlayerHistory:
+    """
+    Games of every player across all the tournaments, and head-to-head scores.
+
+    games[chess_id] holds one (tournament name, round, opponent chess ID, points)
+    record per game played; head-to-head counters are kept per pair of players
+    (wins of the first one, draws, wins of the second one, the pair being sorted).
+    Byes and matches without a result are not recorded.
+
+    The history is updated incrementally: it remembers which matches of each
+    tournament were recorded, so only new results are added when a tournament
+    is applied again.
+
+    It is saved to a JSON snapshot (save), followed by a log of the games recorded
+    since (save_changes appends the new games of each tournament, see ChangeLog).
+    """
+
+    def __init__(self, games=None, pairs=None, applied=None):
+        self.games = games or {}
+        # [wins, draws, losses] of the pair "id1|id2" (id1 < id2), from the point of view of id1
+        self.pairs = pairs or {}
+        # By tournament name: number of rounds fully recorded, and recorded boards of the following rounds
+        self.applied = applied or {}
+        # Tournaments applied since the last save: tournament name, recorded state and new games
+        self.changes = []
+        self._log = None
+
+    def __contains__(self, chess_id):
+        return chess_id in self.games
+
+    @staticmethod
+    def pair_key(id1, id2):
+        return f"{id1}|{id2}" if id1 < id2 else f"{id2}|{id1}"
+
+    def add_game(self, tournament_name, round_number, id1, id2, points):
+        """Records a game, where player id1 scored points (1, 0.5 or 0) against id2"""
+        self.games.setdefault(id1, []).append((tournament_name, round_number, id2, points))
+        self.games.setdefault(id2, []).append((tournament_name, round_number, id1, 1 - points))
+        if id2 < id1:
+            points = 1 - points
+        counters = self.pairs.setdefault(self.pair_key(id1, id2), [0, 0, 0])
+        counters[0 if points == 1 else 1 if points == 0.5 else 2] += 1
+
+    def apply_tournament(self, info):
+        """Records the results of a tournament (as saved in its file) which were not recorded yet
+
+        Returns the number of games recorded.
+        """
+        name = info["name"]
+        state = self.applied.setdefault(name, {"rounds": 0, "boards": {}})
+        previous = dict(state, boards=dict(state["boards"]))
+        games = []
+        for number, matches in enumerate(info.get("rounds", [])[state["rounds"]:], start=state["rounds"] + 1):
+            recorded = set(state["boards"].get(str(number), ()))
+            for board, match_info in enumerate(matches):
+                if board in recorded:
+                    continue
+                points = match_points(match_info)
+                if points is not None:
+                    self.add_game(name, number, *match_info["players"], points)
+                    games.append([number, *match_info["players"], points])
+                    recorded.add(board)
+
+            pending = any(match_info["players"][1] is not None and not match_info.get("completed")
+                          for match_info in matches)
+            if not pending and number == state["rounds"] + 1:
+                state["rounds"] = number
+                state["boards"].pop(str(number), None)
+            elif recorded:
+                state["boards"][str(number)] = sorted(recorded)
+        if games or state != previous:
+            self.changes.append({"tournament": name, "state": dict(state, boards=dict(state["boards"])),
+                                 "games": games})
+        return len(games)
+
+    def apply_tournaments(self, infos):
+        """Records several tournaments, in chronological order"""
+        for info in sorted(infos, key=tournament_date):
+            self.apply_tournament(info)
+
+    # Queries
+
+    def player_games(self, chess_id):
+        """Returns the (tournament name, round, opponent chess ID, points) records of a player's games"""
+        return self.games.get(chess_id, [])
+
+    def head_to_head(self, id1, id2):
+        """Returns the (wins of id1, draws, wins of id2) counts of the games between two players"""
+        wins, draws, losses = self.pairs.get(self.pair_key(id1, id2), (0, 0, 0))
+        return (wins, draws, losses) if id1 < id2 else (losses, draws, wins)
+
+    def meetings(self, player1, player2):
+        """Number of games played by two players (Player instances) against each other, in any tournament"""
+        return sum(self.pairs.get(self.pair_key(player1.chess_id, player2.chess_id), ()))
+
+    def have_played(self, player1, player2):
+        """Whether two players (Player instances) already played each other in any tournament"""
+        return self.pair_key(player1.chess_id, player2.chess_id) in self.pairs
+
+    def score(self, chess_id):
+        """Returns the (games, points) totals of a player"""
+        games = self.player_games(chess_id)
+        return len(games), sum(points for _, _, _, points in games)
+
+    # Snapshot
+
+    def save(self, filepath):
+        """Writes a snapshot of the whole history (and clears the log of the changes)"""
+        if self._log is None or self._log.filepath != Path(filepath):
+            self._log = ChangeLog(filepath)
+        self._log.write_snapshot({"games": self.games, "pairs": self.pairs, "applied": self.applied})
+        self.changes = []
+
+    def save_changes(self, filepath):
+        """Appends the games recorded since the last save to the log of the snapshot
+        (a snapshot is written instead if there is none yet, or if the log is full)"""
+        if self._log is None or self._log.filepath != Path(filepath) or not self._log.append(self.changes):
+            return self.save(filepath)
+        self.changes = []
+
+    @classmethod
+    def load(cls, filepath):
+        """Loads a snapshot and the changes logged since, or returns None if there is no snapshot"""
+        log = ChangeLog(filepath)
+        data, changes = log.read()
+        if data is None:
+            return None
+        games = {chess_id: [tuple(game) for game in games] for chess_id, games in data["games"].items()}
+        history = cls(games, data["pairs"], data["applied"])
+        for change in changes:
+            for number, id1, id2, points in change["games"]:
+                history.add_game(change["tournament"], number, id1, id2, points)
+            history.applied[change["tournament"]] = change["state"]
+        history._log = log
+        return history
+
+    @classmethod
+    def from_archive(cls, tournaments_folder="data/tournaments"):
+        """Builds the history from every tournament file (*_info.json) of the folder and its archive"""
+        infos = [read_tournament(filepath) for filepath in Path(tournaments_folder).glob("*_info.json")]
+        archive = TournamentArchive(Path(tournaments_folder) / "archive")
+        infos.extend(archive.get(name) for name, _ in archive.query())
+        history = cls()
+        history.apply_tournaments(infos)
+        return history
@@ -0,0 +1,144 @@
+from .player_search import PlayerSearchIndex
+
+
+class PlayerRegistry:
+    """
+    Registry of all the players known to the application.
+
+    Players are indexed by chess ID, with secondary indexes on email and club,
+    so that looking a player up does not require scanning the whole list.
+    A search index over names and chess IDs is kept up to date as well.
+    """
+
+    def __init__(self):
+        # All registered players, in registration order
+        self.players = []
+        self._by_chess_id = {}
+        self._by_email = {}
+        self._by_club = {}
+        self._club_of = {}
+        self._keys = {}
+        self.search_index = PlayerSearchIndex()
+
+    def __len__(self):
+        return len(self.players)
+
+    def __iter__(self):
+        return iter(self.players)
+
+    def __contains__(self, chess_id):
+        return chess_id in self._by_chess_id
+
+    def add(self, player, club=None):
+        """Registers a player, optionally as a member of the given club (name)"""
+        self._register(player, club)
+        self.search_index.add(player)
+        return player
+
+    def add_club(self, club_name, players):
+        """Registers all the players of a club (indexed for search in bulk)"""
+        players = list(players)
+        for player in players:
+            self._register(player, club_name)
+        self.search_index.add_many(players)
+
+    def replace_club(self, club_name, players):
+        """Replaces the players registered for a club (e.g. after the club file changed)"""
+        self.remove_many(self.get_club_players(club_name))
+        self.add_club(club_name, players)
+
+    def remove(self, player):
+        """Removes a player from the registry and all its indexes"""
+        self._unregister_keys(player)
+        _remove_identical(self.players, player)
+        club = self._club_of.pop(id(player), None)
+        if club is not None:
+            _remove_identical(self._by_club[club], player)
+        self.search_index.remove(player)
+
+    def remove_many(self, players):
+        """Removes players from the registry and all its indexes, with a single pass over each list"""
+        removed = {id(player) for player in players}
+        if not removed:
+            return
+        clubs = set()
+        for player in players:
+            self._unregister_keys(player)
+            club = self._club_of.pop(id(player), None)
+            if club is not None:
+                clubs.add(club)
+        self.players[:] = [player for player in self.players if id(player) not in removed]
+        for club in clubs:
+            self._by_club[club] = [player for player in self._by_club[club] if id(player) not in removed]
+        self.search_index.remove_many(players)
+
+    def update(self, player):
+        """Refreshes the indexes of a player whose attributes were changed (its position in the lists is kept)"""
+        self._unregister_keys(player)
+        self._register_keys(player)
+        self.search_index.update(player)
+
+    def club_changed(self, club, player=None):
+        """Listener of the changes of a ChessClub (see ChessClub.listeners): registers or re-indexes the changed
+        player, or all the players of the club if player is None"""
+        if player is None:
+            self.replace_club(club.name, club.players)
+        elif id(player) in self._keys:
+            self.update(player)
+        else:
+            self.add(player, club=club.name)
+
+    def get(self, chess_id, default=None):
+        """Returns the player with the given chess ID"""
+        return self._by_chess_id.get(chess_id, default)
+
+    def get_by_email(self, email, default=None):
+        """Returns the player with the given email address (case insensitive)"""
+        return self._by_email.get(email.lower(), default)
+
+    def get_club_players(self, club):
+        """Returns the list of players registered for the given club name"""
+        return list(self._by_club.get(club, []))
+
+    def get_club(self, player):
+        """Returns the name of the club the player was registered with (or None)"""
+        return self._club_of.get(id(player))
+
+    def search(self, term, limit=None):
+        """Returns the players whose name or chess ID matches the term, best matches first"""
+        return self.search_index.search(term, limit=limit)
+
+    def _register(self, player, club):
+        self.players.append(player)
+        if club is not None:
+            self._by_club.setdefault(club, []).append(player)
+            self._club_of[id(player)] = club
+        self._register_keys(player)
+
+    def _register_keys(self, player):
+        # The first player registered with a given chess ID / email wins
+        self._by_chess_id.setdefault(player.chess_id, player)
+        if player.email:
+            self._by_email.setdefault(player.email.lower(), player)
+        # Keep the indexed keys, they are needed to unregister the player once it changed
+        self._keys[id(player)] = (player.chess_id, player.email.lower() if player.email else None)
+
+    def _unregister_keys(self, player):
+        chess_id, email = self._keys.pop(id(player))
+        if self._by_chess_id.get(chess_id) is player:
+            del self._by_chess_id[chess_id]
+        if email and self._by_email.get(email) is player:
+            del self._by_email[email]
+
+    @property
+    def clubs(self):
+        """Names of the clubs known to the registry"""
+        return list(self._by_club)
+
+
+def _remove_identical(players, player):
+    """Removes the given instance from a list (Player equality compares attribute values)"""
+    for idx, other in enumerate(players):
+        if other is player:
+            del players[idx]
+            return
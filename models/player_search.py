@@ -0,0 +1,182 @@
+import unicodedata
+from bisect import bisect_left, insort
+from itertools import islice
+
+NGRAM_SIZE = 3
+
+
+def normalize(text):
+    """Normalizes a string for searching: case-insensitive and without accents"""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def ngrams(text, size=NGRAM_SIZE):
+    """Returns the set of n-grams of a (normalized) string"""
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+class PlayerSearchIndex:
+    """
+    Precomputed search index over player names and chess IDs.
+
+    Results are ranked: exact chess ID, then chess ID prefix, name prefix, prefix
+    of another word of the name and, for terms of NGRAM_SIZE characters or more,
+    any other substring of the name or chess ID.
+
+    The prefix matches are ranges of sorted key lists (chess IDs, names, and the
+    other words of the names), found by bisection and read in order, so a limited
+    search stops once it has enough results. Substrings are looked up through an
+    n-gram index; past the limit, which substring matches are returned is unspecified.
+
+    Players can be added, removed or re-indexed one at a time (the key lists are
+    kept sorted by insertion), or in bulk with add_many (sorted once) and remove_many
+    (filtered once).
+    """
+
+    def __init__(self, players=()):
+        self._players = []
+        self._keys = []
+        self._slots = {}
+        self._free = []
+        self._ngrams = {}
+        # Sorted (chess ID, slot), (name, slot) and (word, name, slot) lists
+        self._by_id = []
+        self._by_name = []
+        self._by_word = []
+        self.add_many(players)
+
+    def __len__(self):
+        return len(self._slots)
+
+    def add(self, player):
+        """Adds a player to the index (or re-indexes it if it is already there)"""
+        if id(player) in self._slots:
+            return self.update(player)
+        for key_list, key in self._index(player):
+            insort(key_list, key)
+
+    def add_many(self, players):
+        """Adds players in bulk: the key lists are sorted once"""
+        added = False
+        for player in players:
+            if id(player) in self._slots:
+                self.update(player)
+                continue
+            for key_list, key in self._index(player):
+                key_list.append(key)
+            added = True
+        if added:
+            for key_list in (self._by_id, self._by_name, self._by_word):
+                key_list.sort()
+
+    def remove(self, player):
+        """Removes a player from the index"""
+        slot = self._slots.pop(id(player), None)
+        if slot is None:
+            return
+
+        name, chess_id = self._keys[slot]
+        for gram in ngrams(name) | ngrams(chess_id):
+            self._discard(self._ngrams, gram, slot)
+        for key_list, key in self._sorted_keys(slot, name, chess_id):
+            index = bisect_left(key_list, key)
+            if index < len(key_list) and key_list[index] == key:
+                del key_list[index]
+
+        self._players[slot] = None
+        self._keys[slot] = None
+        self._free.append(slot)
+
+    def remove_many(self, players):
+        """Removes players from the index in bulk: the key lists are filtered once"""
+        removed = set()
+        for player in players:
+            slot = self._slots.pop(id(player), None)
+            if slot is None:
+                continue
+            name, chess_id = self._keys[slot]
+            for gram in ngrams(name) | ngrams(chess_id):
+                self._discard(self._ngrams, gram, slot)
+            self._players[slot] = None
+            self._keys[slot] = None
+            self._free.append(slot)
+            removed.add(slot)
+        if removed:
+            for key_list in (self._by_id, self._by_name, self._by_word):
+                key_list[:] = [key for key in key_list if key[-1] not in removed]
+
+    def update(self, player):
+        """Re-indexes a player after its name or chess ID changed"""
+        self.remove(player)
+        self.add(player)
+
+    def search(self, term, limit=None):
+        """Returns the players matching the term, best matches first"""
+        term = normalize(term).strip()
+        if not term:
+            return []
+
+        seen = set()
+        slots = []
+        for slot in self._prefix_matches(term):
+            if slot not in seen:
+                seen.add(slot)
+                slots.append(slot)
+                if limit is not None and len(slots) >= limit:
+                    return [self._players[slot] for slot in slots]
+
+        if len(term) >= NGRAM_SIZE:
+            remaining = None if limit is None else limit - len(slots)
+            matches = islice(self._substring_matches(term, seen), remaining)
+            slots.extend(sorted(matches, key=lambda slot: self._keys[slot][0]))
+        return [self._players[slot] for slot in slots]
+
+    def _index(self, player):
+        """Gives a slot to a new player, indexes its n-grams and returns its (key list, key) pairs"""
+        slot = self._free.pop() if self._free else len(self._players)
+        if slot == len(self._players):
+            self._players.append(None)
+            self._keys.append(None)
+
+        name, chess_id = normalize(player.name), normalize(player.chess_id)
+        self._players[slot] = player
+        self._keys[slot] = (name, chess_id)
+        self._slots[id(player)] = slot
+
+        for gram in ngrams(name) | ngrams(chess_id):
+            self._ngrams.setdefault(gram, set()).add(slot)
+        return self._sorted_keys(slot, name, chess_id)
+
+    def _sorted_keys(self, slot, name, chess_id):
+        keys = [(self._by_id, (chess_id, slot)), (self._by_name, (name, slot))]
+        # The first word is covered by the name prefixes
+        keys.extend((self._by_word, (word, name, slot)) for word in set(name.split()[1:]))
+        return keys
+
+    def _prefix_matches(self, term):
+        """Yields the slots of the chess ID (exact first), name and word prefix matches, in rank order"""
+        for key_list in (self._by_id, self._by_name, self._by_word):
+            for index in range(bisect_left(key_list, (term,)), len(key_list)):
+                key = key_list[index]
+                if not key[0].startswith(term):
+                    break
+                yield key[-1]
+
+    def _substring_matches(self, term, seen):
+        """Yields the slots of the other players whose name or chess ID contains the term"""
+        postings = sorted((self._ngrams.get(gram, set()) for gram in ngrams(term)), key=len)
+        for slot in postings[0]:
+            if slot in seen or not all(slot in others for others in postings[1:]):
+                continue
+            name, chess_id = self._keys[slot]
+            if term in name or term in chess_id:
+                yield slot
+
+    @staticmethod
+    def _discard(index, key, slot):
+        slots = index.get(key)
+        if slots is not None:
+            slots.discard(slot)
+            if not slots:
+                del index[key]
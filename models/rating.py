@@ -0,0 +1,160 @@
+from datetime import datetime
+from pathlib import Path
+
+from .change_log import ChangeLog
+from .tournament_archive import TournamentArchive
+from .tournament_log import read_tournament
+
+# Rating of a player without any rated game
+DEFAULT_RATING = 1500
+# Maximum rating change for a single game
+K_FACTOR = 20
+# Date formats found in the tournament files
+DATE_FORMATS = ("%Y-%m-%d", "%d-%m-%Y")
+
+
+def match_points(match_info):
+    """Points of player1 for a match as saved in a tournament file (None if not played, or a bye)"""
+    player1, player2 = match_info["players"]
+    if player2 is None or not match_info.get("completed"):
+        return None
+
+    winner = match_info.get("winner")
+    # Older files store the chess ID of the winner
+    if winner in ("player1", player1):
+        return 1.0
+    if winner in ("player2", player2):
+        return 0.0
+    return 0.5
+
+
+def tournament_date(info):
+    """Start date of a tournament (as saved in its file), used to replay tournaments in order"""
+    value = info.get("dates", {}).get("from") or ""
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format)
+        except ValueError:
+            pass
+    return datetime.min
+
+
+class RatingBook:
+    """
+    Elo ratings by chess ID.
+
+    Ratings are computed by replaying the rounds of the tournaments in order.
+    The results of a round are applied in one batch: every rating change of the
+    round is computed from the ratings before the round. The book remembers how
+    many rounds of each tournament were applied, so that adding a round only
+    applies that round.
+
+    It is saved to a JSON snapshot (save), followed by a log of the rounds applied
+    since (save_changes appends the new ratings of the players of each round, see ChangeLog).
+    """
+
+    def __init__(self, ratings=None, games=None, applied=None, k_factor=K_FACTOR):
+        self.ratings = ratings or {}
+        # Number of rated games by chess ID
+        self.games = games or {}
+        # Number of rounds applied by tournament name
+        self.applied = applied or {}
+        self.k_factor = k_factor
+        # Rounds applied since the last save: tournament name, rounds applied, new ratings and game counts
+        self.changes = []
+        self._log = None
+
+    def rating(self, chess_id):
+        return self.ratings.get(chess_id, DEFAULT_RATING)
+
+    def expected_score(self, chess_id, opponent_id):
+        return 1 / (1 + 10 ** ((self.rating(opponent_id) - self.rating(chess_id)) / 400))
+
+    def apply_round(self, matches):
+        """Applies the results of a round (list of match dictionaries, as saved in the tournament files)"""
+        changes = {}
+        for match_info in matches:
+            points = match_points(match_info)
+            if points is None:
+                continue
+            player1, player2 = match_info["players"]
+            change = self.k_factor * (points - self.expected_score(player1, player2))
+            changes[player1] = changes.get(player1, 0) + change
+            changes[player2] = changes.get(player2, 0) - change
+
+        for chess_id, change in changes.items():
+            self.ratings[chess_id] = self.rating(chess_id) + change
+            self.games[chess_id] = self.games.get(chess_id, 0) + 1
+        return changes
+
+    def apply_tournament(self, info):
+        """Applies the rounds of a tournament (as saved in its file) which were not applied yet
+
+        Only complete rounds (every match played) are applied. Returns the number of rounds applied.
+        """
+        name = info["name"]
+        rounds = info.get("rounds", [])
+        start = self.applied.get(name, 0)
+        count = 0
+        for matches in rounds[start:]:
+            if not all(match_info.get("completed") or match_info["players"][1] is None for match_info in matches):
+                break
+            changed = self.apply_round(matches)
+            count += 1
+            self.changes.append({
+                "tournament": name,
+                "rounds": start + count,
+                "ratings": {chess_id: self.ratings[chess_id] for chess_id in changed},
+                "games": {chess_id: self.games[chess_id] for chess_id in changed},
+            })
+        self.applied[name] = start + count
+        return count
+
+    def apply_tournaments(self, infos):
+        """Applies several tournaments in chronological order"""
+        for info in sorted(infos, key=tournament_date):
+            self.apply_tournament(info)
+
+    def ranking(self):
+        """Returns the (chess_id, rating) tuples, best first"""
+        return sorted(self.ratings.items(), key=lambda item: item[1], reverse=True)
+
+    def save(self, filepath):
+        """Writes a snapshot of the whole book (and clears the log of the changes)"""
+        if self._log is None or self._log.filepath != Path(filepath):
+            self._log = ChangeLog(filepath)
+        self._log.write_snapshot({"ratings": self.ratings, "games": self.games, "applied": self.applied})
+        self.changes = []
+
+    def save_changes(self, filepath):
+        """Appends the rounds applied since the last save to the log of the snapshot
+        (a snapshot is written instead if there is none yet, or if the log is full)"""
+        if self._log is None or self._log.filepath != Path(filepath) or not self._log.append(self.changes):
+            return self.save(filepath)
+        self.changes = []
+
+    @classmethod
+    def load(cls, filepath, k_factor=K_FACTOR):
+        """Loads a snapshot and the changes logged since, or returns None if there is no snapshot"""
+        log = ChangeLog(filepath)
+        data, changes = log.read()
+        if data is None:
+            return None
+        book = cls(data["ratings"], data["games"], data["applied"], k_factor=k_factor)
+        for change in changes:
+            book.ratings.update(change["ratings"])
+            book.games.update(change["games"])
+            book.applied[change["tournament"]] = change["rounds"]
+        book._log = log
+        return book
+
+    @classmethod
+    def from_archive(cls, tournaments_folder="data/tournaments", k_factor=K_FACTOR):
+        """Computes the ratings by replaying every tournament file (*_info.json, and its event log) of the folder,
+        and the completed tournaments of its archive"""
+        infos = [read_tournament(filepath) for filepath in Path(tournaments_folder).glob("*_info.json")]
+        archive = TournamentArchive(Path(tournaments_folder) / "archive")
+        infos.extend(archive.get(name) for name, _ in archive.query(status="completed"))
+        book = cls(k_factor=k_factor)
+        book.apply_tournaments(infos)
+        return book
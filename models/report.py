@@ -0,0 +1,98 @@
+from html import escape
+
+# HTML fragments of the tournament report: printf-style templates, filled with escaped values.
+# The header, written once, uses named fields; the fragments repeated for every player and match
+# use positional fields, cheaper than named ones.
+HEADER = (
+    "<html>\n<head>\n<title>Tournament Report - %(name)s</title>\n</head>\n<body>\n"
+    "<h1>Tournament Report: %(name)s</h1>\n"
+    "<p>Dates: %(start_date)s to %(end_date)s</p>\n"
+    "<p>Venue: %(venue)s</p>\n"
+    "<p>Current Round: %(current_round)s/%(max_round)s</p>\n"
+)
+PLAYERS_START = "<h2>Players (sorted by points)</h2>\n<ul>\n"
+# Name, points, Buchholz, Sonneborn-Berger, progressive score
+PLAYER = "<li>%s (Points: %s, Buchholz: %s, Sonneborn-Berger: %s, Progressive: %s)</li>\n"
+PLAYERS_END = "</ul>\n"
+ROUNDS_START = "<h2>Rounds and Matches</h2>\n"
+# Round number
+ROUND_START = "<h3>Round %s</h3>\n<ul>\n"
+# Player 1, player 2, result
+MATCH = "<li>Match: %s vs %s, %s</li>\n"
+# Player with the bye
+BYE = "<li>Match: %s has a bye</li>\n"
+ROUND_END = "</ul>\n"
+FOOTER = "</body>\n</html>"
+
+
+def escaped_names(players):
+    """HTML-escaped names of the players by id(player), so that each name is escaped once per report"""
+    return {id(player): escape(player.name) for player in players}
+
+
+class EscapedResults(dict):
+    """HTML-escaped match results by result (there are only a few different ones)"""
+
+    def __missing__(self, result):
+        text = self[result] = escape(f"Result: {result}")
+        return text
+
+
+RESULTS = EscapedResults()
+
+
+def render_header(tournament):
+    return HEADER % {
+        "name": escape(tournament.name),
+        "start_date": escape(str(tournament.start_date)),
+        "end_date": escape(str(tournament.end_date)),
+        "venue": escape(str(tournament.venue)),
+        "current_round": tournament.current_round,
+        "max_round": tournament.max_round,
+    }
+
+
+def render_players(standings, names=None):
+    """Returns the players section, best player first"""
+    ranking = standings.top()
+    names = escaped_names(player for player, _ in ranking) if names is None else names
+    values = standings.tiebreaks.values
+    fragments = [PLAYERS_START]
+    for player, points in ranking:
+        fragments.append(PLAYER % (names[id(player)], points, *values(player)))
+    fragments.append(PLAYERS_END)
+    return "".join(fragments)
+
+
+def render_round(number, matches, names=None):
+    """Returns the section of a round (names: see escaped_names, missing names are escaped on the fly)"""
+    name = (names or {}).get
+    fragments = [ROUND_START % number]
+    for match in matches:
+        player1, player2 = match.player1, match.player2
+        name1 = name(id(player1)) or escape(player1.name)
+        if player2 is None:
+            fragments.append(BYE % name1)
+            continue
+        result = RESULTS[match.result] if match.played else "Not played yet"
+        fragments.append(MATCH % (name1, name(id(player2)) or escape(player2.name), result))
+    fragments.append(ROUND_END)
+    return "".join(fragments)
+
+
+def render_report(tournament):
+    """Yields the HTML report of a tournament, section by section"""
+    names = escaped_names(tournament.players)
+    yield render_header(tournament)
+    yield render_players(tournament.standings, names)
+    yield ROUNDS_START
+    for number, matches in enumerate(tournament.rounds, start=1):
+        yield render_round(number, matches, names)
+    yield FOOTER
+
+
+def write_report(tournament, filepath):
+    """Writes the HTML report of a tournament to a file, one section at a time as it is rendered"""
+    with open(filepath, "w", encoding="utf-8") as fp:
+        for section in render_report(tournament):
+            fp.write(section)
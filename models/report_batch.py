@@ -0,0 +1,176 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from .club import file_fingerprint
+from .match import Match
+from .pairing import OpponentMatrix
+from .parallel import load_parallel
+from .player import Player
+from .report import FOOTER, ROUNDS_START, escaped_names, render_header, render_players, render_round
+from .tournament import Tournament
+
+# Folder of the tournament reports
+REPORTS_FOLDER = "data/tournaments/tournament_reports"
+# State of the last batch rendering (hashes and sections of each report), in the reports folder
+STATE_NAME = ".render_state.json"
+
+
+def content_hash(value):
+    """SHA-256 of a JSON-serializable value"""
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode()).hexdigest()
+
+
+def build_tournament(info, players_by_id):
+    """Builds a Tournament from its information (as saved in its file)
+
+    With the snapshot of the standings and opponents (see read_tournament), they are restored from
+    it; otherwise the matches are replayed. Unknown players, and their matches, are left out
+    (like ManageTournament.load_tournaments does for the players).
+    """
+    players = [players_by_id[chess_id] for chess_id in info["players"] if chess_id in players_by_id]
+    tournament = Tournament(info["name"], info["venue"], info["dates"]["from"], info["dates"]["to"],
+                            players, info["number_of_rounds"])
+    tournament.current_round = info.get("current_round", 0)
+    snapshot = info.get("standings")
+    opponents = info.get("opponents")
+    for round_matches in info.get("rounds", []):
+        matches = []
+        for match_info in round_matches:
+            player1_id, player2_id = match_info["players"]
+            if player1_id not in players_by_id or (player2_id is not None and player2_id not in players_by_id):
+                continue
+            match = Match(players_by_id[player1_id], players_by_id.get(player2_id), standings=tournament.standings)
+            if not match_info.get("completed", True):
+                pass
+            elif snapshot is not None:
+                match.played = True
+                match.result = match_info.get("winner")
+            else:
+                match.play_match(match_info.get("winner"))
+            matches.append(match)
+        if opponents is None:
+            tournament.add_round(matches)
+        else:
+            tournament.rounds.append(matches)
+    if opponents is not None:
+        tournament.opponents = OpponentMatrix.deserialize(opponents)
+    if snapshot is not None:
+        tournament.standings.restore(snapshot)
+    return tournament
+
+
+def round_hash(matches):
+    """Hash of what the section of a round shows"""
+    return content_hash([
+        [match.player1.name, match.player2.name if match.player2 else None, match.played, match.result]
+        for match in matches
+    ])
+
+
+def render_job(job):
+    """Writes the report of a tournament, reusing the round sections of the previous report which did not change
+
+    job is a (tournament information, player records, report path, previous state of the report or None) tuple.
+    Returns the new state of the report: the hash and the position in the file of each round section,
+    and the number of round sections rendered.
+    """
+    info, records, filepath, previous = job
+    players_by_id = {record["chess_id"]: Player(**record) for record in records}
+    tournament = build_tournament(info, players_by_id)
+    names = escaped_names(tournament.players)
+
+    old_rounds = []
+    old_content = ""
+    if previous is not None:
+        old_rounds = previous["rounds"]
+        with open(filepath, encoding="utf-8") as fp:
+            old_content = fp.read()
+
+    rounds = []
+    rendered = 0
+    temporary = Path(filepath).with_suffix(".tmp")
+    with open(temporary, "w", encoding="utf-8") as fp:
+        position = 0
+        for section in (render_header(tournament), render_players(tournament.standings, names), ROUNDS_START):
+            fp.write(section)
+            position += len(section)
+
+        for number, matches in enumerate(tournament.rounds, start=1):
+            key = round_hash(matches)
+            old = old_rounds[number - 1] if number <= len(old_rounds) else None
+            if old is not None and old["hash"] == key:
+                section = old_content[old["start"]:old["end"]]
+            else:
+                section = render_round(number, matches, names)
+                rendered += 1
+            fp.write(section)
+            rounds.append({"hash": key, "start": position, "end": position + len(section)})
+            position += len(section)
+
+        fp.write(FOOTER)
+    os.replace(temporary, filepath)
+    return {"rounds": rounds, "rendered": rendered}
+
+
+def generate_reports(infos, registry, folder=REPORTS_FOLDER, workers=None, force=False):
+    """
+    Writes the reports of several tournaments (information as saved in their files) with a process pool.
+
+    Players are looked up in the registry (see PlayerRegistry): the unknown ones are reported, and
+    left out of the report with their matches (see build_tournament). A tournament is skipped
+    when the hash of its information and players did not change since its report was
+    last written by this function (and the report file was not modified since). Otherwise,
+    only the round sections which changed are rendered again. force renders every report.
+
+    Returns a list of (tournament name, status, details) tuples, where status is
+    "skipped", "rendered" or "failed" (details: the number of round sections rendered, or the error).
+    """
+    folder = Path(folder)
+    folder.mkdir(parents=True, exist_ok=True)
+    state_path = folder / STATE_NAME
+    try:
+        with open(state_path) as fp:
+            state = json.load(fp)
+    except (FileNotFoundError, json.JSONDecodeError):
+        state = {}
+
+    results = []
+    jobs = []
+    hashes = {}
+    for info in infos:
+        name = info["name"]
+        players = [registry.get(chess_id) for chess_id in info["players"]]
+        records = [player.serialize() for player in players if player is not None]
+        unknown = [chess_id for chess_id, player in zip(info["players"], players) if player is None]
+        if unknown:
+            print(f"{name}: unknown player(s) {', '.join(unknown)} left out of the report")
+        filepath = str(folder / f"{name}_report.html")
+        hashes[name] = content_hash([info, records])
+
+        previous = state.get(name)
+        if previous is not None and list(file_fingerprint(filepath) or ()) != previous["fingerprint"]:
+            # The report was written by someone else since: its sections cannot be reused
+            previous = None
+        if previous is not None and previous["hash"] == hashes[name] and not force:
+            results.append((name, "skipped", 0))
+            continue
+        jobs.append((info, records, filepath, None if force else previous))
+
+    for job, result, error in load_parallel(jobs, render_job, workers, processes=True):
+        name, filepath = job[0]["name"], job[2]
+        if error:
+            state.pop(name, None)
+            results.append((name, "failed", error))
+            continue
+        state[name] = {
+            "hash": hashes[name],
+            "fingerprint": list(file_fingerprint(filepath)),
+            "rounds": result["rounds"],
+        }
+        results.append((name, "rendered", result["rendered"]))
+
+    with open(state_path, "w") as fp:
+        json.dump(state, fp)
+    return results
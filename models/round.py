@@ -1,21 +1,36 @@
 class Round:
-    def __init__(self, player1, player2):
+    def __init__(self, player1, player2, standings=None):
+        # player2 is None when player1 has a bye (no opponent for this round)
         self.player1 = player1
         self.player2 = player2
         self.played = False
         self.result = None
+        # Standings of the tournament, updated when the result is recorded
+        self.standings = standings
+
+    def is_bye(self):
+        return self.player2 is None
 
     def play_match(self, result):
-        if result == "draw":
-            self.player1.add_points(0.5)
-            self.player2.add_points(0.5)
+        if result == "bye":
+            self.award(1, 0)
+        elif result == "draw":
+            self.award(0.5, 0.5)
         elif result == "player1":
-            self.player1.add_points(1)
+            self.award(1, 0)
         elif result == "player2":
-            self.player2.add_points(1)
+            self.award(0, 1)
 
         self.played = True
         self.result = result
 
+    def award(self, points1, points2):
+        """Gives the points of the match to the players (and records them in the standings)"""
+        self.player1.add_points(points1)
+        if self.player2 is not None:
+            self.player2.add_points(points2)
+        if self.standings is not None:
+            self.standings.record_match(self, points1, points2)
+
     def was_played(self):
         return self.played
@@ -0,0 +1,166 @@
+import numpy as np
+
+from .rating import DEFAULT_RATING
+
+# Number of passes made over the boards to swap opponents away from rematches
+REMATCH_PASSES = 2
+
+
+class SimulationResult:
+    """Final rank distributions of the players of a simulated tournament"""
+
+    def __init__(self, players, rank_counts):
+        self.players = players
+        # rank_counts[i, r] = number of simulations where players[i] finished at rank r + 1
+        self.rank_counts = rank_counts
+        self.simulations = int(rank_counts[0].sum()) if len(players) else 0
+        self._rows = {player.chess_id: row for row, player in enumerate(players)}
+
+    def rank_distribution(self, player):
+        """Probability of each final rank (index 0 = 1st) for a player"""
+        return self.rank_counts[self._rows[player.chess_id]] / self.simulations
+
+    def top_probability(self, player, k=1):
+        """Probability that the player finishes in the k first places (k=1: wins the tournament)"""
+        return float(self.rank_distribution(player)[:k].sum())
+
+    def expected_rank(self, player):
+        return float(self.rank_distribution(player) @ np.arange(1, len(self.players) + 1))
+
+    def title_odds(self):
+        """Returns the (player, probability of winning) tuples, best odds first"""
+        odds = self.rank_counts[:, 0] / self.simulations
+        return [(self.players[row], float(odds[row])) for row in np.argsort(-odds, kind="stable")]
+
+
+def simulate_tournament(tournament, simulations=10_000, ratings=None, draw_rate=0.3, seed=None):
+    """
+    Simulates the rest of a tournament many times and returns the final rank distributions.
+
+    The unplayed matches of the current round and the remaining rounds (up to max_round)
+    are played in every simulation at once, with NumPy arrays of shape (simulations, players).
+    Results are drawn from the Elo expected score of each side (ratings: {chess_id: rating},
+    e.g. RatingBook.ratings, DEFAULT_RATING otherwise) with a draw probability of draw_rate (capped so that both sides
+    keep a chance to win).
+
+    Rounds are paired like Tournament.play_round: players sorted by points (random order
+    among equal points), paired in order, with a bye for the lowest ranked player without one.
+    Rematches are avoided by swapping opponents with the next board (REMATCH_PASSES passes)
+    rather than by the full backtracking of generate_pairings. Final ties are broken randomly.
+
+    Raises ValueError if a match has a player who is not in tournament.players.
+    """
+    rng = np.random.default_rng(seed)
+    players = list(tournament.players)
+    count = len(players)
+    rows = {player.chess_id: row for row, player in enumerate(players)}
+    unknown = sorted({
+        player.chess_id for matches in tournament.rounds for match in matches
+        for player in (match.player1, match.player2) if player is not None and player.chess_id not in rows
+    })
+    if unknown:
+        raise ValueError(f"Players not in the tournament have matches: {', '.join(unknown)}")
+    ratings = ratings or {}
+    rating = np.array([ratings.get(player.chess_id, DEFAULT_RATING) for player in players], dtype=np.float64)
+
+    # Current state of the tournament, identical in every simulation
+    scores = np.tile(
+        np.array([tournament.standings.points(player) for player in players], dtype=np.float64), (simulations, 1)
+    )
+    played = np.zeros((count, count), dtype=bool)
+    had_bye = np.zeros(count, dtype=bool)
+    pending = []
+    for matches in tournament.rounds:
+        for match in matches:
+            row1 = rows[match.player1.chess_id]
+            if match.player2 is None:
+                had_bye[row1] = True
+                continue
+            row2 = rows[match.player2.chess_id]
+            played[row1, row2] = played[row2, row1] = True
+            if not match.played:
+                pending.append((row1, row2))
+    had_bye = np.tile(had_bye, (simulations, 1))
+
+    if pending:
+        first, second = np.array(pending).T
+        _play(rng, scores, np.broadcast_to(first, (simulations, len(first))),
+              np.broadcast_to(second, (simulations, len(second))), rating, draw_rate)
+
+    remaining = max(tournament.max_round - tournament.current_round, 0)
+    # Opponents met during the simulated rounds (-1 = none)
+    opponents = np.full((simulations, count, remaining), -1, dtype=np.int32)
+    sims = np.arange(simulations)
+
+    for round_index in range(remaining):
+        # Sort by points, with a random order among equal points (points are multiples of 0.5)
+        order = np.argsort(-(scores + rng.random(scores.shape) * 0.25), axis=1)
+
+        if count % 2:
+            # Lowest ranked player who did not have a bye yet (or the last one if all had one)
+            no_bye = ~np.take_along_axis(had_bye, order, axis=1)
+            position = count - 1 - np.argmax(no_bye[:, ::-1], axis=1)
+            bye = order[sims, position]
+            scores[sims, bye] += 1
+            had_bye[sims, bye] = True
+            keep = np.ones(order.shape, dtype=bool)
+            keep[sims, position] = False
+            order = order[keep].reshape(simulations, count - 1)
+
+        first, second = order[:, 0::2].copy(), order[:, 1::2].copy()
+        _avoid_rematches(first, second, played, opponents[:, :, :round_index])
+
+        _play(rng, scores, first, second, rating, draw_rate)
+        opponents[sims[:, None], first, round_index] = second
+        opponents[sims[:, None], second, round_index] = first
+
+    # Final ranks
+    order = np.argsort(-(scores + rng.random(scores.shape) * 0.25), axis=1)
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.arange(count)[None, :], axis=1)
+    player_rows = np.broadcast_to(np.arange(count), ranks.shape)
+    rank_counts = np.bincount((player_rows * count + ranks).ravel(), minlength=count * count).reshape(count, count)
+    return SimulationResult(players, rank_counts)
+
+
+def _play(rng, scores, first, second, rating, draw_rate):
+    """Draws the results of the (first[s, b], second[s, b]) boards and adds the points to scores"""
+    expected = 1 / (1 + 10 ** ((rating[second] - rating[first]) / 400))
+    draw = np.minimum(draw_rate, 2 * np.minimum(expected, 1 - expected))
+    win = expected - draw / 2
+    sample = rng.random(expected.shape)
+    points = np.where(sample < win, 1.0, np.where(sample < win + draw, 0.5, 0.0))
+
+    # A player appears at most once per simulation, so fancy indexing can be used to add the points
+    sims = np.arange(scores.shape[0])[:, None]
+    scores[sims, first] += points
+    scores[sims, second] += 1 - points
+
+
+def _is_rematch(first, second, played, opponents):
+    """Whether first[s] and second[s] already met, for each simulation s"""
+    rematch = played[first, second]
+    if opponents.shape[2]:
+        rematch |= (opponents[np.arange(len(first)), first] == second[:, None]).any(axis=1)
+    return rematch
+
+
+def _avoid_rematches(first, second, played, opponents):
+    """Swaps opponents with the next board when two players would meet again (in place)"""
+    boards = first.shape[1]
+    for _ in range(REMATCH_PASSES):
+        for board in range(boards - 1):
+            # Copies: the columns are overwritten below
+            a, b = first[:, board].copy(), second[:, board].copy()
+            c, d = first[:, board + 1].copy(), second[:, board + 1].copy()
+            rematch = _is_rematch(a, b, played, opponents)
+            if not rematch.any():
+                continue
+
+            # Either a-d / c-b, or a-c / b-d (the players of the next board float up)
+            cross = rematch & ~_is_rematch(a, d, played, opponents) & ~_is_rematch(c, b, played, opponents)
+            float_up = rematch & ~cross & ~_is_rematch(a, c, played, opponents) & ~_is_rematch(b, d, played, opponents)
+
+            second[:, board] = np.where(cross, d, np.where(float_up, c, b))
+            first[:, board + 1] = np.where(float_up, b, c)
+            second[:, board + 1] = np.where(cross, b, d)
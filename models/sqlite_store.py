@@ -0,0 +1,338 @@
+import sqlite3
+from pathlib import Path
+
+from .club import ChessClub
+from .player import Player
+from .tournament_log import read_tournament
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS clubs (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS players (
+    club_id INTEGER NOT NULL REFERENCES clubs(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    email TEXT,
+    chess_id TEXT,
+    birthday TEXT,
+    PRIMARY KEY (club_id, position)
+);
+CREATE INDEX IF NOT EXISTS players_chess_id ON players(chess_id);
+
+CREATE TABLE IF NOT EXISTS tournaments (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    venue TEXT,
+    start_date TEXT,
+    end_date TEXT,
+    number_of_rounds INTEGER,
+    current_round INTEGER,
+    completed INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS tournament_players (
+    tournament_id INTEGER NOT NULL REFERENCES tournaments(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    chess_id TEXT NOT NULL,
+    PRIMARY KEY (tournament_id, position)
+);
+CREATE INDEX IF NOT EXISTS tournament_players_chess_id ON tournament_players(chess_id);
+CREATE TABLE IF NOT EXISTS matches (
+    tournament_id INTEGER NOT NULL REFERENCES tournaments(id) ON DELETE CASCADE,
+    round INTEGER NOT NULL,
+    board INTEGER NOT NULL,
+    player1 TEXT,
+    player2 TEXT,
+    completed INTEGER NOT NULL DEFAULT 0,
+    winner TEXT,
+    PRIMARY KEY (tournament_id, round, board)
+);
+CREATE INDEX IF NOT EXISTS matches_player1 ON matches(player1);
+CREATE INDEX IF NOT EXISTS matches_player2 ON matches(player2);
+"""
+
+# Maximum number of chess IDs per query (SQLite limits the number of parameters)
+QUERY_CHUNK = 500
+
+# Points of one side of a completed match, as awarded by Match.play_match: a bye is a win, and
+# older files store the chess ID of the winner (see rating.match_points)
+POINTS_SQL = """
+    CASE
+        WHEN m.{other} IS NULL OR m.winner = '{side}' OR m.winner = m.{side} THEN 1.0
+        WHEN m.winner = '{other}' OR m.winner = m.{other} THEN 0.0
+        ELSE 0.5
+    END
+"""
+
+
+class SQLiteStore:
+    """
+    Optional SQLite storage for clubs, players and tournaments.
+
+    Tournaments are stored with the same structure as their JSON files (see
+    ManageTournament.tournament_to_dict). Rosters, standings and match history
+    can be queried without loading the whole dataset.
+    """
+
+    def __init__(self, filepath="data/chess.sqlite3"):
+        self.filepath = filepath
+        self.connection = sqlite3.connect(filepath)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    # Clubs and players
+
+    def club_id(self, name, create=False):
+        """Returns the id of a club (created if required and asked for), or None"""
+        row = self.connection.execute("SELECT id FROM clubs WHERE name = ?", (name,)).fetchone()
+        if row:
+            return row["id"]
+        if create:
+            with self.connection:
+                return self.connection.execute("INSERT INTO clubs (name) VALUES (?)", (name,)).lastrowid
+        return None
+
+    def clubs(self):
+        """Returns a list of (club name, player count) tuples"""
+        rows = self.connection.execute(
+            """SELECT c.name, COUNT(p.position) AS player_count
+            FROM clubs c LEFT JOIN players p ON p.club_id = c.id
+            GROUP BY c.id ORDER BY c.name"""
+        )
+        return [(row["name"], row["player_count"]) for row in rows]
+
+    def load_players(self, club_name):
+        """Returns the Player instances of a club"""
+        return [Player(**dict(row)) for row in self.roster(club_name)]
+
+    def roster(self, club_name):
+        """Returns the players of a club as rows (name, email, chess_id, birthday)"""
+        return self.connection.execute(
+            """SELECT p.name, p.email, p.chess_id, p.birthday
+            FROM players p JOIN clubs c ON c.id = p.club_id
+            WHERE c.name = ? ORDER BY p.position""",
+            (club_name,),
+        ).fetchall()
+
+    def save_club(self, club_name, players):
+        """Replaces all the players of a club"""
+        club_id = self.club_id(club_name, create=True)
+        with self.connection:
+            self.connection.execute("DELETE FROM players WHERE club_id = ?", (club_id,))
+            self.connection.executemany(
+                """INSERT INTO players (club_id, position, name, email, chess_id, birthday)
+                VALUES (:club_id, :position, :name, :email, :chess_id, :birthday)""",
+                [
+                    dict(player.serialize(), club_id=club_id, position=position)
+                    for position, player in enumerate(players)
+                ],
+            )
+
+    def save_player(self, club_name, position, player):
+        """Inserts or updates a single player of a club (position = index in the club's players)"""
+        club_id = self.club_id(club_name, create=True)
+        with self.connection:
+            self.connection.execute(
+                """INSERT OR REPLACE INTO players (club_id, position, name, email, chess_id, birthday)
+                VALUES (:club_id, :position, :name, :email, :chess_id, :birthday)""",
+                dict(player.serialize(), club_id=club_id, position=position),
+            )
+
+    def find_players(self, chess_ids):
+        """Returns the player rows (with their club name) of the given chess IDs, by chess ID
+
+        A chess ID found in several clubs gives the player of the first club (like PlayerRegistry).
+        """
+        chess_ids = list(chess_ids)
+        found = {}
+        for start in range(0, len(chess_ids), QUERY_CHUNK):
+            chunk = chess_ids[start:start + QUERY_CHUNK]
+            rows = self.connection.execute(
+                f"""SELECT c.name AS club, p.name, p.email, p.chess_id, p.birthday
+                FROM players p JOIN clubs c ON c.id = p.club_id
+                WHERE p.chess_id IN ({", ".join("?" * len(chunk))})
+                ORDER BY c.id, p.position""",
+                chunk,
+            )
+            for row in rows:
+                found.setdefault(row["chess_id"], row)
+        return found
+
+    def search_players(self, term, limit=None):
+        """Returns the player rows (with their club name) whose name or chess ID contains term
+        (case insensitive) or whose email is term, in club order"""
+        return self.connection.execute(
+            """SELECT c.name AS club, p.name, p.email, p.chess_id, p.birthday
+            FROM players p JOIN clubs c ON c.id = p.club_id
+            WHERE p.name LIKE ?1 OR p.chess_id LIKE ?1 OR lower(p.email) = lower(?2)
+            ORDER BY c.id, p.position LIMIT ?3""",
+            (f"%{term}%", term, -1 if limit is None else limit),
+        ).fetchall()
+
+    # Tournaments
+
+    def tournament_names(self):
+        return [row["name"] for row in self.connection.execute("SELECT name FROM tournaments ORDER BY name")]
+
+    def tournament_summaries(self):
+        """Returns the tournaments without their players and rounds (dictionaries with the other keys
+        of the JSON files)"""
+        return [
+            {
+                "name": row["name"],
+                "dates": {"from": row["start_date"], "to": row["end_date"]},
+                "venue": row["venue"],
+                "number_of_rounds": row["number_of_rounds"],
+                "current_round": row["current_round"],
+                "completed": bool(row["completed"]),
+            }
+            for row in self.connection.execute("SELECT * FROM tournaments ORDER BY name")
+        ]
+
+    def save_tournament(self, info):
+        """Saves a tournament, given as the dictionary written to its JSON file"""
+        with self.connection:
+            row = self.connection.execute("SELECT id FROM tournaments WHERE name = ?", (info["name"],)).fetchone()
+            values = (
+                info["venue"],
+                info["dates"]["from"],
+                info["dates"]["to"],
+                info["number_of_rounds"],
+                info["current_round"],
+                bool(info["completed"]),
+            )
+            if row:
+                tournament_id = row["id"]
+                self.connection.execute(
+                    """UPDATE tournaments SET venue = ?, start_date = ?, end_date = ?,
+                    number_of_rounds = ?, current_round = ?, completed = ? WHERE id = ?""",
+                    values + (tournament_id,),
+                )
+                self.connection.execute("DELETE FROM tournament_players WHERE tournament_id = ?", (tournament_id,))
+                self.connection.execute("DELETE FROM matches WHERE tournament_id = ?", (tournament_id,))
+            else:
+                tournament_id = self.connection.execute(
+                    """INSERT INTO tournaments
+                    (venue, start_date, end_date, number_of_rounds, current_round, completed, name)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                    values + (info["name"],),
+                ).lastrowid
+
+            self.connection.executemany(
+                "INSERT INTO tournament_players (tournament_id, position, chess_id) VALUES (?, ?, ?)",
+                [(tournament_id, position, chess_id) for position, chess_id in enumerate(info["players"])],
+            )
+            self.connection.executemany(
+                """INSERT INTO matches (tournament_id, round, board, player1, player2, completed, winner)
+                VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                [
+                    (tournament_id, round_num, board, *match["players"], bool(match["completed"]), match["winner"])
+                    for round_num, round_matches in enumerate(info["rounds"], 1)
+                    for board, match in enumerate(round_matches, 1)
+                ],
+            )
+
+    def remove_tournament(self, name):
+        with self.connection:
+            self.connection.execute("DELETE FROM tournaments WHERE name = ?", (name,))
+
+    def load_tournament(self, name):
+        """Returns a tournament as the dictionary written to its JSON file, or None"""
+        tournament = self.connection.execute("SELECT * FROM tournaments WHERE name = ?", (name,)).fetchone()
+        if tournament is None:
+            return None
+
+        players = self.connection.execute(
+            "SELECT chess_id FROM tournament_players WHERE tournament_id = ? ORDER BY position",
+            (tournament["id"],),
+        )
+        matches = self.connection.execute(
+            "SELECT * FROM matches WHERE tournament_id = ? ORDER BY round, board", (tournament["id"],)
+        )
+
+        # Keyed by round number: a round without matches has no rows
+        by_round = {}
+        for match in matches:
+            by_round.setdefault(match["round"], []).append(
+                {
+                    "players": [match["player1"], match["player2"]],
+                    "completed": bool(match["completed"]),
+                    "winner": match["winner"],
+                }
+            )
+        round_count = max([tournament["current_round"] or 0, *by_round])
+        rounds = [by_round.get(number, []) for number in range(1, round_count + 1)]
+
+        return {
+            "name": tournament["name"],
+            "dates": {"from": tournament["start_date"], "to": tournament["end_date"]},
+            "venue": tournament["venue"],
+            "number_of_rounds": tournament["number_of_rounds"],
+            "current_round": tournament["current_round"],
+            "completed": bool(tournament["completed"]),
+            "players": [row["chess_id"] for row in players],
+            "rounds": rounds,
+        }
+
+    def standings(self, tournament_name, limit=None):
+        """Returns the (chess_id, name, points) rows of a tournament, best first
+
+        Points are the same as in the Standings of the loaded tournament, but players with
+        the same points are in the order of the players of the tournament, not by tie-break scores.
+        """
+        return self.connection.execute(
+            f"""WITH results AS (
+                SELECT m.tournament_id, m.player1 AS chess_id,
+                    {POINTS_SQL.format(side="player1", other="player2")} AS points
+                FROM matches m WHERE m.completed
+                UNION ALL
+                SELECT m.tournament_id, m.player2, {POINTS_SQL.format(side="player2", other="player1")}
+                FROM matches m WHERE m.completed AND m.player2 IS NOT NULL
+            )
+            SELECT tp.chess_id,
+                (SELECT p.name FROM players p WHERE p.chess_id = tp.chess_id LIMIT 1) AS name,
+                COALESCE(SUM(r.points), 0) AS points
+            FROM tournaments t
+            JOIN tournament_players tp ON tp.tournament_id = t.id
+            LEFT JOIN results r ON r.tournament_id = t.id AND r.chess_id = tp.chess_id
+            WHERE t.name = ?
+            GROUP BY tp.chess_id
+            ORDER BY points DESC, tp.position
+            LIMIT ?""",
+            (tournament_name, -1 if limit is None else limit),
+        ).fetchall()
+
+    def match_history(self, chess_id):
+        """Returns the matches played by a player, in all tournaments"""
+        return self.connection.execute(
+            """SELECT t.name AS tournament, m.round, m.board, m.player1, m.player2, m.completed, m.winner
+            FROM matches m JOIN tournaments t ON t.id = m.tournament_id
+            WHERE m.player1 = ?1 OR m.player2 = ?1
+            ORDER BY t.start_date, t.name, m.round""",
+            (chess_id,),
+        ).fetchall()
+
+    # Migration
+
+    def migrate_from_json(self, clubs_folder="data/clubs", tournaments_folder="data/tournaments"):
+        """One-shot import of the JSON club and tournament files. Returns the (clubs, tournaments) counts."""
+        clubs = 0
+        for filepath in sorted(Path(clubs_folder).glob("*.json")):
+            club = ChessClub(filepath)
+            self.save_club(club.name, club.players)
+            clubs += 1
+
+        tournaments = 0
+        for filepath in sorted(Path(tournaments_folder).glob("*_info.json")):
+            info = read_tournament(filepath)
+            info.setdefault("current_round", 0)
+            info.setdefault("completed", False)
+            self.save_tournament(info)
+            tournaments += 1
+
+        return clubs, tournaments
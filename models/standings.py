@@ -0,0 +1,163 @@
+import random
+
+from .tiebreak import TieBreaks
+
+
+class Standings:
+    """
+    Standings of a tournament, updated as match results are recorded.
+
+    Points are counted per tournament (by chess ID). Players are grouped by score,
+    and a Fenwick tree over the scores (in half points) counts the players above a
+    given score: recording a result and getting the rank of a player are O(log n),
+    the top k players are read without sorting the whole list.
+
+    Players with the same points are ordered by their tie-break scores (see TieBreaks),
+    which are updated from the match results. The order of each score group is kept
+    until the group or the results change, so that reading the top k players again
+    (e.g. on every menu loop) only reads k players.
+    """
+
+    def __init__(self, players=(), max_points=0):
+        self.players = {}
+        self.scores = {}
+        self.tiebreaks = TieBreaks(self.scores)
+        # Players by score (index = points * 2), in the order they reached that score
+        self.groups = [{} for _ in range(int(max_points * 2) + 1)]
+        self._tree = [0] * (len(self.groups) + 1)
+        # Chess IDs of the score groups ordered by tie-break scores (best first), by score index
+        self._ordered = {}
+        for player in players:
+            self.add_player(player)
+
+    def __len__(self):
+        return len(self.players)
+
+    def __contains__(self, player):
+        return player.chess_id in self.players
+
+    def add_player(self, player, points=0):
+        if player.chess_id in self.players:
+            return
+        self.players[player.chess_id] = player
+        self.scores[player.chess_id] = 0
+        self._move(player.chess_id, None, 0)
+        if points:
+            self.record(player, points)
+
+    def points(self, player):
+        """Points of the player in this tournament"""
+        return self.scores[player.chess_id]
+
+    def record(self, player, points):
+        """Adds the points won by a player in a match"""
+        if player is None or player.chess_id not in self.players:
+            return
+        chess_id = player.chess_id
+        old = self.scores[chess_id]
+        self.scores[chess_id] = old + points
+        if points:
+            # The Buchholz scores of the player's opponents change too, whatever their group
+            self._ordered.clear()
+            self._move(chess_id, self._index(old), self._index(old + points))
+
+    def record_match(self, match, points1, points2):
+        """Records the points won by both players of a match (player2 is None for a bye)"""
+        self._ordered.clear()
+        self.record(match.player1, points1)
+        self.record(match.player2, points2)
+        if match.player1.chess_id in self.players:
+            self.tiebreaks.add_result(match.player1, match.player2, points1)
+        if match.player2 is not None and match.player2.chess_id in self.players:
+            self.tiebreaks.add_result(match.player2, match.player1, points2)
+
+    def snapshot(self):
+        """State of the standings (points and results by chess ID), as saved with the tournament"""
+        return {"scores": self.scores, "results": self.tiebreaks.results}
+
+    def restore(self, state):
+        """Restores the points and results of the players from a snapshot (see snapshot())"""
+        for chess_id, points in state["scores"].items():
+            if chess_id in self.players:
+                self.record(self.players[chess_id], points - self.scores[chess_id])
+        self.tiebreaks.restore({
+            chess_id: results for chess_id, results in state["results"].items() if chess_id in self.players
+        })
+        self._ordered.clear()
+
+    def tiebreak_key(self, chess_id):
+        """Sort key of a player among players with the same points (best first)"""
+        return self.tiebreaks.values(self.players[chess_id])
+
+    def rank(self, player):
+        """Rank of the player by points (1 = best), players with the same points share the same rank"""
+        index = self._index(self.scores[player.chess_id])
+        return len(self.players) - self._count_up_to(index) + 1
+
+    def top(self, k=None):
+        """Returns the k best (player, points) tuples (all of them if k is None)"""
+        result = []
+        for index in range(len(self.groups) - 1, -1, -1):
+            if not self.groups[index]:
+                continue
+            ordered = self._ordered.get(index)
+            if ordered is None:
+                ordered = self._ordered[index] = sorted(self.groups[index], key=self.tiebreak_key, reverse=True)
+            if k is not None:
+                ordered = ordered[:k - len(result)]
+            result.extend((self.players[chess_id], self.scores[chess_id]) for chess_id in ordered)
+            if k is not None and len(result) >= k:
+                return result
+        return result
+
+    def ranking(self):
+        """Returns all the players, best first"""
+        return [player for player, _ in self.top()]
+
+    def shuffled_ranking(self):
+        """Returns all the players, best first, in random order among players with the same points
+        and tie-break scores"""
+        players = []
+        for group in reversed(self.groups):
+            same_points = list(group)
+            random.shuffle(same_points)
+            same_points.sort(key=self.tiebreak_key, reverse=True)
+            players.extend(self.players[chess_id] for chess_id in same_points)
+        return players
+
+    def _index(self, points):
+        return int(points * 2)
+
+    def _move(self, chess_id, old_index, new_index):
+        self._ordered.pop(old_index, None)
+        self._ordered.pop(new_index, None)
+        if old_index is not None:
+            del self.groups[old_index][chess_id]
+            self._add(old_index, -1)
+        if new_index >= len(self.groups):
+            self._grow(new_index + 1)
+        self.groups[new_index][chess_id] = None
+        self._add(new_index, 1)
+
+    def _grow(self, size):
+        """Makes room for higher scores (rebuilds the tree)"""
+        self.groups.extend({} for _ in range(size - len(self.groups)))
+        self._tree = [0] * (len(self.groups) + 1)
+        for index, group in enumerate(self.groups):
+            if group:
+                self._add(index, len(group))
+
+    def _add(self, index, delta):
+        index += 1
+        while index < len(self._tree):
+            self._tree[index] += delta
+            index += index & -index
+
+    def _count_up_to(self, index):
+        """Number of players with a score index lower than or equal to index"""
+        total = 0
+        index += 1
+        while index > 0:
+            total += self._tree[index]
+            index -= index & -index
+        return total
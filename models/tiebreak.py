@@ -0,0 +1,64 @@
+class TieBreaks:
+    """
+    Tie-break scores of the players of a tournament, computed from their results.
+
+    - Buchholz: sum of the points of the player's opponents
+    - Sonneborn-Berger: sum of the points of the opponents, weighted by the points
+      the player scored against each of them
+    - Progressive: sum of the player's cumulative points after each of their rounds
+
+    Values are cached per player. When a result is entered, only the players whose
+    values depend on it are recomputed: the two players and their opponents.
+    """
+
+    def __init__(self, scores):
+        # Tournament points by chess ID (shared with the standings)
+        self.scores = scores
+        # Results by chess ID, in round order: (opponent chess ID or None for a bye, points scored)
+        self.results = {}
+        self._cache = {}
+
+    def add_result(self, player, opponent, points):
+        """Records the points scored by a player against an opponent (None for a bye)"""
+        chess_id = player.chess_id
+        opponent_id = opponent.chess_id if opponent is not None else None
+        self.results.setdefault(chess_id, []).append((opponent_id, points))
+
+        # The points of the player changed: their values and the ones of their opponents are outdated
+        self._cache.pop(chess_id, None)
+        for other_id, _ in self.results[chess_id]:
+            self._cache.pop(other_id, None)
+
+    def restore(self, results):
+        """Sets the results of the players ({chess_id: [(opponent chess ID or None, points)]})"""
+        self.results = {chess_id: [tuple(result) for result in player_results]
+                        for chess_id, player_results in results.items()}
+        self._cache.clear()
+
+    def values(self, player):
+        """Returns the (buchholz, sonneborn_berger, progressive) tuple of a player"""
+        chess_id = player.chess_id
+        values = self._cache.get(chess_id)
+        if values is None:
+            values = self._cache[chess_id] = self._compute(chess_id)
+        return values
+
+    def buchholz(self, player):
+        return self.values(player)[0]
+
+    def sonneborn_berger(self, player):
+        return self.values(player)[1]
+
+    def progressive(self, player):
+        return self.values(player)[2]
+
+    def _compute(self, chess_id):
+        buchholz = sonneborn_berger = progressive = cumulative = 0
+        for opponent_id, points in self.results.get(chess_id, ()):
+            if opponent_id is not None:
+                opponent_points = self.scores.get(opponent_id, 0)
+                buchholz += opponent_points
+                sonneborn_berger += points * opponent_points
+            cumulative += points
+            progressive += cumulative
+        return buchholz, sonneborn_berger, progressive
@@ -1,6 +1,6 @@
 import random
-from .round import Round
-from .pairing import generate_pairings, random_pairings
+from .pairing import OpponentMatrix, generate_pairings, random_pairings
+from .standings import Standings
 
 
 class Tournament:
@@ -17,45 +17,64 @@ class Tournament:
         self.max_round = max_round
         self.rounds = []
         self.current_round = 0
-        self.is_round_setup_done = False
+        # Tournament points and ranking, updated by the matches as results are recorded
+        self.standings = Standings(players, max_points=max_round)
+        # Who played whom (and byes and colours), updated as rounds are created
+        self.opponents = OpponentMatrix(players)
 
     def shuffle_players(self):
         random.shuffle(self.players)
 
     def sort_players(self):
-        self.players.sort(key=lambda player: player.points, reverse=True)
+        # Players with the same number of points are in random order
+        self.players[:] = self.standings.shuffled_ranking()
 
     def play_round(self):
         if self.current_round >= self.max_round:
             print("Maximum number of rounds reached. No new rounds will occur.")
             return False
 
-        if not self.is_round_setup_done:
-            self.current_round += 1
-            self.is_round_setup_done = True
-
-            if not self.rounds or len(self.rounds) < self.current_round:
-                # Initialize rounds list or add a new round if needed
-                matches = random_pairings(self.players)
-                self.rounds.append(matches)
-            else:
-                self.sort_players()
-                matches = generate_pairings(self.players)
-                self.rounds[self.current_round - 1] = matches  # Update the current round
-
-        self.is_round_setup_done = False
+        self.current_round += 1
+        if self.current_round == 1:
+            matches = random_pairings(self.players)
+        else:
+            # Swiss system: players are paired by score, avoiding rematches
+            self.sort_players()
+            matches = generate_pairings(self.players, self.opponents)
+
+        # A player with a bye gets the point of the match straight away
+        for match in matches:
+            match.standings = self.standings
+            if match.is_bye():
+                match.play_match("bye")
+
+        if len(self.rounds) < self.current_round:
+            self.add_round(matches)
+        else:
+            self.rounds[self.current_round - 1] = matches  # Update the current round
+            # The pairs, byes and colours of the replaced round are forgotten
+            self.opponents = OpponentMatrix(self.players)
+            for round_matches in self.rounds:
+                self.opponents.add_round(round_matches)
         return True
 
+    def add_round(self, matches):
+        """Adds a round (list of matches) to the tournament"""
+        self.rounds.append(matches)
+        self.opponents.add_round(matches)
+
     def is_completed(self):
-        return self.current_round >= self.max_round
+        # The last round must have been played, not only paired
+        if self.current_round < self.max_round:
+            return False
+        return not self.rounds or all(match.played for match in self.rounds[-1])
 
     def declare_winner(self):
         if not self.is_completed():
             print("The tournament is not completed yet.")
             return
 
-        self.sort_players()
-        winner = self.players[0]
+        winner, _ = self.standings.top(1)[0]
 
         print(f"{'\n*** Tournament Winner ***\n'}")
         print(f"Congratulations to {winner.name} for winning the tournament!")
@@ -63,10 +82,9 @@ class Tournament:
         self.display_rankings()
 
     def display_player_info(self):
-        for player in sorted(self.players, key=lambda p: p.points, reverse=True):
+        for player in self.standings.ranking():
             print(player)
 
-    def display_rankings(self):
-        sorted_players = sorted(self.players, key=lambda x: x.points, reverse=True)
-        for player in sorted_players:
-            print(f"Name: {player.name}, Points: {player.points}")
+    def display_rankings(self, limit=None):
+        for player, points in self.standings.top(limit):
+            print(f"Name: {player.name}, Points: {points}")
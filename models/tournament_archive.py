@@ -0,0 +1,112 @@
+import gzip
+import json
+import os
+from datetime import date
+from pathlib import Path
+
+# Folder of the archive, next to the tournament files
+ARCHIVE_FOLDER = "data/tournaments/archive"
+
+
+class TournamentArchive:
+    """
+    Compressed archive of completed and removed tournaments.
+
+    Each archived tournament is a gzip-compressed JSON file holding the
+    tournament information (as saved in its file, see read_tournament). An index
+    file keeps a summary of every archived tournament (status, dates, venue,
+    rounds and players), so the archive is listed and queried without opening
+    the archived files; these are only read when a tournament is restored.
+    """
+
+    INDEX_NAME = "index.json"
+
+    def __init__(self, folder=ARCHIVE_FOLDER):
+        self.folder = Path(folder)
+        self.index = self.read_index()
+        # Names of the archived tournaments by chess ID of their players
+        self.by_player = {}
+        for name, entry in self.index.items():
+            self._index_players(name, entry)
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    @property
+    def index_path(self):
+        return self.folder / self.INDEX_NAME
+
+    def read_index(self):
+        try:
+            with open(self.index_path) as fp:
+                return json.load(fp)
+        except FileNotFoundError:
+            return {}
+
+    def write_index(self):
+        """Writes the index file (replaced atomically)"""
+        self.folder.mkdir(parents=True, exist_ok=True)
+        temporary = self.index_path.with_suffix(".tmp")
+        with open(temporary, "w") as fp:
+            json.dump(self.index, fp)
+        os.replace(temporary, self.index_path)
+
+    def add(self, info, status):
+        """Archives a tournament (information as saved in its file) with a status ("completed" or "removed")"""
+        name = info["name"]
+        if name in self.index:
+            self._unindex_players(name, self.index[name])
+
+        self.folder.mkdir(parents=True, exist_ok=True)
+        file_name = f"{name}.json.gz"
+        temporary = self.folder / (file_name + ".tmp")
+        with gzip.open(temporary, "wt") as fp:
+            json.dump(info, fp)
+        os.replace(temporary, self.folder / file_name)
+
+        entry = {
+            "file": file_name,
+            "status": status,
+            "dates": info["dates"],
+            "venue": info["venue"],
+            "current_round": info.get("current_round", 0),
+            "number_of_rounds": info["number_of_rounds"],
+            "players": info["players"],
+            "archived": date.today().isoformat(),
+        }
+        self.index[name] = entry
+        self._index_players(name, entry)
+        self.write_index()
+
+    def get(self, name):
+        """Returns the information of an archived tournament (as saved in its file)"""
+        with gzip.open(self.folder / self.index[name]["file"], "rt") as fp:
+            return json.load(fp)
+
+    def remove(self, name):
+        """Removes a tournament from the archive (e.g. once restored)"""
+        entry = self.index.pop(name)
+        self._unindex_players(name, entry)
+        self.write_index()
+        (self.folder / entry["file"]).unlink(missing_ok=True)
+
+    def query(self, term=None, status=None, player=None):
+        """Returns the (name, index entry) tuples of the archived tournaments matching all the given criteria:
+        term in the name (case insensitive), status, and chess ID of a player"""
+        names = self.by_player.get(player, ()) if player is not None else self.index
+        if term:
+            names = [name for name in names if term.casefold() in name.casefold()]
+        if status is not None:
+            names = [name for name in names if self.index[name]["status"] == status]
+        return [(name, self.index[name]) for name in sorted(names)]
+
+    def _index_players(self, name, entry):
+        for chess_id in entry["players"]:
+            self.by_player.setdefault(chess_id, set()).add(name)
+
+    def _unindex_players(self, name, entry):
+        for chess_id in entry["players"]:
+            self.by_player.get(chess_id, set()).discard(name)
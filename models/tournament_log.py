@@ -0,0 +1,220 @@
+import json
+import os
+from pathlib import Path
+
+from .club import file_fingerprint
+
+# Number of events in the log triggering a new snapshot
+SNAPSHOT_INTERVAL = 100
+
+
+def read_tournament(filepath, keep_snapshot=False):
+    """Reads a tournament file (*_info.json) and applies the events logged since its snapshot
+
+    Returns the tournament information with the structure written by ManageTournament.tournament_to_dict.
+    With keep_snapshot, the standings and opponents of the snapshot are kept when no event was
+    logged since it (they would be out of date otherwise).
+    """
+    log = TournamentLog(filepath)
+    info = log.read_snapshot()
+    events = log.read_events(info.pop("sequence", 0))
+    for event in events:
+        apply_event(info, event)
+    # Files saved before the last results had to be entered to complete a tournament may be flagged completed
+    info["completed"] = is_completed(info)
+    if events or not keep_snapshot:
+        info.pop("standings", None)
+        info.pop("opponents", None)
+    return info
+
+
+def is_completed(info):
+    """Whether a tournament (information as saved in its file) is completed: its last round was paired,
+    and every match of that round has a result"""
+    if info.get("current_round", 0) < info["number_of_rounds"]:
+        return False
+    rounds = info.get("rounds", [])
+    return not rounds or all(match_info.get("completed") for match_info in rounds[-1])
+
+
+def apply_event(info, event):
+    """Applies an event to the tournament information (as saved in its file)"""
+    if event["event"] == "round":
+        info["rounds"].append([
+            {"players": players, "completed": players[1] is None, "winner": "bye" if players[1] is None else None}
+            for players in event["matches"]
+        ])
+        info["current_round"] = event["round"]
+    elif event["event"] == "result":
+        match_info = info["rounds"][event["round"] - 1][event["board"]]
+        match_info["completed"] = True
+        match_info["winner"] = event["winner"]
+    info["completed"] = is_completed(info)
+
+
+class TournamentLog:
+    """
+    Append-only event log of a tournament, next to its snapshot file.
+
+    The snapshot (the *_info.json file) holds the tournament information, the
+    standings (points and results by chess ID, see Standings.snapshot), the
+    opponent matrix (see OpponentMatrix.serialize) and the sequence number of
+    the last event it includes. Each save appends the events
+    which happened since the previous save to the log (*_info.events): a round
+    was created ("round", with its pairings) or a result was recorded ("result").
+    A new snapshot is written, and the log cleared, once the log holds
+    SNAPSHOT_INTERVAL events.
+
+    Loading reads the snapshot and applies the events with a higher sequence
+    number, so a snapshot written without clearing the log (interrupted save)
+    does not apply events twice.
+    """
+
+    def __init__(self, filepath):
+        self.filepath = Path(filepath)
+        # Sequence number of the last event written
+        self.sequence = 0
+        # Number of events in the log file
+        self.size = 0
+        # Number of rounds logged, and logged boards of the rounds which have matches without a logged result
+        self.rounds = 0
+        self.open_rounds = {}
+
+    @staticmethod
+    def files_fingerprint(filepath):
+        """Fingerprint of the files of a tournament (snapshot and log) as they currently are on disk"""
+        return file_fingerprint(filepath), file_fingerprint(Path(filepath).with_suffix(".events"))
+
+    @property
+    def events_path(self):
+        """Path of the log file: the snapshot file path with a .events extension"""
+        return self.filepath.with_suffix(".events")
+
+    def exists(self):
+        return self.filepath.exists()
+
+    def read_snapshot(self):
+        with open(self.filepath) as fp:
+            return json.load(fp)
+
+    def read_events(self, after=0):
+        """Returns the events of the log with a sequence number higher than after"""
+        events = []
+        try:
+            with open(self.events_path) as fp:
+                lines = fp.readlines()
+        except FileNotFoundError:
+            return events
+
+        for line in lines:
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                # Partially written event (interrupted write): it was never acknowledged
+                break
+            if event["sequence"] > after:
+                events.append(event)
+        self.size = len(lines)
+        return events
+
+    def track(self, tournament, sequence):
+        """Sets the logged state to the current state of the tournament (after loading it)"""
+        self.sequence = sequence
+        self.rounds = 0
+        self.open_rounds = {}
+        for number, matches in enumerate(tournament.rounds, start=1):
+            self._track_round(number, matches)
+
+    def pending_events(self, tournament):
+        """Returns the events which happened since the last save"""
+        events = []
+        for number in sorted(self.open_rounds):
+            events.extend(self._result_events(number, tournament.rounds[number - 1], self.open_rounds[number]))
+        for number in range(self.rounds + 1, len(tournament.rounds) + 1):
+            matches = tournament.rounds[number - 1]
+            events.append({
+                "event": "round",
+                "round": number,
+                "matches": [[match.player1.chess_id, match.player2.chess_id if match.player2 else None]
+                            for match in matches],
+            })
+            events.extend(self._result_events(number, matches, ()))
+        return events
+
+    def save(self, tournament, to_dict):
+        """Appends the new events of the tournament to the log, or writes a snapshot (to_dict(tournament)
+        gives the tournament information) if there is none yet or if the log is full"""
+        events = self.pending_events(tournament)
+        if not self.exists() or self.size + len(events) >= SNAPSHOT_INTERVAL:
+            self.sequence += len(events)
+            self.snapshot(tournament, to_dict)
+            return
+
+        if not events:
+            return
+        lines = []
+        for event in events:
+            self.sequence += 1
+            event["sequence"] = self.sequence
+            lines.append(json.dumps(event) + "\n")
+        with open(self.events_path, "a") as fp:
+            fp.write("".join(lines))
+        self.size += len(events)
+        self.track_events(tournament, events)
+
+    def snapshot(self, tournament, to_dict):
+        """Writes a snapshot of the whole tournament (e.g. for a new tournament)"""
+        self.write_snapshot(to_dict(tournament), tournament)
+        self.track(tournament, self.sequence)
+
+    def write_snapshot(self, info, tournament):
+        """Writes the snapshot file (replaced atomically), then clears the log"""
+        info = dict(info, sequence=self.sequence, standings=tournament.standings.snapshot(),
+                    opponents=tournament.opponents.serialize())
+        temporary = self.filepath.with_suffix(".tmp")
+        with open(temporary, "w") as fp:
+            json.dump(info, fp)
+        os.replace(temporary, self.filepath)
+        self.events_path.unlink(missing_ok=True)
+        self.size = 0
+
+    def rename(self, filepath):
+        """Moves the snapshot and the log to a new snapshot path"""
+        filepath = Path(filepath)
+        os.rename(self.filepath, filepath)
+        if self.events_path.exists():
+            os.rename(self.events_path, filepath.with_suffix(".events"))
+        self.filepath = filepath
+
+    def delete(self):
+        """Deletes the snapshot and the log"""
+        self.filepath.unlink(missing_ok=True)
+        self.events_path.unlink(missing_ok=True)
+
+    def track_events(self, tournament, events):
+        """Updates the logged state after writing events"""
+        for event in events:
+            if event["event"] == "round":
+                self.rounds = event["round"]
+                self.open_rounds[event["round"]] = set()
+            else:
+                self.open_rounds[event["round"]].add(event["board"])
+        for number in list(self.open_rounds):
+            self._close_round(number, tournament.rounds[number - 1])
+
+    def _track_round(self, number, matches):
+        self.rounds = number
+        self.open_rounds[number] = {board for board, match in enumerate(matches)
+                                    if match.played and match.player2 is not None}
+        self._close_round(number, matches)
+
+    def _close_round(self, number, matches):
+        if len(self.open_rounds[number]) == sum(match.player2 is not None for match in matches):
+            del self.open_rounds[number]
+
+    def _result_events(self, number, matches, logged):
+        return [
+            {"event": "result", "round": number, "board": board, "winner": match.result}
+            for board, match in enumerate(matches)
+            if match.played and match.player2 is not None and board not in logged
+        ]
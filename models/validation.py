@@ -0,0 +1,64 @@
+import re
+from datetime import datetime
+
+from .player import Player
+
+# Chess ID = two letters + 5 numbers
+CHESS_ID_RGXP = re.compile(r"[A-Z]{2}[0-9]{5}")
+
+# https://stackoverflow.com/a/201378
+EMAIL_RGXP = re.compile(
+    r"""
+    (?:[a-z0-9!#$%&'*+/=?^_`{|}~-]+
+    (?:\.[a-z0-9!#$%&'*+/=?^_`{|}~-]+)*
+    |"[^\x00-\x1F\x7F]+")
+    @
+    (?:
+        (?:[a-z0-9](?:[a-z0-9-]*[a-z0-9])?\.)+[a-z0-9](?:[a-z0-9-]*[a-z0-9])?
+        |
+        \[
+        (?:
+            (?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)
+            \.
+        ){3}
+        (?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?
+        |
+        [a-z0-9-]*[a-z0-9]:
+        [^\x00-\x1F\x7F]+
+        )\]
+    )
+    """,
+    re.VERBOSE,
+)
+
+
+def is_valid_email(value):
+    return bool(value) and EMAIL_RGXP.fullmatch(value) is not None
+
+
+def is_valid_chess_id(value):
+    return bool(value) and CHESS_ID_RGXP.fullmatch(value) is not None
+
+
+def is_valid_birthday(value):
+    """A birthday is a dd-mm-yyyy date string, which cannot be in the future"""
+    try:
+        return datetime.strptime(value, Player.DATE_FORMAT) <= datetime.now()
+    except (TypeError, ValueError):
+        return False
+
+
+def validate_player_data(data):
+    """Checks the data used to create a player and raises a ValueError listing every problem found"""
+    errors = []
+    if not data.get("name"):
+        errors.append("name is required")
+    if not is_valid_email(data.get("email")):
+        errors.append(f"invalid email address {data.get('email')!r}")
+    if not is_valid_chess_id(data.get("chess_id")):
+        errors.append(f"invalid Chess ID {data.get('chess_id')!r} (XXNNNNN)")
+    if not is_valid_birthday(data.get("birthday")):
+        errors.append(f"invalid birthday {data.get('birthday')!r} (dd-mm-yyyy)")
+
+    if errors:
+        raise ValueError(", ".join(errors))
@@ -2,6 +2,9 @@ import re
 from abc import ABC, abstractmethod
 from datetime import datetime
 
+from models.metrics import timed
+from models.validation import CHESS_ID_RGXP, EMAIL_RGXP
+
 
 class BaseScreen(ABC):
     """Abstract class for screen interaction"""
@@ -37,30 +40,8 @@ class BaseScreen(ABC):
     def input_email(self, **kwargs):
         """Utility function to get an email address"""
 
-        # https://stackoverflow.com/a/201378
-        mail_rgxp = r"""
-            (?:[a-z0-9!#$%&'*+/=?^_`{|}~-]+
-            (?:\.[a-z0-9!#$%&'*+/=?^_`{|}~-]+)*
-            |"[^\x00-\x1F\x7F]+")
-            @
-            (?:
-                (?:[a-z0-9](?:[a-z0-9-]*[a-z0-9])?\.)+[a-z0-9](?:[a-z0-9-]*[a-z0-9])?
-                |
-                \[
-                (?:
-                    (?:
-                        (?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)
-                        \.
-                    ){3}
-                    (?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?
-                    |
-                    [a-z0-9-]*[a-z0-9]:
-                    [^\x00-\x1F\x7F]+
-                )\]
-            )
-        """
         message = "Please provide a valid email address!"
-        return self.input_regexp(mail_rgxp, message, **kwargs)
+        return self.input_regexp(EMAIL_RGXP, message, **kwargs)
 
     def input_regexp(self, regexp, error_message, **kwargs):
         """Utility function to get a string matching a regular expression"""
@@ -73,9 +54,8 @@ class BaseScreen(ABC):
 
     def input_chess_id(self, **kwargs):
         """Utility function to get a Chess ID string"""
-        chess_rgxp = r"[A-Z]{2}[0-9]{5}"
         message = "Please provide a valid Chess ID (XXNNNNN)!"
-        return self.input_regexp(chess_rgxp, message, **kwargs)
+        return self.input_regexp(CHESS_ID_RGXP, message, **kwargs)
 
     def input_birthday(self, **kwargs):
         """Utility function to get a date string"""
@@ -89,6 +69,7 @@ class BaseScreen(ABC):
             except ValueError:
                 print("Please provide a valid date (dd-mm-yyyy)!")
 
+    @timed("screen")
     def run(self):
         """Main method to 'run' the screen - displays a message and gets a command"""
         message = getattr(self, "display", None)
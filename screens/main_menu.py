@@ -11,7 +11,7 @@ class MainMenu(BaseScreen):
 
     def display(self):
         for idx, club in enumerate(self.clubs, 1):
-            print(idx, club.name)
+            print(idx, club.name, f"({club.player_count} players)")
 
     def get_command(self):
         while True:
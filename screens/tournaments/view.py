@@ -1,3 +1,7 @@
+# Number of players listed on the tournament management screen (see "View Rankings" for all of them)
+TOP_PLAYERS = 10
+
+
 class TournamentView:
     def __init__(self, tournament_manager):
         # Initialize the TournamentView with a reference to a tournament_manager
@@ -7,13 +11,13 @@ class TournamentView:
     def manage_tournament(self):
         # Method to manage a tournament. It includes listing available tournaments,
         # selecting a tournament, and managing various aspects of the selected tournament.
-        if not self.tournament_manager.tournaments:
+        if not self.tournament_manager.manifest:
             print("No tournaments available.")
             return
 
         print("\nAvailable Tournaments:")
-        # Retrieve and display the list of available tournament names
-        tournament_names = list(self.tournament_manager.tournaments.keys())
+        # Retrieve and display the list of available tournament names (from the manifest, nothing is loaded)
+        tournament_names = list(self.tournament_manager.manifest)
         for i, name in enumerate(tournament_names, 1):
             print(f"{i}. {name}")
 
@@ -24,7 +28,10 @@ class TournamentView:
             # Validate the user's selection and retrieve the corresponding tournament
             if 0 <= choice_index < len(tournament_names):
                 tournament_name = tournament_names[choice_index]
-                tournament = self.tournament_manager.tournaments[tournament_name]
+                # Only the selected tournament is loaded
+                tournament = self.tournament_manager.get_tournament(tournament_name)
+                if tournament is None:
+                    return
             else:
                 print("Invalid selection. Please try again.")
                 return
@@ -40,9 +47,11 @@ class TournamentView:
             print(f"Dates: {tournament.start_date} to {tournament.end_date}")
             print(f"Current Round: {tournament.current_round} / {tournament.max_round}")
             print("Players:")
-            # List all players in the tournament
-            for player in tournament.players:
-                print(f" - {player.name} (Points: {player.points})")
+            # List the best players of the tournament
+            for player, points in tournament.standings.top(TOP_PLAYERS):
+                print(f" - {player.name} (Points: {points})")
+            if len(tournament.standings) > TOP_PLAYERS:
+                print(f"   ... and {len(tournament.standings) - TOP_PLAYERS} more")
 
             # Menu for tournament management options
             print("1. View Rankings")
@@ -50,6 +59,8 @@ class TournamentView:
             print("3. View Player Details")
             print("4. Generate Tournament Report")
             print("5. Back to Main Menu")
+            print("6. Pair Next Round (enter the results later)")
+            print("7. Enter Round Results from a File")
             choice = input("Choose an option: ")
 
             # Handling the user's choice for tournament management
@@ -63,16 +74,109 @@ class TournamentView:
                 self.tournament_manager.view_tournament_report(tournament.name)
             elif choice == '5':
                 break  # Exit the tournament management loop
+            elif choice == '6':
+                self.tournament_manager.pair_next_round(tournament)
+            elif choice == '7':
+                source = input("Results file (CSV or JSON lines, '-' for stdin): ").strip()
+                self.tournament_manager.import_round_results(tournament, source)
             else:
                 print("Invalid option, please try again.")
 
     def get_tournament(self):
-        if not self.tournament_manager.tournaments:
+        if not self.tournament_manager.manifest:
             print("No tournaments available.")
             return
 
         print("\nAvailable Tournaments:")
-        # Retrieve and display the list of available tournament names
-        tournament_names = list(self.tournament_manager.tournaments.keys())
-        for i, name in enumerate(tournament_names, 1):
-            print(f"{i}. {name}")
+        # Display the tournaments from the manifest, without loading them
+        tournament_names = list(self.tournament_manager.manifest)
+        for i, (name, entry) in enumerate(self.tournament_manager.manifest.items(), 1):
+            print(f"{i}. {name} ({entry['dates']['from']} to {entry['dates']['to']}, {entry['status']}, "
+                  f"round {entry['current_round']}/{entry['number_of_rounds']})")
+
+        choice = input("Select a tournament to view its standings (enter number), or just press enter to go back: ")
+        if not choice.strip():
+            return
+        try:
+            choice_index = int(choice) - 1
+        except ValueError:
+            print("Invalid input. Please enter a number.")
+            return
+        if not 0 <= choice_index < len(tournament_names):
+            print("Invalid selection. Please try again.")
+            return
+        # With a database, the standings are queried without loading the tournament
+        for rank, (chess_id, name, points) in enumerate(
+                self.tournament_manager.tournament_standings(tournament_names[choice_index], TOP_PLAYERS), 1):
+            print(f"{rank}. {name or chess_id} ({chess_id}): {points} point(s)")
+
+    def browse_archive(self):
+        # Lists the archived tournaments matching a name or a player, and restores one on demand.
+        term = input("Enter a tournament name or a player chess ID, or just press enter to list all: ").strip()
+        archive = self.tournament_manager.archive
+        results = archive.query(player=term) if term in archive.by_player else archive.query(term=term)
+        if not results:
+            print("No archived tournaments found.")
+            return
+
+        print("\nArchived Tournaments:")
+        for i, (name, entry) in enumerate(results, 1):
+            print(f"{i}. {name} ({entry['dates']['from']} to {entry['dates']['to']}, {entry['status']}, "
+                  f"archived on {entry['archived']})")
+
+        choice = input("Select a tournament to restore (enter number), or just press enter to go back: ").strip()
+        if not choice:
+            return
+        try:
+            choice_index = int(choice) - 1
+        except ValueError:
+            print("Invalid input. Please enter a number.")
+            return
+        if 0 <= choice_index < len(results):
+            self.tournament_manager.restore_tournament(results[choice_index][0])
+        else:
+            print("Invalid selection. Please try again.")
+
+    def select_player(self, prompt):
+        # Asks for a name or chess ID and returns the selected player (None if none was selected).
+        term = input(prompt).strip()
+        if not term:
+            return None
+        players = self.tournament_manager.search_players(term)
+        if not players:
+            print("No player found.")
+            return None
+        if len(players) == 1:
+            return players[0]
+        for i, player in enumerate(players, 1):
+            print(f"{i}: {player.name} ({player.chess_id})")
+        try:
+            choice_index = int(input("Select a player (enter number): ").strip()) - 1
+        except ValueError:
+            print("Invalid input. Please enter a number.")
+            return None
+        if 0 <= choice_index < len(players):
+            return players[choice_index]
+        print("Invalid selection. Please try again.")
+        return None
+
+    def view_player_history(self):
+        # Shows the games of a player across all the tournaments, and their head-to-head score against another player.
+        player = self.select_player("Enter a player name or chess ID: ")
+        if player is None:
+            return
+
+        games = self.tournament_manager.player_games(player.chess_id)
+        opponents = self.tournament_manager.find_players({opponent_id for _, _, opponent_id, _ in games})
+        points = sum(score for _, _, _, score in games)
+        print(f"\nGames of {player.name} ({player.chess_id}): {len(games)} games, {points} points")
+        for tournament_name, round_number, opponent_id, score in games:
+            opponent = opponents.get(opponent_id)
+            opponent_name = opponent.name if opponent else opponent_id
+            print(f" - {tournament_name}, round {round_number}: vs {opponent_name} ({opponent_id}), {score} point(s)")
+
+        opponent = self.select_player("Enter an opponent name or chess ID for the head-to-head, or just press enter: ")
+        if opponent is None:
+            return
+        wins, draws, losses = self.tournament_manager.head_to_head(player.chess_id, opponent.chess_id)
+        print(f"{player.name} vs {opponent.name}: {wins} win(s), {draws} draw(s), {losses} loss(es)")
@@ -0,0 +1,50 @@
+import random
+
+import pytest
+
+from data.manage_tournament import ManageTournament
+from models.player import Player
+from models.player_registry import PlayerRegistry
+from models.tournament import Tournament
+
+
+def make_players(count):
+    return [Player(f"Player {idx}", f"player{idx}@example.com", f"AB{idx:05d}", "01-01-1990") for idx in range(count)]
+
+
+def make_manager(count):
+    """Tournament manager of the current folder, with count players registered (instead of the club files)"""
+    manager = ManageTournament()
+    manager._registry = PlayerRegistry()
+    manager._registry.add_club("Test Club", make_players(count))
+    return manager
+
+
+def create_tournament(manager, name, rounds):
+    """Creates and saves a tournament with all the registered players, like ManageTournament.create_tournament"""
+    tournament = Tournament(name, "Town Hall", "2024-01-01", "2024-01-05", list(manager.registry.players), rounds)
+    manager.tournaments[name] = tournament
+    manager.save_tournament_to_json(tournament)
+    return tournament
+
+
+def play_round(manager, tournament, results=None):
+    """Pairs the next round and records random results for the first results boards (all of them by default)"""
+    assert manager.pair_next_round(tournament)
+    matches = [match for match in tournament.rounds[-1] if match.player2 is not None]
+    records = [
+        {"player1": match.player1.chess_id, "player2": match.player2.chess_id, "result": random.choice("120")}
+        for match in matches[:results]
+    ]
+    if records:
+        assert manager.enter_round_results(tournament, records)
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Runs the test in an empty project folder (the data paths are relative)"""
+    (tmp_path / "data" / "tournaments").mkdir(parents=True)
+    (tmp_path / "data" / "clubs").mkdir()
+    monkeypatch.chdir(tmp_path)
+    random.seed(0)
+    return tmp_path
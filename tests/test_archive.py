@@ -0,0 +1,48 @@
+import os
+
+from .conftest import create_tournament, make_manager, play_round
+
+FILE_PATH = "data/tournaments/Test Open_info.json"
+
+
+def test_archiving_skips_tournaments_with_pending_matches(workdir):
+    manager = make_manager(7)
+    tournament = create_tournament(manager, "Test Open", 3)
+    play_round(manager, tournament)
+    play_round(manager, tournament)
+    # The last round is paired, one of its matches has a result
+    play_round(manager, tournament, results=1)
+    assert tournament.current_round == tournament.max_round
+
+    assert manager.archive_completed_tournaments() == 0
+    # Even when asked directly (e.g. from a stale status)
+    assert not manager.archive_tournament("Test Open", "completed")
+    assert os.path.exists(FILE_PATH)
+    assert "Test Open" in manager.manifest
+    assert "Test Open" not in manager.archive
+
+    # Once the last results are entered, the tournament is archived
+    pending = [match for match in tournament.rounds[-1] if not match.played]
+    assert manager.enter_round_results(tournament, [
+        {"player1": match.player1.chess_id, "player2": match.player2.chess_id, "result": "0"} for match in pending
+    ])
+    assert manager.manifest["Test Open"]["status"] == "completed"
+
+    assert manager.archive_completed_tournaments() == 1
+    assert not os.path.exists(FILE_PATH)
+    assert "Test Open" not in manager.manifest
+    assert manager.archive.get("Test Open")["completed"]
+
+
+def test_archived_tournament_can_be_restored(workdir):
+    manager = make_manager(4)
+    tournament = create_tournament(manager, "Test Open", 2)
+    play_round(manager, tournament)
+    play_round(manager, tournament)
+    assert manager.archive_completed_tournaments() == 1
+
+    assert manager.restore_tournament("Test Open")
+
+    restored = make_manager(4).get_tournament("Test Open")
+    assert {player.chess_id: points for player, points in restored.standings.top()} == \
+        {player.chess_id: points for player, points in tournament.standings.top()}
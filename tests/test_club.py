@@ -0,0 +1,80 @@
+import json
+
+from models.club import ChessClub
+
+from .conftest import make_players
+
+
+def make_club(tmp_path, count, journal=True):
+    """Writes a club file with count players and loads it"""
+    filepath = tmp_path / "club.json"
+    players = [player.serialize() for player in make_players(count)]
+    filepath.write_text(json.dumps({"name": "Test Club", "players": players}))
+    return ChessClub(filepath, journal=journal)
+
+
+def club_state(club):
+    return [player.serialize() for player in club.players]
+
+
+def test_changes_are_appended_to_the_journal(tmp_path):
+    club = make_club(tmp_path, 3)
+    content = club.filepath.read_text()
+
+    club.create_player(name="New Player", email="new@example.com", chess_id="CD00001", birthday="02-03-1995")
+    club.update_player(club.players[0], name="Renamed Player")
+
+    # The club file is not rewritten
+    assert club.filepath.read_text() == content
+    records = [json.loads(line) for line in club.journal_path.read_text().splitlines()]
+    assert [(record["op"], record["sequence"], record.get("index")) for record in records] == \
+        [("create", 1, None), ("update", 2, 0)]
+
+
+def test_journal_is_replayed_on_load(tmp_path):
+    club = make_club(tmp_path, 3)
+    club.create_player(name="New Player", email="new@example.com", chess_id="CD00001", birthday="02-03-1995")
+    club.update_player(club.players[1], email="renamed@example.com")
+
+    loaded = ChessClub(club.filepath, journal=True)
+
+    assert club_state(loaded) == club_state(club)
+    assert loaded.journal_sequence == 2
+    assert loaded.journal_size == 2
+
+
+def test_replay_after_a_crash(tmp_path):
+    club = make_club(tmp_path, 3)
+    club.create_player(name="New Player", email="new@example.com", chess_id="CD00001", birthday="02-03-1995")
+    journal = club.journal_path.read_text()
+    # Saved, but the program stopped before clearing the journal
+    club.save()
+    club.journal_path.write_text(journal)
+    # Then a change was acknowledged, and the next one was partially written
+    club.update_player(club.players[0], name="Renamed Player")
+    with open(club.journal_path, "a") as fp:
+        fp.write('{"op": "create", "player": {"name": "Lost')
+
+    loaded = ChessClub(club.filepath, journal=True)
+
+    # The journaled creation is not applied twice, and the partial record is ignored
+    assert club_state(loaded) == club_state(club)
+    assert len(loaded.players) == 4
+
+
+def test_journal_is_compacted_at_the_threshold(tmp_path, monkeypatch):
+    monkeypatch.setattr(ChessClub, "COMPACT_THRESHOLD", 3)
+    club = make_club(tmp_path, 2)
+
+    for idx in range(2):
+        club.update_player(club.players[0], name=f"Renamed Player {idx}")
+    assert club.journal_size == 2
+    club.update_player(club.players[1], name="Other Player")
+
+    # The third record rebuilt the club file and cleared the journal
+    assert not club.journal_path.exists()
+    assert club.journal_size == 0
+    data = json.loads(club.filepath.read_text())
+    assert data["journal_sequence"] == 3
+    assert data["players"] == club_state(club)
+    assert club_state(ChessClub(club.filepath, journal=True)) == club_state(club)
@@ -0,0 +1,74 @@
+import json
+import os
+
+from models.club_manager import ClubManager
+
+from .conftest import make_players
+
+
+def write_club(folder, name, count):
+    filepath = folder / (name.replace(" ", "") + ".json")
+    filepath.write_text(json.dumps({"name": name, "players": [player.serialize() for player in make_players(count)]}))
+    return filepath
+
+
+def touch(filepath):
+    """Changes the modification time of a file, as a later write would"""
+    stat = filepath.stat()
+    os.utime(filepath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_refresh_reloads_only_the_changed_files(tmp_path):
+    first = write_club(tmp_path, "First Club", 2)
+    write_club(tmp_path, "Second Club", 3)
+    manager = ClubManager(tmp_path)
+    assert (manager.hits, manager.misses) == (0, 2)
+    clubs = {club.name: club for club in manager.clubs}
+
+    manager.refresh()
+    assert (manager.hits, manager.misses) == (2, 2)
+    assert {club.name: club for club in manager.clubs} == clubs
+
+    # Rewritten with another player (size and modification time change), then only touched
+    write_club(tmp_path, "First Club", 4)
+    manager.refresh()
+    assert (manager.hits, manager.misses) == (3, 3)
+    reloaded = next(club for club in manager.clubs if club.name == "First Club")
+    assert reloaded is not clubs["First Club"]
+    assert len(reloaded.players) == 4
+
+    touch(first)
+    manager.refresh()
+    assert (manager.hits, manager.misses) == (4, 4)
+
+
+def test_refresh_picks_up_new_and_deleted_files(tmp_path):
+    first = write_club(tmp_path, "First Club", 2)
+    manager = ClubManager(tmp_path)
+
+    write_club(tmp_path, "Second Club", 3)
+    manager.refresh()
+    assert [club.name for club in manager.clubs] == ["First Club", "Second Club"]
+    assert (manager.hits, manager.misses) == (1, 2)
+
+    first.unlink()
+    manager.refresh()
+    assert [club.name for club in manager.clubs] == ["Second Club"]
+    assert set(manager.manifest) == {"SecondClub.json"}
+
+
+def test_manifest_skips_reading_the_unchanged_files(tmp_path):
+    first = write_club(tmp_path, "First Club", 2)
+    write_club(tmp_path, "Second Club", 3)
+    ClubManager(tmp_path)
+    touch(first)
+
+    manager = ClubManager(tmp_path)
+
+    # The unchanged club is created from its manifest entry, without loading its players
+    assert (manager.hits, manager.misses) == (1, 1)
+    clubs = {club.name: club for club in manager.clubs}
+    assert clubs["First Club"].is_loaded
+    assert not clubs["Second Club"].is_loaded
+    assert clubs["Second Club"].player_count == 3
+    assert len(clubs["Second Club"].players) == 3
@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+from models.match import Match
+from models.pairing import OpponentMatrix, generate_pairings
+from models.tournament import Tournament
+
+from .conftest import make_players
+
+
+def play_tournament(count, rounds):
+    """Plays a whole tournament with random results and returns it"""
+    tournament = Tournament("Test Open", "Town Hall", "2024-01-01", "2024-01-05", make_players(count), rounds)
+    for _ in range(rounds):
+        assert tournament.play_round()
+        for match in tournament.rounds[-1]:
+            match.play_match(random.choice(["player1", "player2", "draw"]))
+    return tournament
+
+
+@pytest.mark.parametrize("count, rounds", [(2, 1), (8, 5), (9, 5), (30, 7), (101, 9)])
+def test_no_rematches_and_one_bye_per_player(count, rounds):
+    random.seed(count * rounds)
+    tournament = play_tournament(count, rounds)
+
+    pairs = set()
+    byes = []
+    for matches in tournament.rounds:
+        # Every player plays (or has the bye) exactly once per round
+        seen = [match.player1.chess_id for match in matches] + [match.player2.chess_id for match in matches
+                                                                if match.player2 is not None]
+        assert sorted(seen) == sorted(player.chess_id for player in tournament.players)
+
+        for match in matches:
+            if match.player2 is None:
+                byes.append(match.player1.chess_id)
+                continue
+            pair = frozenset((match.player1.chess_id, match.player2.chess_id))
+            assert pair not in pairs
+            pairs.add(pair)
+
+    assert len(byes) == (rounds if count % 2 else 0)
+    assert len(set(byes)) == len(byes)
+
+
+def test_backtracks_to_avoid_a_rematch():
+    players = make_players(4)
+    history = OpponentMatrix(players)
+    # Pairing in order would give 0-1 (already played) and 2-3
+    history.add_match(Match(players[0], players[1]))
+
+    matches = generate_pairings(players, history)
+
+    pairs = {frozenset((match.player1.chess_id, match.player2.chess_id)) for match in matches}
+    assert frozenset((players[0].chess_id, players[1].chess_id)) not in pairs
+    assert len(pairs) == 2
+
+
+def test_fallback_keeps_rematches_to_a_minimum(capsys):
+    players = make_players(4)
+    history = OpponentMatrix(players)
+    # Only 0-3 and 1-2 were not played yet
+    for first, second in [(0, 1), (2, 3), (0, 2), (1, 3)]:
+        history.add_match(Match(players[first], players[second]))
+    history.add_match(Match(players[1], players[2]))
+
+    # Without backtracking, the fallback pairs 0-3, then 1-2 (a rematch, the only one)
+    matches = generate_pairings(players, history, max_backtrack=0)
+
+    rematches = sum(history.have_played(match.player1, match.player2) for match in matches)
+    assert rematches == 1
+    assert "1 rematch(es)" in capsys.readouterr().out
+
+
+def test_replaced_round_is_forgotten():
+    random.seed(0)
+    players = make_players(6)
+    tournament = Tournament("Test Open", "Town Hall", "2024-01-01", "2024-01-05", players, 3)
+    tournament.play_round()
+    old_pairs = [(match.player1.chess_id, match.player2.chess_id) for match in tournament.rounds[0]]
+
+    # The first round is paired again
+    tournament.current_round = 0
+    tournament.play_round()
+
+    new_pairs = {frozenset((match.player1.chess_id, match.player2.chess_id)) for match in tournament.rounds[0]}
+    for id1, id2 in old_pairs:
+        assert tournament.opponents.have_met(id1, id2) == (frozenset((id1, id2)) in new_pairs)
@@ -0,0 +1,32 @@
+import pytest
+
+from models.player import Player
+
+
+@pytest.mark.parametrize("birthday", ["garbage", "31-02-1990", "00-01-1990", "01-13-1990", "1990-01-01", ""])
+def test_invalid_birthday_raises(birthday):
+    with pytest.raises(ValueError):
+        Player("Anna Smith", "anna@example.com", "AB12345", birthday)
+
+
+@pytest.mark.parametrize("birthday, expected", [
+    ("29-02-2000", "29-02-2000"),
+    ("1-2-1990", "01-02-1990"),
+    ("01-2-1990", "01-02-1990"),
+])
+def test_birthday_is_normalized(birthday, expected):
+    player = Player("Anna Smith", "anna@example.com", "AB12345", birthday)
+
+    assert player.birthday == expected
+    assert player.birthdate.strftime(Player.DATE_FORMAT) == expected
+    assert player.serialize()["birthday"] == expected
+
+
+def test_invalid_birthday_is_not_set():
+    player = Player("Anna Smith", "anna@example.com", "AB12345", "15-06-1985")
+
+    with pytest.raises(ValueError):
+        player.birthday = "30-02-1985"
+
+    assert player.birthday == "15-06-1985"
+    assert player.birthdate.year == 1985
@@ -0,0 +1,47 @@
+import pytest
+
+from data.manage_tournament import HISTORY_PATH
+from models.player_history import PlayerHistory
+
+from .conftest import create_tournament, make_manager, play_round
+
+
+def history_state(history):
+    return history.games, history.pairs, history.applied
+
+
+@pytest.mark.parametrize("compact_interval", [3, 100])
+def test_new_games_are_appended_and_replayed(workdir, monkeypatch, compact_interval):
+    # With a small interval, loading reads a snapshot and the changes logged after it
+    monkeypatch.setattr("models.change_log.COMPACT_INTERVAL", compact_interval)
+    manager = make_manager(10)
+    tournament = create_tournament(manager, "Test Open", 5)
+    play_round(manager, tournament)
+    snapshot = (workdir / HISTORY_PATH).read_text()
+
+    for _ in range(3):
+        play_round(manager, tournament)
+        if compact_interval == 100:
+            # A finished round only appends its games
+            assert (workdir / HISTORY_PATH).read_text() == snapshot
+    # The last round is saved with matches still waiting for a result
+    play_round(manager, tournament, results=2)
+
+    loaded = PlayerHistory.load(HISTORY_PATH)
+    assert history_state(loaded) == history_state(manager.history)
+    assert history_state(loaded) == history_state(PlayerHistory.from_archive())
+
+
+def test_interrupted_snapshot_does_not_record_games_twice(workdir):
+    manager = make_manager(8)
+    tournament = create_tournament(manager, "Test Open", 3)
+    for _ in range(3):
+        play_round(manager, tournament)
+    changes = (workdir / "data" / "history.changes").read_text()
+
+    # The snapshot was written but the log was not cleared, and a change was partially written
+    manager.history.save(HISTORY_PATH)
+    (workdir / "data" / "history.changes").write_text(changes + '{"tournament": "Te')
+
+    loaded = PlayerHistory.load(HISTORY_PATH)
+    assert history_state(loaded) == history_state(manager.history)
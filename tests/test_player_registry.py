@@ -0,0 +1,47 @@
+import pytest
+
+from models.player_registry import PlayerRegistry
+
+from .conftest import make_players
+
+
+@pytest.fixture
+def registry():
+    registry = PlayerRegistry()
+    players = make_players(40)
+    registry.add_club("Club A", players[:20])
+    registry.add_club("Club B", players[20:])
+    return registry
+
+
+def test_replace_club_updates_every_index(registry):
+    old = registry.get_club_players("Club B")
+    new = make_players(50)[30:]
+    for player in new:
+        player.name = f"New {player.name}"
+
+    registry.replace_club("Club B", new)
+
+    assert len(registry) == 40
+    assert registry.get_club_players("Club B") == new
+    assert registry.players[:20] == registry.get_club_players("Club A")
+    assert all(registry.get_club(player) is None for player in old)
+    assert registry.get(old[0].chess_id) is None
+    assert registry.get(new[0].chess_id) is new[0]
+    assert registry.get_by_email(new[0].email) is new[0]
+    assert registry.search("new player") == sorted(new, key=lambda player: player.name.lower())
+    assert registry.search(old[0].name) == []
+    assert len(registry.search_index) == 40
+
+
+def test_update_reindexes_a_changed_player(registry):
+    player = registry.get_club_players("Club A")[3]
+    player.name = "Renamed Player"
+    player.chess_id = "ZZ99999"
+
+    registry.update(player)
+
+    assert registry.get("ZZ99999") is player
+    assert registry.get("AB00003") is None
+    assert registry.search("renamed") == [player]
+    assert registry.get_club(player) == "Club A"
@@ -0,0 +1,51 @@
+import pytest
+
+from data.manage_tournament import RATINGS_PATH
+from models.rating import RatingBook
+
+from .conftest import create_tournament, make_manager, play_round
+
+
+def book_state(book):
+    return book.ratings, book.games, book.applied
+
+
+@pytest.mark.parametrize("compact_interval", [3, 100])
+def test_rounds_are_appended_and_replayed(workdir, monkeypatch, compact_interval):
+    # With a small interval, loading reads a snapshot and the changes logged after it
+    monkeypatch.setattr("models.change_log.COMPACT_INTERVAL", compact_interval)
+    manager = make_manager(10)
+    tournament = create_tournament(manager, "Test Open", 5)
+    play_round(manager, tournament)
+    snapshot = (workdir / RATINGS_PATH).read_text()
+
+    for _ in range(4):
+        play_round(manager, tournament)
+        if compact_interval == 100:
+            # A finished round only appends its changes
+            assert (workdir / RATINGS_PATH).read_text() == snapshot
+
+    loaded = RatingBook.load(RATINGS_PATH)
+    assert book_state(loaded) == book_state(manager.ratings)
+    assert book_state(loaded) == book_state(RatingBook.from_archive())
+
+
+def test_interrupted_saves_are_ignored(workdir):
+    manager = make_manager(8)
+    tournament = create_tournament(manager, "Test Open", 3)
+    for _ in range(3):
+        play_round(manager, tournament)
+    changes = (workdir / "data" / "ratings.changes").read_text()
+
+    # The snapshot was written but the log was not cleared, and a change was partially written
+    manager.ratings.save(RATINGS_PATH)
+    (workdir / "data" / "ratings.changes").write_text(changes + '{"tournament": "Te')
+
+    loaded = RatingBook.load(RATINGS_PATH)
+    assert book_state(loaded) == book_state(manager.ratings)
+
+    # The next round is not appended after the partial change: a snapshot is written instead
+    manager = make_manager(8)
+    play_round(manager, create_tournament(manager, "Second Open", 1))
+    assert not (workdir / "data" / "ratings.changes").exists()
+    assert book_state(RatingBook.load(RATINGS_PATH)) == book_state(manager.ratings)
@@ -0,0 +1,73 @@
+import pytest
+
+from .conftest import create_tournament, make_manager
+
+
+@pytest.fixture
+def setup(workdir):
+    """Manager and tournament of 8 players with its first round paired"""
+    manager = make_manager(8)
+    tournament = create_tournament(manager, "Test Open", 3)
+    assert manager.pair_next_round(tournament)
+    return manager, tournament
+
+
+def boards(tournament):
+    return [match for match in tournament.rounds[-1] if match.player2 is not None]
+
+
+def record(match, result, flipped=False):
+    player1, player2 = match.player1.chess_id, match.player2.chess_id
+    if flipped:
+        player1, player2 = player2, player1
+    return {"player1": player1, "player2": player2, "result": result}
+
+
+@pytest.mark.parametrize("code, expected", [
+    ("1", "player1"), ("1-0", "player1"), ("Player1", "player1"),
+    ("2", "player2"), (" 0-1 ", "player2"), ("player2", "player2"),
+    ("0", "draw"), ("1/2-1/2", "draw"), ("½-½", "draw"), ("DRAW", "draw"),
+    (1, "player1"), (2, "player2"),
+])
+def test_result_codes(setup, code, expected):
+    manager, tournament = setup
+    match = boards(tournament)[0]
+
+    assert manager.enter_round_results(tournament, [record(match, code)])
+
+    assert match.played
+    assert match.result == expected
+
+
+@pytest.mark.parametrize("code, expected", [("1-0", "player2"), ("0-1", "player1"), ("draw", "draw")])
+def test_results_given_in_the_other_order_are_flipped(setup, code, expected):
+    manager, tournament = setup
+    match = boards(tournament)[0]
+
+    assert manager.enter_round_results(tournament, [record(match, code, flipped=True)])
+
+    assert match.result == expected
+
+
+@pytest.mark.parametrize("invalid", ["result", "duplicate", "unknown player", "played"])
+def test_an_invalid_result_rejects_the_whole_batch(setup, capsys, invalid):
+    manager, tournament = setup
+    first, second, third = boards(tournament)[:3]
+    if invalid == "played":
+        assert manager.enter_round_results(tournament, [record(third, "1")])
+    results = [record(first, "1"), record(second, "0")]
+    if invalid == "result":
+        results.append(record(third, "3-0"))
+    elif invalid == "duplicate":
+        results.append(record(first, "0-1", flipped=True))
+    elif invalid == "unknown player":
+        results.append({"player1": third.player1.chess_id, "player2": "ZZ99999", "result": "1"})
+    else:
+        results.append(record(third, "2"))
+    capsys.readouterr()
+
+    assert not manager.enter_round_results(tournament, results)
+
+    assert "Result 3:" in capsys.readouterr().out
+    assert not first.played and not second.played
+    assert third.played == (invalid == "played")
@@ -0,0 +1,34 @@
+import json
+
+from data.manage_tournament import ManageTournament
+from models.sqlite_store import SQLiteStore
+
+from .conftest import create_tournament, make_manager, play_round
+
+
+def test_sql_standings_match_the_loaded_tournament(workdir):
+    manager = make_manager(5)
+    tournament = create_tournament(manager, "Test Open", 3)
+    for _ in range(3):
+        play_round(manager, tournament)
+    info = manager.tournament_to_dict(tournament)
+    # Results saved by older versions: the chess ID of the winner
+    for match_info in info["rounds"][0]:
+        if match_info["players"][1] is not None:
+            match_info["winner"] = match_info["players"][1]
+    assert any(match_info["players"][1] is None for matches in info["rounds"] for match_info in matches)
+    info["name"] = "Legacy Open"
+    with open("data/tournaments/Legacy Open_info.json", "w") as fp:
+        json.dump(info, fp)
+
+    store = SQLiteStore(str(workdir / "chess.sqlite3"))
+    store.save_club("Test Club", list(manager.registry.players))
+    store.save_tournament(info)
+
+    in_memory = make_manager(5).tournament_standings("Legacy Open")
+    from_sql = ManageTournament(store=store).tournament_standings("Legacy Open")
+
+    assert {chess_id: points for chess_id, _, points in from_sql} == \
+        {chess_id: points for chess_id, _, points in in_memory}
+    assert [points for _, _, points in from_sql] == sorted((points for _, _, points in from_sql), reverse=True)
+    store.close()
@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+from models.match import Match
+from models.standings import Standings
+
+from .conftest import make_players
+
+
+def brute_force(standings):
+    """(points, tie-break scores) of every player, best first, by sorting them all"""
+    return sorted(
+        ((standings.scores[chess_id], standings.tiebreak_key(chess_id)) for chess_id in standings.players),
+        reverse=True,
+    )
+
+
+def check(standings):
+    expected = brute_force(standings)
+    top = standings.top()
+    assert [(points, standings.tiebreak_key(player.chess_id)) for player, points in top] == expected
+    for k in (1, 3, 10):
+        assert standings.top(k) == top[:k]
+    for player in standings.players.values():
+        better = sum(points > standings.points(player) for points, _ in expected)
+        assert standings.rank(player) == better + 1
+
+
+@pytest.mark.parametrize("count", [1, 7, 40])
+def test_rank_and_top_match_a_full_sort(count):
+    random.seed(count)
+    players = make_players(count)
+    standings = Standings(players, max_points=5)
+    check(standings)
+
+    for _ in range(5):
+        order = random.sample(players, count)
+        matches = [Match(order[idx], order[idx + 1] if idx + 1 < count else None, standings=standings)
+                   for idx in range(0, count, 2)]
+        for match in matches:
+            match.play_match(random.choice(["player1", "player2", "draw"]))
+            # Queries between the results of a round read the cached order of the score groups
+            check(standings)
+
+
+def test_snapshot_restores_the_same_standings():
+    random.seed(1)
+    players = make_players(9)
+    standings = Standings(players, max_points=3)
+    for _ in range(3):
+        order = random.sample(players, len(players))
+        for idx in range(0, len(order) - 1, 2):
+            Match(order[idx], order[idx + 1], standings=standings).play_match(random.choice(["player1", "draw"]))
+
+    restored = Standings(make_players(9), max_points=3)
+    restored.restore(standings.snapshot())
+
+    assert {player.chess_id: (points, restored.tiebreak_key(player.chess_id)) for player, points in restored.top()} \
+        == {player.chess_id: (points, standings.tiebreak_key(player.chess_id)) for player, points in standings.top()}
+    check(restored)
@@ -0,0 +1,46 @@
+import pytest
+
+from models.tournament_log import read_tournament
+
+from .conftest import create_tournament, make_manager, play_round
+
+
+def state(tournament):
+    """Standings, tie-break scores and results of a tournament"""
+    return (
+        tournament.current_round,
+        {player.chess_id: (points, tournament.standings.tiebreak_key(player.chess_id))
+         for player, points in tournament.standings.top()},
+        [[(match.player1.chess_id, match.player2.chess_id if match.player2 else None, match.played, match.result)
+          for match in matches] for matches in tournament.rounds],
+    )
+
+
+@pytest.mark.parametrize("snapshot_interval", [6, 100])
+def test_replay_gives_the_live_standings(workdir, monkeypatch, snapshot_interval):
+    # With a small interval, loading reads a snapshot and the events logged after it
+    monkeypatch.setattr("models.tournament_log.SNAPSHOT_INTERVAL", snapshot_interval)
+    manager = make_manager(9)
+    tournament = create_tournament(manager, "Test Open", 5)
+    for _ in range(4):
+        play_round(manager, tournament)
+    # The last round is saved with matches still waiting for a result
+    play_round(manager, tournament, results=2)
+
+    loaded = make_manager(9).get_tournament("Test Open")
+
+    assert loaded is not tournament
+    assert state(loaded) == state(tournament)
+    assert loaded.opponents.serialize() == tournament.opponents.serialize()
+
+
+def test_read_tournament_gives_the_saved_information(workdir, monkeypatch):
+    monkeypatch.setattr("models.tournament_log.SNAPSHOT_INTERVAL", 5)
+    manager = make_manager(6)
+    tournament = create_tournament(manager, "Test Open", 3)
+    for _ in range(3):
+        play_round(manager, tournament)
+
+    info = read_tournament("data/tournaments/Test Open_info.json")
+
+    assert info == manager.tournament_to_dict(tournament)